@@ -0,0 +1,273 @@
+"""
+Throughput benchmark for the mpmath reference formulas behind the precision gates.
+
+Formula changes to dncbeta_cdf, tweedie_pdf, nct_cdf and the like have more than once turned a
+minute-scale --emit into an hour-scale one, found only after the fact (issues #1086, #1149,
+#1194). This times every registered reference at a fixed, representative point set and compares
+each against a committed baseline (scripts/bench-refs-baseline.json), flagging any that got more
+than --factor times slower.
+
+Sources, each generator loaded from its own file -- a deliberate exception to the scripts'
+no-cross-import convention, since the generators' own formulas are what is being timed and a
+duplicate would only time the duplicate:
+  continuous  precision-refs-continuous.py pdf()/cdf() for every PARAM_SETS entry, at the middle
+              x of its group in test/precision-continuous.js -- except the _COST_PRIOR outliers
+              (DoublyNoncentralBeta[2, 2, 1200, 1200]), far too slow to time repeatedly
+  discrete    precision-refs-discrete.py pmf()/cdf() for every SPEC entry, at its middle k, with
+              the pmf-normalizer and cdf-table caches cleared before every evaluation
+  process     precision-refs-process.py law_pdf()/law_cdf() for every SPEC entry, at its first
+              time and the middle of the probes points_for() picks there
+  special     precision-refs-special.py REF_FN over every grid() point of each function
+The point set lives in the baseline itself, so edits to the test files or grids don't silently
+move what is being compared; --update re-derives it and re-times everything.
+
+Each run passes over an entry's whole point set as many times as it takes to last MIN_RUN_SECONDS
+and is reported per pass, so a microsecond-scale formula is timed over thousands of passes rather
+than read off one timer tick. Timings are the minimum over --repeat runs (fewer for entries slower
+than REPEAT_BUDGET), normalized by a fixed mpmath calibration workload timed alongside them, so the
+comparison holds across machines of different speed. Anything under MIN_SECONDS per pass on both
+sides is a genuinely trivial formula, dominated by call overhead, and never flagged.
+
+Requires: pip install mpmath
+Usage: npm run bench:refs | python3 scripts/bench-refs.py [--repeat N] [--factor F] [--only Name1,Name2]
+       [--out PATH]                          # compare against the baseline, exit 1 on any regression
+       python3 scripts/bench-refs.py --update [--repeat N]    # rewrite scripts/bench-refs-baseline.json
+"""
+import importlib.util
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+from mpmath import mp, mpf, gammainc, betainc
+
+from ref_normalizers import clear_normalizers
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(REPO_ROOT, 'scripts', 'bench-refs-baseline.json')
+DEFAULT_OUT = '/tmp/bench-refs-report.json'
+DEFAULT_REPEAT = 3
+DEFAULT_FACTOR = 2.0
+MIN_SECONDS = 1e-5
+# A run repeats the point set until it lasts this long: at the baseline's typical 50-500 us per pass
+# a single pass sits within a few timer ticks of scheduling noise.
+MIN_RUN_SECONDS = 0.005
+# An entry stops repeating once its runs add up to this many seconds: the DoublyNoncentralT[.., 120]
+# sets take about a minute per evaluation, where one run's noise is far below any --factor.
+REPEAT_BUDGET = 10.0
+
+
+def load(script):
+    # Hyphenated file names aren't importable as modules, so load by path.
+    path = os.path.join(REPO_ROOT, 'scripts', script)
+    spec = importlib.util.spec_from_file_location(script[:-3].replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def calibrate():
+    # Fixed mp.dps = 50 workload (the generators' own precision) through the two primitives that
+    # dominate the reference layer; the machine-speed yardstick every timing is divided by.
+    with mp.workdps(50):
+        for k in range(1, 41):
+            gammainc(mpf(k) / 7, 0, mpf(k) / 5, regularized=True)
+            betainc(mpf(k) / 9, mpf(3) / 2, 0, mpf(1) / 3, regularized=True)
+
+
+# ---- point sets (--update only) ----
+
+def _middle(items):
+    return items[(len(items) - 1) // 2]
+
+
+def continuous_entries(mod):
+    groups = {key: text for key, text in mod.existing_groups(mod.OUTPUT_PATH)}
+    entries = []
+    for name, sets in mod.PARAM_SETS.items():
+        for p in sets:
+            if mod._cost_key(name, p) in mod._COST_PRIOR:
+                continue  # known hour-scale outliers; each is a regeneration of its own
+            text = groups.get((name, re.sub(r'\s+', ' ', mod.js_lit(p))))
+            if text is None:
+                print(f'  continuous: no {name}{mod.js_params(p)} group in {mod.OUTPUT_PATH}, skipped',
+                      file=sys.stderr)
+                continue
+            x = float(_middle(re.findall(r'\{ x: ([^,]+),', text)))
+            entries.extend({'source': 'continuous', 'name': name, 'params': p, 'method': method,
+                            'points': [x]} for method in ('pdf', 'cdf'))
+    return entries
+
+
+def discrete_entries(mod):
+    entries = []
+    for name, sets, _ in mod.SPEC:
+        for p, ks in sets:
+            entries.extend({'source': 'discrete', 'name': name, 'params': p, 'method': method,
+                            'points': [_middle(ks)]} for method in ('pmf', 'cdf'))
+    return entries
+
+
+def process_entries(mod):
+    entries = []
+    for name, sets, _ in mod.SPEC:
+        for params, times in sets:
+            pt = _middle(mod.points_for(name, params, times[0]))
+            entries.extend({'source': 'process', 'name': name, 'params': params, 'method': method,
+                            'points': [[pt['t'], pt['x']]]} for method in ('pdf', 'cdf'))
+    return entries
+
+
+def special_entries(mod):
+    by_fn = {}
+    for fn, args, _, _ in mod.grid():
+        by_fn.setdefault(fn, []).append(list(args))
+    return [{'source': 'special', 'name': fn, 'params': None, 'method': 'ref', 'points': points}
+            for fn, points in by_fn.items()]
+
+
+SOURCES = {
+    'continuous': ('precision-refs-continuous.py', continuous_entries),
+    'discrete': ('precision-refs-discrete.py', discrete_entries),
+    'process': ('precision-refs-process.py', process_entries),
+    'special': ('precision-refs-special.py', special_entries),
+}
+
+
+# ---- evaluation ----
+
+def evaluator(source, mod):
+    """fn(entry, point) evaluating one point of an entry through `mod`'s own reference formulas."""
+    if source == 'continuous':
+        return lambda e, x: getattr(mod, e['method'])(e['name'], e['params'], mpf(x))
+    if source == 'discrete':
+        def run(e, k):
+            # Cold, as in a real run: both caches would otherwise turn every repeat after the
+            # first into a dictionary lookup.
+            clear_normalizers()
+            mod._CDF_TABLES.clear()
+            return getattr(mod, e['method'])(e['name'], e['params'], k)
+        return run
+    if source == 'process':
+        laws = {'pdf': mod.law_pdf, 'cdf': mod.law_cdf}
+        return lambda e, pt: laws[e['method']](mod.marginal(e['name'], e['params'], pt[0]), mpf(pt[1]))
+    if source == 'special':
+        return lambda e, args: mod.REF_FN[e['name']](*args)
+    raise ValueError(source)
+
+
+def key(entry):
+    params = '' if entry['params'] is None else json.dumps(entry['params'])
+    return f'{entry["source"]}/{entry["name"]}{params}.{entry["method"]}'
+
+
+def time_entry(entry, evaluate, repeat):
+    """{'min', 'median'} seconds per pass over the entry's points, and the passes per run ('loops').
+    The pass count grows tenfold until a run lasts MIN_RUN_SECONDS; an entry already slower than
+    that keeps one pass per run, so its first run is also its only cold one."""
+    def passes(loops):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for point in entry['points']:
+                evaluate(entry, point)
+        return time.perf_counter() - start
+
+    loops = 1
+    elapsed = spent = passes(loops)
+    while elapsed < MIN_RUN_SECONDS:
+        loops *= 10
+        elapsed = passes(loops)
+        spent += elapsed
+    runs = [elapsed / loops]
+    while len(runs) < repeat and spent < REPEAT_BUDGET:
+        elapsed = passes(loops)
+        spent += elapsed
+        runs.append(elapsed / loops)
+    return {'min': min(runs), 'median': statistics.median(runs), 'loops': loops}
+
+
+def time_calibration(repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calibrate()
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def run(entries, repeat, modules):
+    """Times every entry; returns ({key: {'min', 'median'}}, calibration seconds). The
+    calibration is timed before and after, keeping the faster, so a machine that was busy at
+    only one end doesn't skew every ratio."""
+    evaluators = {source: evaluator(source, mod) for source, mod in modules.items()}
+    before = time_calibration(repeat)
+    timings = {}
+    for i, entry in enumerate(entries):
+        timings[key(entry)] = time_entry(entry, evaluators[entry['source']], repeat)
+        print(f'  [{i + 1}/{len(entries)}] {key(entry)}: {timings[key(entry)]["min"]:.3g} s',
+              file=sys.stderr, flush=True)
+    return timings, min(before, time_calibration(repeat))
+
+
+def compare(baseline, timings, calibration, factor):
+    """Per-entry {'baseline', 'current', 'ratio', 'regressed'} on calibration-normalized minima."""
+    scale = baseline['calibration_seconds'] / calibration
+    rows = {}
+    for entry in baseline['entries']:
+        k = key(entry)
+        if k not in timings:
+            continue
+        old, new = entry['seconds']['min'], timings[k]['min'] * scale
+        ratio = max(new, MIN_SECONDS) / max(old, MIN_SECONDS)
+        rows[k] = {'baseline': old, 'current': new, 'ratio': ratio, 'regressed': ratio > factor}
+    return rows
+
+
+def _parse_argv():
+    def flag_value(name, default, cast):
+        return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+    only = flag_value('--only', None, lambda v: set(v.split(',')))
+    return ('--update' in sys.argv, flag_value('--repeat', DEFAULT_REPEAT, int),
+            flag_value('--factor', DEFAULT_FACTOR, float), only, flag_value('--out', DEFAULT_OUT, str))
+
+
+def main():
+    update, repeat, factor, only, out_path = _parse_argv()
+    modules = {source: load(script) for source, (script, _) in SOURCES.items()}
+    mp.dps = 50  # the generators all set it on import; restated so calibrate() never depends on that
+
+    if update:
+        entries = [e for source, (_, build) in SOURCES.items() for e in build(modules[source])]
+        if only:
+            sys.exit('--only would drop every other entry from the rewritten baseline.')
+        timings, calibration = run(entries, repeat, modules)
+        for entry in entries:
+            entry['seconds'] = timings[key(entry)]
+        with open(BASELINE_PATH, 'w') as fh:
+            json.dump({'mp_dps': mp.dps, 'repeat': repeat, 'calibration_seconds': calibration,
+                       'entries': entries}, fh, indent=1)
+            fh.write('\n')
+        print(f'Wrote {BASELINE_PATH} ({len(entries)} entries, '
+              f'{sum(t["min"] for t in timings.values()):.1f} s total)')
+        return
+
+    with open(BASELINE_PATH) as fh:
+        baseline = json.load(fh)
+    entries = [e for e in baseline['entries'] if not only or e['name'] in only]
+    timings, calibration = run(entries, repeat, modules)
+    rows = compare(baseline, timings, calibration, factor)
+    with open(out_path, 'w') as fh:
+        json.dump({'factor': factor, 'calibration_seconds': calibration, 'entries': rows}, fh, indent=1)
+    regressed = {k: r for k, r in rows.items() if r['regressed']}
+    for k, r in sorted(rows.items(), key=lambda kv: -kv[1]['ratio'])[:10]:
+        flag = ' REGRESSED' if r['regressed'] else ''
+        print(f'  {r["ratio"]:6.2f}x  {k}: {r["baseline"]:.3g} s -> {r["current"]:.3g} s{flag}')
+    print(f'{len(rows)} references timed, {len(regressed)} more than {factor:g}x slower than '
+          f'baseline; wrote {out_path}')
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
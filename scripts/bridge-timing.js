@@ -0,0 +1,33 @@
+// --timing for the difftest eval bridges (eval-special.js, eval-dist.js, eval-quantile.js), which
+// require this rather than each keeping a copy: with the flag, a bridge reports each call's cost in
+// ns, as the fastest of TIMING_REPEATS micro-batches, each batch doubled until it runs for at least
+// TIMING_BATCH_NS so hrtime resolution and loop overhead wash out.
+//
+// A call already slower than TIMING_BATCH_NS on its own is timed once, and that first run is cold:
+// repeating it would add minutes to the sweep and no precision, but it also means the slowest calls
+// -- the ones slow_points lists -- are single samples, JIT warm-up and GC pauses included.
+// difftest_engine.py's TIMING_SINGLE_SAMPLE_NS mirrors the threshold to mark them in the report.
+const TIMING = process.argv.includes('--timing')
+const TIMING_BATCH_NS = 200000
+const TIMING_REPEATS = 5
+
+function batchNs (fn, n) {
+  const start = process.hrtime.bigint()
+  for (let i = 0; i < n; i++) fn()
+  return Number(process.hrtime.bigint() - start)
+}
+
+function timeCall (fn) {
+  let n = 1
+  let elapsed = batchNs(fn, n)
+  if (elapsed >= TIMING_BATCH_NS) return elapsed
+  while (elapsed < TIMING_BATCH_NS) {
+    n *= 2
+    elapsed = batchNs(fn, n)
+  }
+  let best = elapsed / n
+  for (let r = 1; r < TIMING_REPEATS; r++) best = Math.min(best, batchNs(fn, n) / n)
+  return best
+}
+
+module.exports = { TIMING, timeCall }
@@ -9,93 +9,53 @@ evaluates pdf(x)/cdf(x) on the same instance -- not a fixed x-domain (wastes dra
 parameter-scale-dependent supports) or an mpmath-side CDF inversion (~10-50x slower); see the
 "x-sampling" decision in thoughts/plans/2026-08-09-1705-distribution-difftest-harness-pilot.md.
 
-Live mpmath, out-of-band from `npm test`, same rationale as #1264 (decisions/0052). Standalone, no
-cross-script imports: ulp_diff/_monotonic_bits/_self_check are duplicated verbatim from difftest-
-special.py (fixed for the sign-remap bug in solutions/testing/2026-08-09-1444-ulp-diff-sign-remap-
-same-sign-blind-self-check.md). pdf/cdf reference formulas are freshly written from textbook closed
-forms (DLMF/A&S, cited per formula), independent of ranjs's src/dist/, guarded by
-_formula_self_check() against a future transcription error.
+Live mpmath, out-of-band from `npm test`, same rationale as #1264 (decisions/0052). The sweep
+machinery (ULP metric, bridge calls, reference watchdog and worker pool, streaming statistics,
+reference cache, --profile/--timing) is difftest_engine.py's, shared with the other difftest
+harnesses. pdf/cdf reference formulas are freshly written from textbook closed forms (DLMF/A&S, cited
+per formula), independent of ranjs's src/dist/, guarded by _formula_self_check() against a future
+transcription error.
 
 Usage: npm run difftest:dist | python3 scripts/difftest-dist.py [--seed N] [--out PATH] [--N N]
+       [--point-budget SECONDS] [--retry-budget SECONDS] [--jobs N] [--ref-cache PATH]
+       [--bridge-chunk N] [--bridge-timeout SECONDS] [--profile [--profile-out PATH]] [--timing]
+       [--archive] [--baseline PREVIOUS_REPORT] [--worst-k K] [--column-archive DIR]
+       [--triage [--triage-ulp N] [--triage-audit FRACTION]]
+
+--jobs, --ref-cache and --bridge-chunk/--bridge-timeout work as in difftest-special.py: references on
+N worker processes, a JSON reference cache keyed by (dist, params, x), and a chunked eval-dist.js call
+under a wall-clock limit that isolates a non-terminating draw. --archive and --baseline record and
+replay a run's draws as there, but a pdf/cdf reference is only reused where ranjs's q(p) still lands
+on the same x.
+--worst-k K lists each entry's K worst points (default 50, at least 1), worst first, in its worst_cases.
+--column-archive DIR writes every draw as .npy columns, as in difftest-special.py; a row's args are
+the distribution's params then p and x (NaN where the q(p) call failed or never returned).
+--triage runs difftest-special.py's scipy tier against scipy.stats (numpy and scipy required): a draw
+gets its mpmath pdf/cdf references only when either method's ranjs value is more than --triage-ulp
+ULP from scipy's, or an audit drew it; each entry's scipy_tier reports the first tier.
+
+--timing adds eval-dist.js's per-call pdf/cdf cost to each entry: ns/call percentiles, medians per
+parameter and p bin, and the regions and points more than TIMING_SLOW_FACTOR times the median.
 """
 import json
-import math
 import random
-import statistics
-import struct
-import subprocess
-import sys
 
 import mpmath
 from mpmath import mp, mpf, loggamma, beta as betafn, gammainc, betainc, sqrt
 
+from difftest_engine import (
+    Bridge, NON_TERMINATION, NOT_ESCALATED, Triage, UlpStats, baseline_diff, common_argv, decode, diff_line,
+    draw_arg, flag_value, load_baseline, open_archive, open_columns, self_check, timing_edges, timing_line,
+    timing_summary, triage_line, triaged_references, ulp_diff, ulp_entry, write_report,
+)
+from ref_profile import disable_profiling, enable_profiling, profiled
+
 mp.dps = 50
 
-DEFAULT_SEED = 42
 DEFAULT_OUT = '/tmp/difftest-dist-report.json'
+PROFILE_OUT = '/tmp/difftest-dist-profile.json'
 EVAL_SCRIPT = 'scripts/eval-dist.js'
 
-# ─── ULP METRIC ─── (duplicated verbatim from difftest-special.py:51-129, see module docstring)
-def ulp_diff(a, b):
-    """Float64 ULP distance between a and b. NaN vs NaN is 0 (not a reportable error);
-    exactly one side NaN, or a finite/infinite mismatch, is +inf (dominates max ULP)."""
-    a = float(a)
-    b = float(b)
-    a_nan = a != a
-    b_nan = b != b
-    if a_nan and b_nan:
-        return 0
-    if a_nan or b_nan:
-        return float('inf')
-    if a == b:
-        # Covers +0.0 == -0.0, whose bit patterns otherwise differ.
-        return 0
-    a_inf = math.isinf(a)
-    b_inf = math.isinf(b)
-    if a_inf or b_inf:
-        # a == b above already caught same-signed infinities.
-        return float('inf')
-    return abs(_monotonic_bits(a) - _monotonic_bits(b))
-
-def _monotonic_bits(x):
-    # Sign-magnitude float64 bits aren't monotonic across zero; remap negatives via
-    # 2**63 - bits (not 2**64 - bits, which would collide opposite-sign equal-magnitude
-    # values onto the same value). See solutions/testing/2026-08-09-1444-ulp-diff-sign-
-    # remap-same-sign-blind-self-check.md.
-    bits, = struct.unpack('>Q', struct.pack('>d', x))
-    return bits if bits < 2**63 else 2**63 - bits
-
-def _self_check():
-    """Unconditional self-validation of ulp_diff -- a broken metric must never silently
-    produce a bogus report."""
-    one_up = math.nextafter(1.0, 2.0)
-    assert ulp_diff(1.0, one_up) == 1, 'adjacent normals should be 1 ULP apart'
-    assert ulp_diff(1.0, 1.0) == 0, 'identical values should be 0 ULP apart'
-    assert ulp_diff(0.0, -0.0) == 0, 'signed zeros should be 0 ULP apart'
-    assert 0 < ulp_diff(-1e-300, 1e-300) < float('inf'), \
-        'zero-crossing pair should be a large but finite ULP distance'
-    assert ulp_diff(5e-324, 1e-323) == 1, 'adjacent subnormals should be 1 ULP apart'
-    assert ulp_diff(-5e-324, 5e-324) == 2, \
-        'adjacent subnormals straddling zero should be 2 ULP apart'
-    dbl_max = 1.7976931348623157e+308
-    assert ulp_diff(dbl_max, math.nextafter(dbl_max, 0)) == 1, \
-        'adjacent normals near DBL_MAX should be 1 ULP apart'
-    assert ulp_diff(float('inf'), float('inf')) == 0, 'equal infinities should be 0 ULP apart'
-    assert ulp_diff(float('inf'), float('-inf')) == float('inf'), \
-        'opposite-signed infinities should diverge'
-    assert ulp_diff(1.0, float('inf')) == float('inf'), \
-        'finite vs infinite should diverge'
-    assert ulp_diff(float('nan'), float('nan')) == 0, 'NaN vs NaN should be treated as equal'
-    assert ulp_diff(float('nan'), 1.0) == float('inf'), \
-        'NaN vs finite should diverge'
-    assert ulp_diff(-1.0, -1.0) == 0, 'identical negative values should be 0 ULP apart'
-    neg_one_down = math.nextafter(-1.0, -2.0)
-    assert ulp_diff(-1.0, neg_one_down) == 1, \
-        'adjacent negative normals should be 1 ULP apart'
-    # Cross-sign pair -- same-sign cases above can't catch a wrong sign-remap constant.
-    assert ulp_diff(2.0, -2.0) > 2**62, \
-        'same-magnitude opposite-sign values must not collide to a small ULP distance'
-
 # ─── REFERENCE FORMULAS ─── independent textbook closed forms, DLMF/A&S cited per function.
 def Preg(a, x):  # DLMF 8.2.4: regularized lower incomplete gamma P(a, x).
     return mpf(0) if x <= 0 else gammainc(a, 0, x, regularized=True)
@@ -177,6 +137,21 @@ REF_FN = {
     'StudentT': {'pdf': studentt_pdf, 'cdf': studentt_cdf},
     'InverseGamma': {'pdf': inversegamma_pdf, 'cdf': inversegamma_cdf},
 }
+
+def scipy_fns(np, scipy):  # --triage's float64 scipy.stats counterparts of REF_FN, over parameter/x arrays.
+    st = scipy.stats
+    return {
+        'Gamma': {'pdf': lambda a, b, x: st.gamma.pdf(x, a, scale=1 / b),
+                  'cdf': lambda a, b, x: st.gamma.cdf(x, a, scale=1 / b)},
+        'Beta': {'pdf': lambda a, b, x: st.beta.pdf(x, a, b), 'cdf': lambda a, b, x: st.beta.cdf(x, a, b)},
+        # Same round-half-even df rounding as chi2_pdf/f_pdf's round().
+        'Chi2': {'pdf': lambda k, x: st.chi2.pdf(x, np.round(k)), 'cdf': lambda k, x: st.chi2.cdf(x, np.round(k))},
+        'F': {'pdf': lambda d1, d2, x: st.f.pdf(x, np.round(d1), np.round(d2)),
+              'cdf': lambda d1, d2, x: st.f.cdf(x, np.round(d1), np.round(d2))},
+        'StudentT': {'pdf': lambda nu, x: st.t.pdf(x, nu), 'cdf': lambda nu, x: st.t.cdf(x, nu)},
+        'InverseGamma': {'pdf': lambda a, b, x: st.invgamma.pdf(x, a, scale=b),
+                         'cdf': lambda a, b, x: st.invgamma.cdf(x, a, scale=b)},
+    }
 # ─── FORMULA SELF-CHECK ─── catches a future transcription error via exact closed-form identities.
 def _formula_self_check():
     tol = mpf('1e-45')
@@ -234,12 +209,6 @@ DIST_SPEC = {
 # p bounded away from {0,1}: x lands inside the support, never at a singularity or tail.
 P_LO, P_HI = 0.001, 0.999
 
-def _draw_param(rng, arg):
-    if arg['log_uniform']:
-        lo, hi = math.log(arg['lo']), math.log(arg['hi'])
-        return math.exp(rng.uniform(lo, hi))
-    return rng.uniform(arg['lo'], arg['hi'])
-
 def generate_points(spec, seed, n_override=None):
     """Seeded, reproducible (dist, params, p) draws. p is shared by every method in
     spec[dist]['methods'] so pdf/cdf compare at the same x, not independently-sampled points."""
@@ -248,112 +217,187 @@ def generate_points(spec, seed, n_override=None):
     for name, dist_spec in spec.items():
         n = n_override if n_override is not None else dist_spec['n']
         for _ in range(n):
-            params = [_draw_param(rng, arg) for arg in dist_spec['params']]
+            params = [draw_arg(rng, arg) for arg in dist_spec['params']]
             draws.append((name, params, rng.uniform(P_LO, P_HI)))
     return draws
 
 # ─── SWEEP ORCHESTRATION ───
-def compute_ranjs_values(draws):  # batches ALL draws into a single node subprocess call.
-    payload = json.dumps([{'dist': name, 'params': params, 'p': p} for name, params, p in draws])
-    result = subprocess.run(['node', EVAL_SCRIPT], input=payload, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(result.stderr, flush=True)
-        raise RuntimeError('scripts/eval-dist.js failed')
-    return json.loads(result.stdout)
-
-def decode(value):  # undoes eval-dist.js's Infinity/NaN string tagging (JSON has no such literal).
-    return {'Infinity': float('inf'), '-Infinity': float('-inf'), 'NaN': float('nan')}.get(value, value)
-
-def _init_results(spec):
-    return {f'{name}.{method}': {'ulps': [], 'errors': 0}
+def _init_results(spec, worst_k):
+    return {f'{name}.{method}': {'stats': UlpStats(worst_k), 'errors': 0, 'deferred': [], 'non_termination': []}
             for name, dist_spec in spec.items() for method in dist_spec['methods']}
 
-def _record_error(results, spec, name):
+def _record_error(results, spec, name, key='errors', point=None):
     for method in spec[name]['methods']:
-        results[f'{name}.{method}']['errors'] += 1
+        if point is None:
+            results[f'{name}.{method}'][key] += 1
+        else:
+            results[f'{name}.{method}'][key].append(point)
+
+def _references(spec, point):  # {method: float mpmath reference} at one (name, params, x).
+    name, params, x = point
+    refs = {}
+    for method in spec[name]['methods']:
+        with profiled(name, params, method, x):
+            refs[method] = float(REF_FN[name][method](params, x))
+    return refs
 
-def _record_point(results, spec, name, params, x, got):
+def _record_point(results, archive, columns, spec, index, name, params, p, x, got, refs):  # -> {method: ulp}
+    ulps = {}
     for method in spec[name]['methods']:
-        ref = float(REF_FN[name][method](params, x))
-        value = decode(got[method])
-        results[f'{name}.{method}']['ulps'].append((ulp_diff(ref, value), name, params, x, ref, value))
-
-def sweep(spec, seed, n_override=None):
-    draws = generate_points(spec, seed, n_override)
-    bridged = compute_ranjs_values(draws)
-    results = _init_results(spec)
-    for (name, params, p), got in zip(draws, bridged):
+        ref, value = refs[method], decode(got[method])
+        ulps[method] = ulp = ulp_diff(ref, value)
+        results[f'{name}.{method}']['stats'].add(ulp, {
+            'dist': name, 'params': params, 'x': x, 'mpmath_ref': ref, 'ranjs_value': value})
+        archive.add(f'{name}.{method}', index, value, ref)
+        columns.add(f'{name}.{method}', params + [p, x], ref, value, ulp)
+    return ulps
+
+def _scipy_tier(triage, spec, points, gots):
+    """--triage's first tier: the positions in points of the draws that need mpmath references -- a
+    draw is escalated as a whole when any of its methods is."""
+    np = triage.np
+    fns = scipy_fns(np, triage.scipy)
+    by_name = {}
+    for i, (name, _, _) in enumerate(points):
+        by_name.setdefault(name, []).append(i)
+    selected = set()
+    for name, indices in by_name.items():
+        params = np.array([points[i][1] for i in indices], dtype=np.float64).T
+        x = np.array([points[i][2] for i in indices], dtype=np.float64)
+        for method in spec[name]['methods']:
+            with np.errstate(all='ignore'):
+                expected = fns[name][method](*params, x)
+            ranjs = [decode(gots[i][method]) for i in indices]
+            selected |= triage.compare(f'{name}.{method}', indices, ranjs, expected)
+    return selected
+
+def _open_columns(spec, opts):  # --column-archive rows: args are params + [p, x], x NaN where q(p) failed.
+    entries = {f'{name}.{method}': {'args': [arg['name'] for arg in dist_spec['params']] + ['p', 'x'],
+                                    'ulp_ceiling': dist_spec['ulp_ceiling'][method]}
+               for name, dist_spec in spec.items() for method in dist_spec['methods']}
+    return open_columns(opts, entries, {'harness': 'difftest-dist', 'seed': opts['seed']})
+
+def sweep(spec, opts, n_override=None, baseline=None, triage=None):
+    """(results, archive). opts: difftest_engine.common_argv()'s flags. eval-dist.js runs first: the
+    references are taken at its q(p) x, so against a --baseline only the draws whose x moved need new
+    ones, and under --triage only the draws its scipy tier escalates get them at all."""
+    draws = baseline.draws if baseline else generate_points(spec, opts['seed'], n_override)
+    archive = open_archive(opts, draws, baseline)
+    bridge = Bridge(EVAL_SCRIPT, chunk=opts['bridge_chunk'], timeout=opts['bridge_timeout'], timing=opts['timing'])
+    bridged, _ = bridge.eval([{'dist': name, 'params': params, 'p': p} for name, params, p in draws])
+    results = _init_results(spec, opts['worst_k'])
+    columns = _open_columns(spec, opts)
+    if opts['timing']:
+        for data in results.values():
+            data['timing'] = []
+    points, indices, gots = [], [], []
+    for index, ((name, params, p), got) in enumerate(zip(draws, bridged)):
+        if got is NON_TERMINATION or 'error' in got:
+            flag = 'non_termination' if got is NON_TERMINATION else 'error'
+            for method in spec[name]['methods']:
+                columns.add(f'{name}.{method}', params + [p], flags=(flag,))
+        if got is NON_TERMINATION:
+            _record_error(results, spec, name, 'non_termination', {'params': params, 'p': p})
+            continue
         if 'error' in got:
             _record_error(results, spec, name)
             continue
-        _record_point(results, spec, name, params, decode(got['x']), got)
-    return results
+        for method, ns in got.get('ns', {}).items():
+            results[f'{name}.{method}']['timing'].append(
+                (ns, {'params': params, 'p': p, 'x': decode(got['x'])}, params + [p]))
+        points.append((name, params, decode(got['x'])))
+        indices.append(index)
+        gots.append(got)
+    selected = _scipy_tier(triage, spec, points, gots) if triage else None
+    origins = [(index, x) for index, (_, _, x) in zip(indices, points)]
+    refs, deferred = triaged_references(points, origins, selected, lambda pt: _references(spec, pt), json.dumps,
+                                        opts, archive)
+    for i, seconds in deferred:
+        name, params, x = points[i]
+        _record_error(results, spec, name, 'deferred', {'params': params, 'x': x, 'seconds': round(seconds, 3)})
+    for i, ((name, params, x), index, got, ref) in enumerate(zip(points, indices, gots, refs)):
+        p = draws[index][2]
+        if ref is None or ref is NOT_ESCALATED:
+            flag = 'deferred' if ref is None else 'not_escalated'
+            for method in spec[name]['methods']:
+                columns.add(f'{name}.{method}', params + [p, x], None, decode(got[method]), flags=(flag,))
+            continue
+        ulps = _record_point(results, archive, columns, spec, index, name, params, p, x, got, ref)
+        if triage:
+            for method, ulp in ulps.items():
+                triage.audited(f'{name}.{method}', i, ulp)
+    columns.close()
+    archive.close()
+    if triage:
+        for key, data in results.items():
+            data['scipy_tier'] = triage.summary(key)
+    return results, archive
 
 def build_report(sweep_results, spec, seed):
     entries = {}
     for key, data in sweep_results.items():
         name, method = key.split('.')
-        rows = data['ulps']
-        # inf entries (NaN/divergence mismatches) would poison median/p99 -- tracked separately.
-        finite = [r[0] for r in rows if r[0] != float('inf')]
-        worst = max(rows, key=lambda r: r[0]) if rows else None
-        max_ulp = worst[0] if worst else None
-        ceiling = spec[name]['ulp_ceiling'][method]
-        entries[key] = {
-            'n': len(rows),
-            'errors': data['errors'],
-            'divergences': len(rows) - len(finite),
-            'max_ulp': max_ulp,
-            'median_ulp': statistics.median(finite) if finite else None,
-            'p99_ulp': (statistics.quantiles(finite, n=100)[98] if len(finite) >= 2
-                        else (finite[0] if finite else None)),
-            'ulp_ceiling': ceiling,
-            'ceiling_exceeded': ceiling is not None and max_ulp not in (None, float('inf')) and max_ulp > ceiling,
-            # Read straight from DIST_SPEC (the same dict generate_points() draws from) plus
-            # the shared p-range x is derived from, so the reported domain can never drift
-            # from what was actually sampled -- #1266 requires "the input domain actually
-            # swept ... must reflect what was measured".
-            'domain': {'params': spec[name]['params'], 'x_via_quantile_of_p': [P_LO, P_HI]},
-            'worst_case': None if worst is None else {
-                'dist': worst[1], 'params': worst[2], 'x': worst[3],
-                'mpmath_ref': worst[4], 'ranjs_value': worst[5],
-            },
+        skipped = {
+            # Points whose mpmath reference overran the watchdog budget and a bounded --retry-budget:
+            # excluded from n and every statistic, listed with the time spent on them.
+            'deferred': len(data['deferred']),
+            'deferred_points': data['deferred'],
+            # Draws whose eval-dist.js call never returned under --bridge-timeout.
+            'non_termination': len(data['non_termination']),
+            'non_termination_points': data['non_termination'],
         }
+        # domain is read straight from DIST_SPEC (the same dict generate_points() draws from) plus
+        # the shared p-range x is derived from, so the reported domain can never drift from what was
+        # actually sampled -- #1266 requires "the input domain actually swept ... must reflect what
+        # was measured".
+        entries[key] = ulp_entry(data['stats'], data['errors'], skipped, spec[name]['ulp_ceiling'][method],
+                                 {'params': spec[name]['params'], 'x_via_quantile_of_p': [P_LO, P_HI]})
+        if 'timing' in data:
+            axes = [(arg['name'], timing_edges(arg)) for arg in spec[name]['params']]
+            axes.append(('p', timing_edges({'lo': P_LO, 'hi': P_HI})))
+            entries[key]['timing'] = timing_summary(data['timing'], axes)
+        if 'scipy_tier' in data:
+            entries[key]['scipy_tier'] = data['scipy_tier']
     return {'seed': seed, 'mpmath_version': mpmath.__version__, 'mp_dps': mp.dps, 'entries': entries}
 
-def _sanitize_for_json(value):  # json.dump has no Infinity/NaN literal -- tag them as strings.
-    if isinstance(value, float):
-        if value != value:
-            return 'NaN'
-        return {float('inf'): 'Infinity', float('-inf'): '-Infinity'}.get(value, value)
-    if isinstance(value, dict):
-        return {k: _sanitize_for_json(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_sanitize_for_json(v) for v in value]
-    return value
-
-def _parse_argv():
-    def flag_value(name, default, cast):
-        return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
-    return (flag_value('--seed', DEFAULT_SEED, int), flag_value('--out', DEFAULT_OUT, str),
-            flag_value('--N', None, int))
-
 def main():
-    _self_check()
+    self_check()
     print('ulp_diff self-check passed')
     _formula_self_check()
     print('reference-formula self-check passed')
-    seed, out_path, n_override = _parse_argv()
-    report = build_report(sweep(DIST_SPEC, seed, n_override), DIST_SPEC, seed)
-    with open(out_path, 'w') as f:
-        json.dump(_sanitize_for_json(report), f, indent=2)
-    print(f'mpmath {report["mpmath_version"]}, seed {seed}')
+    opts = common_argv(DEFAULT_OUT, PROFILE_OUT)
+    profiler = enable_profiling(globals()) if opts['profile_out'] else None
+    baseline = load_baseline(opts['baseline']) if opts['baseline'] else None
+    triage = Triage(opts) if opts['triage'] else None
+    results, archive = sweep(DIST_SPEC, opts, flag_value('--N', None, int), baseline, triage)
+    report = build_report(results, DIST_SPEC, opts['seed'])
+    if profiler:
+        disable_profiling()
+        profiler.write(opts['profile_out'])
+    if archive.path:
+        report['archive'] = archive.path
+    if baseline:
+        report['baseline_diff'] = baseline_diff(baseline, archive, opts['baseline'])
+    if triage:
+        report['triage'] = triage.report()
+    write_report(opts['out'], report)
+    print(f'mpmath {report["mpmath_version"]}, seed {opts["seed"]}')
     for key, data in report['entries'].items():
         flag = ' CEILING EXCEEDED' if data['ceiling_exceeded'] else ''
-        print(f'  {key}: n={data["n"]} errors={data["errors"]} divergences={data["divergences"]} '
-              f'max={data["max_ulp"]} median={data["median_ulp"]} p99={data["p99_ulp"]} '
-              f'ceiling={data["ulp_ceiling"]}{flag}')
-    print(f'Wrote {out_path}')
+        print(f'  {key}: n={data["n"]} errors={data["errors"]} deferred={data["deferred"]} '
+              f'divergences={data["divergences"]} max={data["max_ulp"]} median={data["median_ulp"]} '
+              f'p99={data["p99_ulp"]} ceiling={data["ulp_ceiling"]}{flag}')
+        if data.get('scipy_tier'):
+            print(triage_line(data['scipy_tier']))
+        if data.get('timing'):
+            print(timing_line(data['timing']))
+    if baseline:
+        diff = report['baseline_diff']
+        print(f'against {opts["baseline"]}: {diff["references_reused"]} references reused, '
+              f'{diff["references_evaluated"]} evaluated')
+        for key, d in diff['entries'].items():
+            print(diff_line(key, d))
+    print(f'Wrote {opts["out"]}')
 
 if __name__ == '__main__':
     main()
@@ -14,117 +14,92 @@ independent metrics, both mandatory per #1269's acceptance criteria:
     #1265 pilot family (Gamma, Beta, Chi2, F, StudentT, InverseGamma) only -- an independent mpmath
     reference for all ~146 distributions is out of scope (#1265's own scope boundary).
 
-Live mpmath, out-of-band from `npm test`, same rationale as #1264/#1265 (decisions/0052). Standalone,
-no cross-script imports: ulp_diff/_self_check and the pilot family's cdf reference formulas are
-duplicated verbatim from difftest-dist.py (same no-cross-import convention that file establishes).
+Live mpmath, out-of-band from `npm test`, same rationale as #1264/#1265 (decisions/0052). The sweep
+machinery (ULP metric, bridge calls, reference watchdog and worker pool, streaming statistics,
+reference cache, --profile/--timing) is difftest_engine.py's, shared with the other difftest
+harnesses; the pilot family's cdf reference formulas are duplicated verbatim from difftest-dist.py.
 
 Usage: npm run difftest:quantile | python3 scripts/difftest-quantile.py
-       [--seed N] [--out PATH] [--n N] [--roundtrip-only] [--pilot-only]
+       [--seed N] [--out PATH] [--n N] [--pilot-n N] [--roundtrip-only] [--pilot-only]
+       [--full-bisect] [--bridge-chunk N] [--bridge-timeout SECONDS] [--point-budget SECONDS]
+       [--retry-budget SECONDS] [--jobs N] [--ref-cache PATH] [--profile [--profile-out PATH]] [--timing]
+       [--archive] [--baseline PREVIOUS_REPORT] [--worst-k K] [--column-archive DIR]
+
+--full-bisect takes the pilot references from mpmath_quantile()'s fixed 300-step bisection instead
+of the float64-seeded ULP-bracket solver (mpmath_quantile_seeded) -- same float64 references, ~20x
+the cdf evaluations; kept as a cross-check of the fast path.
+
+Each round-trip entry also carries q(p)'s work, counted by eval-quantile.js: median/max cdf and pdf
+evaluations and bracket-expansion steps per call, and the costliest p. report['roundtrip']
+['costliest_q'] ranks the COST_TOP_N distributions whose q(p) evaluates the most -- the ones most in
+need of a closed-form or better-seeded quantile.
+
+Every point goes through one long-lived eval-quantile.js process, under a --bridge-timeout
+wall-clock limit per point; a q(p) that never returns is reported as a non_termination hard failure
+and only its process is restarted. --bridge-chunk N sends chunks of N points to a fresh process
+per call instead, the timeout then per call and a chunk that hits it bisected down to its hanging
+point.
+
+--point-budget/--retry-budget, --jobs and --ref-cache apply to the pilot reference inversions as in
+difftest-special.py: a per-inversion watchdog with a deferred retry, N worker processes, and a JSON
+cache keyed by (distribution, params, p, x, solver).
+
+--worst-k K (default 50, at least 1) sets how many of each entry's worst points are listed, worst first, in its
+worst_cases -- by ULP for the pilot, by |cdf(q(p)) - p| for the round trip.
+
+--archive and --baseline record and replay a run's pilot draws, as in difftest-special.py, re-running
+the inversion only for draws whose ranjs q(p) changed -- the others keep their stored reference. The
+round-trip sweep has no mpmath reference to reuse and runs as usual.
+
+--column-archive DIR writes every pilot draw as .npy columns, as in difftest-special.py (args: the
+params then p; ranjs: its q(p)). The round-trip sweep, which has no ULP reference, is not archived.
+
+--profile records each pilot reference inversion (the only mpmath work here; the round-trip sweep
+is all ranjs) in PROFILE_OUT, or --profile-out PATH, with a top-N summary on stderr.
+
+--timing adds eval-quantile.js's per-call q(p) and cdf(q(p)) cost to every round-trip entry, and
+q(p)'s to every pilot entry: ns/call percentiles, medians per p bin (and parameter bin, pilot), and
+the regions and points more than TIMING_SLOW_FACTOR times the median. Timing repeats each call, so
+it counts against --bridge-timeout; a q(p) that takes seconds once takes about twice that here.
 """
 import json
 import math
 import random
 import statistics
 import struct
-import subprocess
 import sys
 
 import mpmath
 from mpmath import mp, mpf, gammainc, betainc
 
+from difftest_engine import (
+    Bridge, NON_TERMINATION, WORST_K, UlpStats, WorstCases, baseline_diff, common_argv, decode, diff_line, draw_arg,
+    flag_value, load_baseline, monotonic_bits, open_archive, open_columns, self_check, sweep_references,
+    timing_edges, timing_line, timing_summary, ulp_diff, ulp_entry, write_report,
+)
+from ref_profile import disable_profiling, enable_profiling, profiled
+
 mp.dps = 50
 
-DEFAULT_SEED = 42
 DEFAULT_OUT = '/tmp/difftest-quantile-report.json'
+PROFILE_OUT = '/tmp/difftest-quantile-profile.json'
 EVAL_SCRIPT = 'scripts/eval-quantile.js'
 
-# ─── ULP METRIC ─── (duplicated verbatim from difftest-dist.py, see module docstring)
-def ulp_diff(a, b):
-    """Float64 ULP distance between a and b. NaN vs NaN is 0 (not a reportable error);
-    exactly one side NaN, or a finite/infinite mismatch, is +inf (dominates max ULP)."""
-    a = float(a)
-    b = float(b)
-    a_nan = a != a
-    b_nan = b != b
-    if a_nan and b_nan:
-        return 0
-    if a_nan or b_nan:
-        return float('inf')
-    if a == b:
-        # Covers +0.0 == -0.0, whose bit patterns otherwise differ.
-        return 0
-    a_inf = math.isinf(a)
-    b_inf = math.isinf(b)
-    if a_inf or b_inf:
-        # a == b above already caught same-signed infinities.
-        return float('inf')
-    return abs(_monotonic_bits(a) - _monotonic_bits(b))
-
-def _monotonic_bits(x):
-    # Sign-magnitude float64 bits aren't monotonic across zero; remap negatives via
-    # 2**63 - bits (not 2**64 - bits, which would collide opposite-sign equal-magnitude
-    # values onto the same value). See solutions/testing/2026-08-09-1444-ulp-diff-sign-
-    # remap-same-sign-blind-self-check.md.
-    bits, = struct.unpack('>Q', struct.pack('>d', x))
-    return bits if bits < 2**63 else 2**63 - bits
-
-def _self_check():
-    """Unconditional self-validation of ulp_diff -- a broken metric must never silently
-    produce a bogus report."""
-    one_up = math.nextafter(1.0, 2.0)
-    assert ulp_diff(1.0, one_up) == 1, 'adjacent normals should be 1 ULP apart'
-    assert ulp_diff(1.0, 1.0) == 0, 'identical values should be 0 ULP apart'
-    assert ulp_diff(0.0, -0.0) == 0, 'signed zeros should be 0 ULP apart'
-    assert 0 < ulp_diff(-1e-300, 1e-300) < float('inf'), \
-        'zero-crossing pair should be a large but finite ULP distance'
-    assert ulp_diff(5e-324, 1e-323) == 1, 'adjacent subnormals should be 1 ULP apart'
-    assert ulp_diff(-5e-324, 5e-324) == 2, \
-        'adjacent subnormals straddling zero should be 2 ULP apart'
-    dbl_max = 1.7976931348623157e+308
-    assert ulp_diff(dbl_max, math.nextafter(dbl_max, 0)) == 1, \
-        'adjacent normals near DBL_MAX should be 1 ULP apart'
-    assert ulp_diff(float('inf'), float('inf')) == 0, 'equal infinities should be 0 ULP apart'
-    assert ulp_diff(float('inf'), float('-inf')) == float('inf'), \
-        'opposite-signed infinities should diverge'
-    assert ulp_diff(1.0, float('inf')) == float('inf'), \
-        'finite vs infinite should diverge'
-    assert ulp_diff(float('nan'), float('nan')) == 0, 'NaN vs NaN should be treated as equal'
-    assert ulp_diff(float('nan'), 1.0) == float('inf'), \
-        'NaN vs finite should diverge'
-    assert ulp_diff(-1.0, -1.0) == 0, 'identical negative values should be 0 ULP apart'
-    neg_one_down = math.nextafter(-1.0, -2.0)
-    assert ulp_diff(-1.0, neg_one_down) == 1, \
-        'adjacent negative normals should be 1 ULP apart'
-    # Cross-sign pair -- same-sign cases above can't catch a wrong sign-remap constant.
-    assert ulp_diff(2.0, -2.0) > 2**62, \
-        'same-magnitude opposite-sign values must not collide to a small ULP distance'
-
-def decode(value):  # undoes eval-quantile.js's Infinity/NaN string tagging (JSON has no such literal).
-    return {'Infinity': float('inf'), '-Infinity': float('-inf'), 'NaN': float('nan')}.get(value, value)
-
-def _sanitize_for_json(value):  # json.dump has no Infinity/NaN literal -- tag them as strings.
-    if isinstance(value, float):
-        if value != value:
-            return 'NaN'
-        return {float('inf'): 'Infinity', float('-inf'): '-Infinity'}.get(value, value)
-    if isinstance(value, dict):
-        return {k: _sanitize_for_json(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_sanitize_for_json(v) for v in value]
-    return value
-
-def _run_bridge(args, payload=None):
-    result = subprocess.run(['node', EVAL_SCRIPT] + args, input=payload, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(result.stderr, flush=True)
-        raise RuntimeError(f'scripts/eval-quantile.js {" ".join(args)} failed')
-    return json.loads(result.stdout)
-
-def catalog():
+# ─── HANG-ISOLATING EVAL ────────────────────────────────────────────────────────────────────────
+# A single non-terminating q(p) (see the P_TAIL_LO comment below) used to wedge the whole sweep in
+# one node process. Points stream through eval-quantile.js's serve mode under a per-point wall-clock
+# timeout, and a hanging point is a non_termination hard failure (difftest_engine.Bridge) -- on by
+# default here, unlike the other harnesses, since q(p)'s numerical inversion is where the hangs live.
+# No chunk by default: chunked calls cost a cold node + babel start each, ~1,370 of them for the
+# default round trip's ~87,700 points.
+BRIDGE_CHUNK_DEFAULT = None
+BRIDGE_TIMEOUT_DEFAULT = 60.0
+
+def catalog(bridge):
     """One valid parameter tuple, type, closed-form-vs-numerical status, and support per
     distribution, read from test/dist-cases-*.js via eval-quantile.js's catalog mode -- never a
     hand-maintained Python-side list, so the population can't drift from what's actually tested."""
-    entries = _run_bridge(['catalog'])
+    entries = bridge.run(['catalog'])
     ok = [e for e in entries if 'error' not in e]
     failed = [e for e in entries if 'error' in e]
     if failed:
@@ -144,8 +119,11 @@ def catalog():
 # whole catalog in ~2s; {1e-12, 1-1e-12} hangs on BetaNegativeBinomial alone. 1e-6 is still far
 # deeper than the existing pdf/cdf sweep's P_LO/P_HI=0.001/0.999 (difftest-dist.py).
 # See solutions/tooling/2026-08-11-2026-quantile-sweep-tail-depth-hang-beta-negative-binomial.md
+# Such a hang no longer stalls the run (eval_points above isolates it as a non_termination hard
+# failure), so these bounds can be pushed deeper to probe for more of them.
 P_TAIL_LO, P_TAIL_HI = 1e-6, 1e-1
 N_ROUNDTRIP_DEFAULT = 300
+COST_TOP_N = 20
 MONOTONICITY_TOL = 1e-9
 BOUNDARY_P_TOL = 1e-9
 
@@ -160,13 +138,19 @@ def generate_roundtrip_ps(rng, n):
     ps.sort()
     return ps
 
-def _hard_failures(name, params, ps, xs, cdf_of_qs, support, dist_type):
+def roundtrip_p_edges():
+    # Timing bins over p: TIMING_BINS // 2 log-spaced per tail plus one interior bin holding the 0.5
+    # anchor, matching how generate_roundtrip_ps() draws.
+    lower = timing_edges({'lo': P_TAIL_LO, 'hi': P_TAIL_HI, 'log_uniform': True})[::2]
+    return lower + [1 - e for e in reversed(lower)]
+
+def _hard_failures(name, params, ps, xs, cdf_of_qs, support, dist_type, worst_k=WORST_K):
     lo_closed, lo_value = support[0]['closed'], decode(support[0]['value'])
     hi_closed, hi_value = support[1]['closed'], decode(support[1]['value'])
     non_convergence = 0
     out_of_support = 0
     non_monotonicity = 0
-    worst = None  # (roundtrip_error, p, x, cdf_of_q)
+    worst = WorstCases(worst_k)
     errors = []
     prev_x = None
     for p, x, cdf_of_q in zip(ps, xs, cdf_of_qs):
@@ -197,8 +181,7 @@ def _hard_failures(name, params, ps, xs, cdf_of_qs, support, dist_type):
         if cdf_of_q == cdf_of_q:  # not NaN
             err = abs(cdf_of_q - p)
             errors.append(err)
-            if worst is None or err > worst[0]:
-                worst = (err, p, x, cdf_of_q)
+            worst.add(err, {'params': params, 'p': p, 'x': x, 'cdf_of_q': cdf_of_q, 'roundtrip_error': err})
     return {
         'errors': errors,
         'hard_failures': {
@@ -209,17 +192,41 @@ def _hard_failures(name, params, ps, xs, cdf_of_qs, support, dist_type):
         'worst': worst,
     }
 
-def sweep_roundtrip(entries, ps, seed):
+def _work_summary(done):
+    """Median/max of eval-quantile.js's q(p) work counters -- cdf/pdf evaluations and bracket-
+    expansion steps -- over the (p, result) pairs that returned, and the costliest p (most cdf + pdf
+    evaluations). None if no point returned."""
+    counted = [(p, r) for p, r in done if 'work' in r]
+    if not counted:
+        return None
+    summary = {'method': counted[0][1]['work']['method']}
+    for counter in ('cdf', 'pdf', 'bracket'):
+        values = [r['work'][counter] for _, r in counted]
+        summary[f'median_{counter}'] = statistics.median(values)
+        summary[f'max_{counter}'] = max(values)
+    p, r = max(counted, key=lambda pr: pr[1]['work']['cdf'] + pr[1]['work']['pdf'])
+    summary['worst_case'] = {'p': p, 'x': decode(r['x']), 'cdf': r['work']['cdf'], 'pdf': r['work']['pdf'],
+                             'bracket': r['work']['bracket']}
+    return summary
+
+def sweep_roundtrip(entries, ps, bridge, timing=False, worst_k=WORST_K):
     points = [{'name': e['name'], 'params': e['params'], 'p': p} for e in entries for p in ps]
-    results = _run_bridge(['eval'], json.dumps(points))
+    results, _ = bridge.eval(points)
     n = len(ps)
     report = {}
     for i, e in enumerate(entries):
-        chunk = results[i * n:(i + 1) * n]
-        bridge_errors = sum(1 for r in chunk if 'error' in r)
-        xs = [decode(r['x']) if 'error' not in r else float('nan') for r in chunk]
-        cdf_of_qs = [decode(r['cdfOfQ']) if 'error' not in r else float('nan') for r in chunk]
-        hf = _hard_failures(e['name'], e['params'], ps, xs, cdf_of_qs, e['support'], e['type'])
+        rows = results[i * n:(i + 1) * n]
+        # A hung point has no x to judge -- kept out of _hard_failures so it isn't also counted as a
+        # NaN non-convergence, and out of the monotonicity chain like a NaN would be.
+        hung_ps = [p for p, r in zip(ps, rows) if r is NON_TERMINATION]
+        done = [(p, r) for p, r in zip(ps, rows) if r is not NON_TERMINATION]
+        bridge_errors = sum(1 for _, r in done if 'error' in r)
+        xs = [decode(r['x']) if 'error' not in r else float('nan') for _, r in done]
+        cdf_of_qs = [decode(r['cdfOfQ']) if 'error' not in r else float('nan') for _, r in done]
+        hf = _hard_failures(e['name'], e['params'], [p for p, _ in done], xs, cdf_of_qs, e['support'],
+                            e['type'], worst_k)
+        worst = [case for _, case in hf['worst'].ranked()]
+        hf['hard_failures']['non_termination'] = len(hung_ps)
         finite_errors = hf['errors']
         report[e['name']] = {
             'n': n,
@@ -228,22 +235,35 @@ def sweep_roundtrip(entries, ps, seed):
             'errors': bridge_errors,
             'max_roundtrip_error': max(finite_errors) if finite_errors else None,
             'median_roundtrip_error': statistics.median(finite_errors) if finite_errors else None,
-            'worst_case': None if hf['worst'] is None else {
-                'params': e['params'], 'p': hf['worst'][1], 'x': hf['worst'][2],
-                'cdf_of_q': hf['worst'][3], 'roundtrip_error': hf['worst'][0],
-            },
+            'worst_case': worst[0] if worst else None,
+            'worst_cases': worst,
             'hard_failures': hf['hard_failures'],
+            'non_termination_ps': hung_ps,
+            'work': _work_summary(done),
         }
+        if timing:
+            axes = [('p', roundtrip_p_edges())]
+            report[e['name']]['timing'] = {
+                method: timing_summary([(r['ns'][method], {'p': p, 'x': decode(r['x'])}, [p])
+                                        for p, r in done if 'ns' in r], axes)
+                for method in ('q', 'cdf')}
     return report
 
-def build_roundtrip_report(entries, seed, n):
+def build_roundtrip_report(entries, seed, n, bridge, timing=False, worst_k=WORST_K):
     ps = generate_roundtrip_ps(random.Random(seed), n)
-    roundtrip = sweep_roundtrip(entries, ps, seed)
+    roundtrip = sweep_roundtrip(entries, ps, bridge, timing, worst_k)
+    costs = [(name, e['work']) for name, e in roundtrip.items() if e['work'] is not None]
+    costs.sort(key=lambda nw: -(nw[1]['median_cdf'] + nw[1]['median_pdf']))
     return {
         'seed': seed,
         'n_per_distribution': n,
         # Acceptance criterion: "report states smallest p and largest 1-p probed".
         'probe_range': {'p_min': min(ps), 'p_max': max(ps), 'one_minus_p_min': 1 - max(ps)},
+        # The distributions whose q(p) costs the most evaluations per call -- first in line for a
+        # closed-form or better-seeded quantile.
+        'costliest_q': [{'name': name, 'method': w['method'], 'median_evals': w['median_cdf'] + w['median_pdf'],
+                         'max_evals': w['max_cdf'] + w['max_pdf'], 'median_bracket': w['median_bracket']}
+                        for name, w in costs[:COST_TOP_N]],
         'entries': roundtrip,
     }
 
@@ -294,19 +314,13 @@ CDF_FN = {
     'StudentT': studentt_cdf, 'InverseGamma': inversegamma_cdf,
 }
 
-# Duplicated verbatim from difftest-dist.py's DIST_SPEC helpers (same no-cross-import convention).
+# Duplicated verbatim from difftest-dist.py's DIST_SPEC helpers.
 def _shape_params(*names):
     return [{'name': n, 'lo': 0.01, 'hi': 100, 'log_uniform': True} for n in names]
 
 def _df_params(*names):
     return [{'name': n, 'lo': 1, 'hi': 200, 'log_uniform': True} for n in names]
 
-def _draw_param(rng, arg):
-    if arg['log_uniform']:
-        lo, hi = math.log(arg['lo']), math.log(arg['hi'])
-        return math.exp(rng.uniform(lo, hi))
-    return rng.uniform(arg['lo'], arg['hi'])
-
 def _formula_self_check_quantile():
     tol = mpf('1e-45')
     assert mpmath.almosteq(gamma_cdf([1, 1], mpmath.log(2)), mpf('0.5'), rel_eps=tol), \
@@ -335,6 +349,18 @@ def _formula_self_check_quantile():
     lin_r = mpmath_quantile(studentt_cdf, [5], mpf('0.001'), mpf(100), None, None)
     assert mpmath.almosteq(studentt_cdf([5], lin_r), mpf('0.001'), rel_eps=tol), \
         'mpmath_quantile linear branch: studentt_cdf(quantile(p)) should round-trip to p'
+    # The seeded solver must land on exactly float(mpmath_quantile(...)) -- both from a seed a few
+    # ULPs off (the common case: no widening) and from the same far seeds as above (forcing the
+    # geometric ULP widening, including across a support boundary and across zero).
+    for cdf_fn, params, p, lo_bound, hi_bound, exact in (
+            (gamma_cdf, [2, 1], '0.001', mpf(0), None, log_r),
+            (beta_cdf, [2, 3], '0.001', mpf(0), mpf(1), logit_r),
+            (studentt_cdf, [5], '0.001', None, None, lin_r)):
+        near = math.nextafter(math.nextafter(float(exact), math.inf), math.inf)
+        for x0 in (near, 1.0, 0.5, 100.0, -3.0):
+            got = mpmath_quantile_seeded(cdf_fn, params, mpf(p), x0, lo_bound, hi_bound)
+            assert got == float(exact), \
+                f'mpmath_quantile_seeded from x0={x0} should round to float(mpmath_quantile(...))'
 
 def _expand_and_bisect(g, y0, gy0, iters=300):
     """g is f reparameterized so a fixed additive step in y is meaningful (see mpmath_quantile's
@@ -403,6 +429,109 @@ def mpmath_quantile(cdf_fn, params, p, x0, lo_bound, hi_bound):
     fx0 = f(x0)
     return x0 if fx0 == 0 else _expand_and_bisect(f, x0, fx0)
 
+# ─── FLOAT64-SEEDED REFERENCE SOLVER ───
+# Only the float64 rounding of the root is ever compared against ranjs, and ranjs's own q(p) is
+# usually within a few thousand ULPs of it -- so mpmath_quantile()'s 300 fixed bisections (each a full
+# gammainc/betainc at mp.dps=50) are almost all spent resolving digits float() then throws away.
+# mpmath_quantile_seeded() brackets in ULP space around the seed instead, and stops as soon as the
+# bracket ends are adjacent float64s. Widening by ULP count is multiplicative in x far from the seed
+# (one binade is 2**52 ULPs), so it stays well-conditioned across the same many-orders-of-magnitude
+# roots that forced mpmath_quantile()'s log/logit reparameterization.
+SEED_BRACKET_ULP = 1024
+SEED_WIDEN_FACTOR = 16
+_MAX_FINITE_BITS = monotonic_bits(1.7976931348623157e+308)
+
+def _from_monotonic_bits(m):
+    """Inverse of monotonic_bits, clamped to the finite float64 range (-0.0 maps to +0.0)."""
+    m = max(-_MAX_FINITE_BITS, min(_MAX_FINITE_BITS, m))
+    bits = m if m >= 0 else 2**63 - m
+    return struct.unpack('>d', struct.pack('>Q', bits))[0]
+
+def _round_adjacent(f, xa, xb):
+    """Correctly rounds a root bracketed by the adjacent float64s xa < xb: the sign of f at their
+    exact (mpf) midpoint says which one is nearer. An exact tie goes to the even significand."""
+    fm = f((mpf(xa) + mpf(xb)) / 2)
+    if fm == 0:
+        return xa if struct.unpack('>Q', struct.pack('>d', xa))[0] % 2 == 0 else xb
+    return xa if fm > 0 else xb
+
+def mpmath_quantile_seeded(cdf_fn, params, p, x0, lo_bound, hi_bound):
+    """Correctly rounded float64 inverse of cdf_fn, seeded from ranjs's own x0. Brackets
+    [x0 - k ULP, x0 + k ULP] (k = SEED_BRACKET_ULP, widened by SEED_WIDEN_FACTOR on whichever side
+    the root is not yet bracketed), then narrows with Illinois (modified regula falsi) steps snapped
+    to float64, falling back to a bisection in ULP space whenever a step fails to halve the bracket
+    -- so it never needs more than ~2x the 64 halvings a float64 bracket can take. Stops once the
+    bracket ends are adjacent floats and picks the nearer one (_round_adjacent).
+
+    A seed that is not finite or not strictly inside the support, or a bracket that cannot be
+    widened any further, falls back to mpmath_quantile()'s bracket expansion + bisection -- the
+    same reference, just at its full fixed cost."""
+    def fallback():
+        return float(mpmath_quantile(cdf_fn, params, p, x0, lo_bound, hi_bound))
+
+    lo_m = -_MAX_FINITE_BITS if lo_bound is None else monotonic_bits(float(lo_bound))
+    hi_m = _MAX_FINITE_BITS if hi_bound is None else monotonic_bits(float(hi_bound))
+    if not (x0 == x0 and math.isfinite(x0)):
+        return fallback()
+    m0 = monotonic_bits(float(x0))
+    if not lo_m < m0 < hi_m:
+        return fallback()
+    pm = mpf(p)
+
+    def f(x):
+        return cdf_fn(params, x) - pm
+
+    def at(m):
+        return f(_from_monotonic_bits(m))
+
+    k_lo = k_hi = SEED_BRACKET_ULP
+    ma, mb = max(m0 - k_lo, lo_m), min(m0 + k_hi, hi_m)
+    fa, fb = at(ma), at(mb)
+    while fa > 0 or fb < 0:
+        if fa > 0:
+            if ma == lo_m:
+                return fallback()
+            mb, fb = ma, fa
+            k_lo *= SEED_WIDEN_FACTOR
+            ma = max(m0 - k_lo, lo_m)
+            fa = at(ma)
+        else:
+            if mb == hi_m:
+                return fallback()
+            ma, fa = mb, fb
+            k_hi *= SEED_WIDEN_FACTOR
+            mb = min(m0 + k_hi, hi_m)
+            fb = at(mb)
+    if fa == 0:
+        return _from_monotonic_bits(ma)
+    if fb == 0:
+        return _from_monotonic_bits(mb)
+
+    secant, side = True, 0
+    while mb - ma > 1:
+        width = mb - ma
+        if secant:
+            xa, xb = mpf(_from_monotonic_bits(ma)), mpf(_from_monotonic_bits(mb))
+            mc = monotonic_bits(float(xb - fb * (xb - xa) / (fb - fa)))
+            mc = min(max(mc, ma + 1), mb - 1)
+        else:
+            mc = (ma + mb) // 2
+        fc = at(mc)
+        if fc == 0:
+            return _from_monotonic_bits(mc)
+        if fc > 0:
+            mb, fb = mc, fc
+            if side == 1:
+                fa /= 2
+            side = 1
+        else:
+            ma, fa = mc, fc
+            if side == -1:
+                fb /= 2
+            side = -1
+        secant = mb - ma <= width // 2
+    return _round_adjacent(f, _from_monotonic_bits(ma), _from_monotonic_bits(mb))
+
 PILOT_SPEC = {
     'Gamma': {'params': _shape_params('alpha', 'beta'), 'lo_bound': mpf(0), 'hi_bound': None},
     'Beta': {'params': _shape_params('alpha', 'beta'), 'lo_bound': mpf(0), 'hi_bound': mpf(1)},
@@ -424,95 +553,165 @@ PILOT_ULP_CEILING = {
     'InverseGamma': 65536,
 }
 
-def sweep_pilot_absolute(seed, n):
+def _pilot_reference(point, full_bisect):
+    name, params, p, x = point
+    spec = PILOT_SPEC[name]
+    solver = mpmath_quantile if full_bisect else mpmath_quantile_seeded
+    with profiled(name, params, 'q', p):
+        return float(solver(CDF_FN[name], params, p, x, spec['lo_bound'], spec['hi_bound']))
+
+def _pilot_draws(seed, n):
     rng = random.Random(seed)
     ps = generate_roundtrip_ps(rng, n)
     draws = []
     for name, spec in PILOT_SPEC.items():
         for p in ps:
-            params = [_draw_param(rng, arg) for arg in spec['params']]
+            params = [draw_arg(rng, arg) for arg in spec['params']]
             draws.append((name, params, p))
+    return draws
+
+def sweep_pilot_absolute(seed, n, bridge, opts, full_bisect=False, baseline=None):
+    """(results, archive). opts: difftest_engine.common_argv()'s flags. Each reference inversion is
+    seeded from ranjs's own q(p), so the bridge runs first -- and against a --baseline (whose draws are
+    replayed) only the draws whose q(p) moved need a new inversion."""
+    draws = baseline.draws if baseline else _pilot_draws(seed, n)
+    archive = open_archive(opts, draws, baseline)
     points = [{'name': name, 'params': params, 'p': p} for name, params, p in draws]
-    bridged = _run_bridge(['eval'], json.dumps(points))
-    results = {name: {'ulps': [], 'errors': 0} for name in PILOT_SPEC}
-    for (name, params, p), got in zip(draws, bridged):
+    bridged, _ = bridge.eval(points)
+    results = {name: {'stats': UlpStats(opts['worst_k']), 'errors': 0, 'non_termination': [], 'deferred': []}
+               for name in PILOT_SPEC}
+    columns = open_columns(opts, {f'{name}.quantile': {'args': [arg['name'] for arg in spec['params']] + ['p'],
+                                                       'ulp_ceiling': PILOT_ULP_CEILING[name]}
+                                  for name, spec in PILOT_SPEC.items()},
+                           {'harness': 'difftest-quantile', 'sweep': 'pilot', 'seed': seed})
+    if opts['timing']:
+        for data in results.values():
+            data['timing'] = []
+    inversions, origins = [], []
+    solver = 'full_bisect' if full_bisect else 'float64_seeded'
+    for index, ((name, params, p), got) in enumerate(zip(draws, bridged)):
+        if got is NON_TERMINATION:
+            results[name]['non_termination'].append({'params': params, 'p': p})
+            columns.add(f'{name}.quantile', params + [p], flags=('non_termination',))
+            continue
         if 'error' in got:
             results[name]['errors'] += 1
+            columns.add(f'{name}.quantile', params + [p], flags=('error',))
             continue
+        if 'ns' in got:
+            results[name]['timing'].append(
+                (got['ns']['q'], {'params': params, 'p': p, 'x': decode(got['x'])}, params + [p]))
         x = decode(got['x'])
         if x != x:  # a NaN q(p) is a round-trip-detected non-convergence, not an ULP-accuracy point
             results[name]['errors'] += 1
+            columns.add(f'{name}.quantile', params + [p], None, x, flags=('error',))
             continue
-        spec = PILOT_SPEC[name]
-        ref = float(mpmath_quantile(CDF_FN[name], params, p, x, spec['lo_bound'], spec['hi_bound']))
-        results[name]['ulps'].append((ulp_diff(ref, x), name, params, p, ref, x))
-    return results
-
-def build_pilot_report(seed, n):
-    results = sweep_pilot_absolute(seed, n)
+        inversions.append((name, params, p, x))
+        origins.append((index, [x, solver]))
+    refs, deferred = sweep_references(inversions, origins, lambda pt: _pilot_reference(pt, full_bisect),
+                                      lambda pt: json.dumps([*pt, solver]), opts, archive)
+    for i, seconds in deferred:
+        name, params, p, x = inversions[i]
+        results[name]['deferred'].append({'params': params, 'p': p, 'seconds': round(seconds, 3)})
+    for (name, params, p, x), (index, _), ref in zip(inversions, origins, refs):
+        if ref is None:
+            columns.add(f'{name}.quantile', params + [p], None, x, flags=('deferred',))
+            continue
+        ulp = ulp_diff(ref, x)
+        results[name]['stats'].add(ulp, {'params': params, 'p': p, 'mpmath_ref': ref, 'ranjs_value': x})
+        archive.add(f'{name}.quantile', index, x, ref)
+        columns.add(f'{name}.quantile', params + [p], ref, x, ulp)
+    columns.close()
+    archive.close()
+    return results, archive
+
+def build_pilot_report(seed, n, bridge, opts, full_bisect=False, baseline=None):
+    """(entries, archive)."""
+    results, archive = sweep_pilot_absolute(seed, n, bridge, opts, full_bisect, baseline)
     entries = {}
     for name, data in results.items():
-        rows = data['ulps']
-        finite = [r[0] for r in rows if r[0] != float('inf')]
-        worst = max(rows, key=lambda r: r[0]) if rows else None
-        max_ulp = worst[0] if worst else None
-        ceiling = PILOT_ULP_CEILING[name]
-        entries[f'{name}.quantile'] = {
-            'n': len(rows),
-            'errors': data['errors'],
-            'divergences': len(rows) - len(finite),
-            'max_ulp': max_ulp,
-            'median_ulp': statistics.median(finite) if finite else None,
-            'p99_ulp': (statistics.quantiles(finite, n=100)[98] if len(finite) >= 2
-                        else (finite[0] if finite else None)),
-            'ulp_ceiling': ceiling,
-            'ceiling_exceeded': ceiling is not None and max_ulp not in (None, float('inf')) and max_ulp > ceiling,
-            'domain': {'params': PILOT_SPEC[name]['params'], 'p_range': [P_TAIL_LO, 1 - P_TAIL_LO]},
-            'worst_case': None if worst is None else {
-                'params': worst[2], 'p': worst[3], 'mpmath_ref': worst[4], 'ranjs_value': worst[5],
-            },
+        skipped = {
+            'non_termination': len(data['non_termination']),
+            'non_termination_points': data['non_termination'],
+            # Inversions that overran the watchdog budget and a bounded --retry-budget, as in difftest-special.py.
+            'deferred': len(data['deferred']),
+            'deferred_points': data['deferred'],
         }
-    return entries
+        entries[f'{name}.quantile'] = ulp_entry(data['stats'], data['errors'], skipped, PILOT_ULP_CEILING[name],
+                                                {'params': PILOT_SPEC[name]['params'],
+                                                 'p_range': [P_TAIL_LO, 1 - P_TAIL_LO]})
+        if 'timing' in data:
+            axes = [(arg['name'], timing_edges(arg)) for arg in PILOT_SPEC[name]['params']]
+            axes.append(('p', roundtrip_p_edges()))
+            entries[f'{name}.quantile']['timing'] = timing_summary(data['timing'], axes)
+    return entries, archive
 
 def _parse_argv():
-    def flag_value(name, default, cast):
-        return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
     return (
-        flag_value('--seed', DEFAULT_SEED, int),
-        flag_value('--out', DEFAULT_OUT, str),
+        common_argv(DEFAULT_OUT, PROFILE_OUT, BRIDGE_CHUNK_DEFAULT, BRIDGE_TIMEOUT_DEFAULT),
         flag_value('--n', N_ROUNDTRIP_DEFAULT, int),
         flag_value('--pilot-n', N_PILOT_DEFAULT, int),
         '--pilot-only' in sys.argv,
         '--roundtrip-only' in sys.argv,
+        '--full-bisect' in sys.argv,
     )
 
 def main():
-    _self_check()
+    self_check()
     print('ulp_diff self-check passed')
     _formula_self_check_quantile()
     print('quantile reference-formula self-check passed')
-    seed, out_path, n, pilot_n, pilot_only, roundtrip_only = _parse_argv()
+    opts, n, pilot_n, pilot_only, roundtrip_only, full_bisect = _parse_argv()
+    seed, timing = opts['seed'], opts['timing']
+    profiler = enable_profiling(globals()) if opts['profile_out'] else None
+    bridge = Bridge(EVAL_SCRIPT, ['eval'], opts['bridge_chunk'], opts['bridge_timeout'], timing, serve=['serve'])
 
-    report = {'seed': seed, 'mpmath_version': mpmath.__version__, 'mp_dps': mp.dps}
+    # chunk None: the persistent serve-mode bridge, timeout_s per point rather than per call.
+    report = {'seed': seed, 'mpmath_version': mpmath.__version__, 'mp_dps': mp.dps,
+              'bridge': {'chunk': opts['bridge_chunk'], 'timeout_s': opts['bridge_timeout']}}
 
     if not pilot_only:
-        entries = catalog()
-        report['roundtrip'] = build_roundtrip_report(entries, seed, n)
+        entries = catalog(bridge)
+        report['roundtrip'] = build_roundtrip_report(entries, seed, n, bridge, timing, opts['worst_k'])
         rt = report['roundtrip']['entries']
         n_hard = sum(sum(e['hard_failures'].values()) for e in rt.values())
         print(f'roundtrip: {len(rt)} distributions, probe range {report["roundtrip"]["probe_range"]}, '
               f'{n_hard} hard-failure point(s) across all distributions')
+        for c in report['roundtrip']['costliest_q'][:10]:
+            print(f'  {c["name"]}.q ({c["method"]}): median {c["median_evals"]:g} evals, '
+                  f'max {c["max_evals"]}, median {c["median_bracket"]:g} bracket steps')
+        if timing:
+            for name, data in rt.items():
+                slow = {m: t for m, t in data['timing'].items() if t and (t['slow_regions'] or t['slow_points'])}
+                for method, t in slow.items():
+                    print(f'  {name}.{method}:')
+                    print(timing_line(t))
 
     if not roundtrip_only:
-        report['pilot'] = build_pilot_report(seed, pilot_n)
+        baseline = load_baseline(opts['baseline']) if opts['baseline'] else None
+        report['pilot_solver'] = 'full_bisect' if full_bisect else 'float64_seeded'
+        report['pilot'], archive = build_pilot_report(seed, pilot_n, bridge, opts, full_bisect, baseline)
         for key, data in report['pilot'].items():
             flag = ' CEILING EXCEEDED' if data['ceiling_exceeded'] else ''
             print(f'  {key}: n={data["n"]} errors={data["errors"]} divergences={data["divergences"]} '
-                  f'max={data["max_ulp"]} median={data["median_ulp"]}{flag}')
-
-    with open(out_path, 'w') as f:
-        json.dump(_sanitize_for_json(report), f, indent=2)
-    print(f'Wrote {out_path}')
+                  f'non_termination={data["non_termination"]} deferred={data["deferred"]} max={data["max_ulp"]} '
+                  f'median={data["median_ulp"]}{flag}')
+            if data.get('timing'):
+                print(timing_line(data['timing']))
+        if archive.path:
+            report['archive'] = archive.path
+        if baseline:
+            report['baseline_diff'] = diff = baseline_diff(baseline, archive, opts['baseline'])
+            print(f'against {opts["baseline"]}: {diff["references_reused"]} references reused, '
+                  f'{diff["references_evaluated"]} evaluated')
+            for key, d in diff['entries'].items():
+                print(diff_line(key, d))
+    if profiler:
+        disable_profiling()
+        profiler.write(opts['profile_out'])
+
+    write_report(opts['out'], report)
+    print(f'Wrote {opts["out"]}')
 
 if __name__ == '__main__':
     main()
@@ -16,119 +16,75 @@ remain the sole CI-enforced correctness contract. See
 decisions/0052-differential-testing-harness-live-mpmath-out-of-band.md -- differential-testing
 harness evaluates mpmath live and runs out-of-band from npm test.
 
-This script is deliberately fully standalone (does not import from
-precision-refs-special.py) -- that file's hyphenated name isn't a valid Python module
-identifier, and every existing scripts/*.py file in this repo is independently
-self-contained with no cross-script imports. The half-dozen one-line mpmath reference
-wrappers this script needs are duplicated from precision-refs-special.py rather than
-shared.
+The sweep machinery -- ULP metric, bridge calls, reference watchdog and worker pool, streaming
+statistics, reference cache, --profile/--timing -- is difftest_engine.py's, shared with the other
+difftest harnesses; this file is the spec, the references and the sweep's own flow. The half-dozen
+one-line mpmath reference wrappers are duplicated from precision-refs-special.py (whose hyphenated
+name isn't a valid Python module identifier) rather than shared.
 
 Requires: pip install mpmath (already in scripts/requirements.txt)
 Usage: npm run difftest:special
        python3 scripts/difftest-special.py [--seed N] [--out PATH] [--N COUNT]
+                                           [--point-budget SECONDS] [--retry-budget SECONDS]
+                                           [--jobs N] [--ref-cache PATH]
+                                           [--bridge-chunk N] [--bridge-timeout SECONDS]
+                                           [--profile [--profile-out PATH]] [--timing]
+                                           [--archive] [--baseline PREVIOUS_REPORT] [--worst-k K]
+                                           [--column-archive DIR]
+                                           [--triage [--triage-ulp N] [--triage-audit FRACTION]]
+
+--jobs evaluates the mpmath references on N worker processes (forced to 1 under --profile).
+--ref-cache keeps them in a JSON file keyed by point, so a re-run with the same seed only evaluates
+the points it hasn't seen; the file is discarded when mpmath's version or mp.dps changes.
+--archive streams the run's points, references and ranjs values to a .points.json.gz file next to
+its report. --baseline replays such an archived run's points against the current ranjs, reusing its
+stored mpmath references -- they depend on the point alone -- and adds a per-function baseline_diff
+of the points whose ULP error improved or regressed. Verifying a ranjs fix then costs a bridge call,
+not a full re-sweep.
+--bridge-chunk/--bridge-timeout split the eval-special.js call into chunks under a wall-clock limit
+each, isolating a ranjs call that never returns as a non_termination point (default: one call, no
+limit).
+
+--worst-k K (default 50) sets how many of each function's worst points its report entry lists, worst
+first, in worst_cases -- the whole cluster around worst_case (e.g. every besselK point in the x~6
+band), kept in a bounded heap rather than by holding every point. K must be at least 1.
+
+--column-archive DIR also writes every draw -- deferred, errored and non-terminating ones included,
+flagged -- to DIR as one .npy file per column (entry, args, ref, ranjs, ulp, flags) plus index.json,
+for numpy.load(..., mmap_mode='r'); see difftest_engine.ColumnArchive.
+
+--triage (needs numpy and scipy) compares every ranjs value against scipy.special first, in one
+vectorized call per function, and takes an mpmath reference only where the two disagree by more than
+--triage-ulp N ULP (default 16), plus a seeded --triage-audit fraction (default 0.01) of the points
+where they agree. Each function's entry then covers the mpmath tier alone, and its scipy_tier gives
+the first tier's counts and ranjs-vs-scipy ULP statistics over every point, including how many
+audited points still exceeded the threshold against mpmath.
+
+--timing has eval-special.js also time every ranjs call and adds per-function ns/call percentiles,
+per-argument domain-bin medians, and the regions and points more than TIMING_SLOW_FACTOR times the
+median to each function's report entry.
 """
 import json
-import math
 import random
-import statistics
-import struct
-import subprocess
-import sys
 
 import mpmath
 from mpmath import mp, besseli, besselk
 from mpmath import digamma as mp_digamma
 
+from difftest_engine import (
+    Bridge, NON_TERMINATION, NOT_ESCALATED, Triage, UlpStats, baseline_diff, common_argv, decode, diff_line,
+    draw_arg, flag_value, load_baseline, open_archive, open_columns, self_check, timing_edges, timing_line,
+    timing_summary, triage_line, triaged_references, ulp_diff, ulp_entry, write_report,
+)
+from ref_profile import disable_profiling, enable_profiling, profiled
+
 mp.dps = 50
 
-DEFAULT_SEED = 42
 DEFAULT_OUT = '/tmp/difftest-special-report.json'
+PROFILE_OUT = '/tmp/difftest-special-profile.json'
 EVAL_SCRIPT = 'scripts/eval-special.js'
 
 
-# ─── ULP METRIC ───
-
-def ulp_diff(a, b):
-    """Float64 ULP distance between a and b.
-
-    NaN vs NaN is treated as trivially equal (0) rather than propagating IEEE's
-    NaN != NaN, since two NaN reference/ranjs values agreeing that a point diverges
-    is not itself a reportable error; exactly one side being NaN is a real
-    divergence, reported as +inf rather than an arbitrary large integer so it always
-    dominates a function's max ULP and cannot be quietly out-ranked by a merely large
-    finite count.
-    """
-    a = float(a)
-    b = float(b)
-    a_nan = a != a
-    b_nan = b != b
-    if a_nan and b_nan:
-        return 0
-    if a_nan or b_nan:
-        return float('inf')
-    if a == b:
-        # Covers +0.0 == -0.0, whose bit patterns otherwise differ.
-        return 0
-    a_inf = math.isinf(a)
-    b_inf = math.isinf(b)
-    if a_inf or b_inf:
-        # a == b above already caught same-signed infinities.
-        return float('inf')
-    return abs(_monotonic_bits(a) - _monotonic_bits(b))
-
-
-def _monotonic_bits(x):
-    # IEEE 754 float64 is sign-magnitude, not two's complement: the raw unsigned
-    # bit pattern is NOT monotonically ordered across the zero crossing (e.g. -1.0's
-    # bits are numerically larger than 1.0's). Remapping negative values via
-    # 2**63 - bits mirrors the negative range back around 2**63 (rather than folding
-    # it into the top of the unsigned range via 2**64 - bits, which would collide two
-    # equal-magnitude opposite-sign values onto the same monotonic value and make
-    # ulp_diff silently return 0 for a sign mismatch) -- the standard trick for
-    # computing ULP distance as a simple integer subtraction. Subnormals need no
-    # special case -- IEEE 754 defines their bit pattern to continue the same
-    # ordering right through zero. See
-    # solutions/testing/2026-08-09-1444-ulp-diff-sign-remap-same-sign-blind-self-check.md
-    bits, = struct.unpack('>Q', struct.pack('>d', x))
-    return bits if bits < 2**63 else 2**63 - bits
-
-
-def _self_check():
-    """Inline self-validation of ulp_diff, run unconditionally before every sweep --
-    a broken ULP metric must never silently produce a bogus report."""
-    one_up = math.nextafter(1.0, 2.0)
-    assert ulp_diff(1.0, one_up) == 1, 'adjacent normals should be 1 ULP apart'
-    assert ulp_diff(1.0, 1.0) == 0, 'identical values should be 0 ULP apart'
-    assert ulp_diff(0.0, -0.0) == 0, 'signed zeros should be 0 ULP apart'
-    assert 0 < ulp_diff(-1e-300, 1e-300) < float('inf'), \
-        'zero-crossing pair should be a large but finite ULP distance'
-    assert ulp_diff(5e-324, 1e-323) == 1, 'adjacent subnormals should be 1 ULP apart'
-    assert ulp_diff(-5e-324, 5e-324) == 2, \
-        'adjacent subnormals straddling zero should be 2 ULP apart'
-    dbl_max = 1.7976931348623157e+308
-    assert ulp_diff(dbl_max, math.nextafter(dbl_max, 0)) == 1, \
-        'adjacent normals near DBL_MAX should be 1 ULP apart'
-    assert ulp_diff(float('inf'), float('inf')) == 0, 'equal infinities should be 0 ULP apart'
-    assert ulp_diff(float('inf'), float('-inf')) == float('inf'), \
-        'opposite-signed infinities should diverge'
-    assert ulp_diff(1.0, float('inf')) == float('inf'), \
-        'finite vs infinite should diverge'
-    assert ulp_diff(float('nan'), float('nan')) == 0, 'NaN vs NaN should be treated as equal'
-    assert ulp_diff(float('nan'), 1.0) == float('inf'), \
-        'NaN vs finite should diverge'
-    assert ulp_diff(-1.0, -1.0) == 0, 'identical negative values should be 0 ULP apart'
-    neg_one_down = math.nextafter(-1.0, -2.0)
-    assert ulp_diff(-1.0, neg_one_down) == 1, \
-        'adjacent negative normals should be 1 ULP apart'
-    # Same-magnitude, opposite-sign pair: same-sign adjacency (above) can't catch a
-    # wrong sign-remapping constant in _monotonic_bits, since a wrong-but-consistent
-    # constant cancels out in the subtraction for two values on the same side of zero.
-    # This is the case that actually exercises it -- it must be a large, easily
-    # distinguishable distance, never 0.
-    assert ulp_diff(2.0, -2.0) > 2**62, \
-        'same-magnitude opposite-sign values must not collide to a small ULP distance'
-
-
 # ─── REFERENCE FORMULAS ───
 # Duplicated one-line mpmath wrappers from precision-refs-special.py:91-147 rather than
 # imported -- that file's hyphenated name isn't a valid Python module identifier, and
@@ -176,6 +132,25 @@ REF_FN = {
 }
 
 
+def scipy_fns(np, scipy):
+    """--triage's float64 counterparts of REF_FN, vectorized over argument arrays. Built on demand:
+    scipy is only imported under --triage."""
+    sp = scipy.special
+
+    def besselISpherical(n, x):
+        # spherical_in() only takes n >= 0; negative n goes through DLMF 10.47.9, as besselISpherical_ref.
+        return np.where(n >= 0, sp.spherical_in(np.maximum(n, 0).astype(np.int64), x),
+                        np.sqrt(np.pi / (2 * x)) * sp.iv(n + 0.5, x))
+    return {
+        'besselI': sp.iv,
+        'besselISpherical': besselISpherical,
+        'besselInu': sp.iv,
+        'besselK': sp.kv,
+        'besselKnu': sp.kv,
+        'digamma': sp.psi,
+    }
+
+
 # ─── SWEEP CONFIGURATION ───
 # Declarative per-function domain: adding sweep coverage for a new function is a config
 # entry here, not new driver code. Domains are chosen from the thresholds
@@ -266,94 +241,122 @@ def generate_points(spec, seed, n_override=None):
     for fn, fn_spec in spec.items():
         n = n_override if n_override is not None else fn_spec['n']
         for _ in range(n):
-            args = []
-            for arg in fn_spec['args']:
-                if arg['kind'] == 'int':
-                    args.append(rng.randint(arg['lo'], arg['hi']))
-                elif arg.get('log_uniform'):
-                    lo, hi = math.log(arg['lo']), math.log(arg['hi'])
-                    args.append(math.exp(rng.uniform(lo, hi)))
-                else:
-                    args.append(rng.uniform(arg['lo'], arg['hi']))
-            points.append((fn, args))
+            points.append((fn, [draw_arg(rng, arg) for arg in fn_spec['args']]))
     return points
 
 
 # ─── SWEEP ORCHESTRATION ───
 
-def compute_ranjs_values(points):
-    # Batches ALL points into a single node scripts/eval-special.js invocation (not one
-    # subprocess per point), mirroring precision-refs-special.py:374-380.
-    payload = json.dumps([{'fn': fn, 'args': args} for fn, args in points])
-    result = subprocess.run(['node', EVAL_SCRIPT], input=payload, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(result.stderr, flush=True)
-        raise RuntimeError('scripts/eval-special.js failed')
-    return json.loads(result.stdout)
-
-
-def decode(value):
-    # Undoes eval-special.js's Infinity/NaN string tagging (JSON has no such literals),
-    # mirroring precision-refs-special.py:383-391.
-    if value == 'Infinity':
-        return float('inf')
-    if value == '-Infinity':
-        return float('-inf')
-    if value == 'NaN':
-        return float('nan')
-    return value
-
-
-def sweep(spec, seed, n_override=None):
-    points = generate_points(spec, seed, n_override)
-    refs = [REF_FN[fn](*args) for fn, args in points]
-    ranjs_values = compute_ranjs_values(points)
-
-    results = {fn: {'ulps': [], 'errors': 0} for fn in spec}
-    for (fn, args), ref, got in zip(points, refs, ranjs_values):
+def _reference(point):
+    fn, args = point
+    with profiled(fn, args[:-1], 'ref', args[-1]):
+        return float(REF_FN[fn](*args))
+
+
+def _cache_key(point):
+    return json.dumps(point)
+
+
+def _scipy_tier(triage, points, ranjs_values):
+    """--triage's first tier: the positions of the points that need an mpmath reference."""
+    np = triage.np
+    fns = scipy_fns(np, triage.scipy)
+    by_fn = {}
+    for i, ((fn, _), got) in enumerate(zip(points, ranjs_values)):
+        if got is not NON_TERMINATION and 'error' not in got:
+            by_fn.setdefault(fn, []).append(i)
+    selected = set()
+    for fn, indices in by_fn.items():
+        args = np.array([points[i][1] for i in indices], dtype=np.float64).T
+        with np.errstate(all='ignore'):
+            expected = fns[fn](*args)
+        selected |= triage.compare(fn, indices, [decode(ranjs_values[i]['value']) for i in indices], expected)
+    return selected
+
+
+def sweep(spec, opts, n_override=None, baseline=None, triage=None):
+    """(results, archive). opts: difftest_engine.common_argv()'s flags. The references and the
+    eval-special.js call are independent of each other, so they run one after the other over the same
+    points -- a --baseline run's own points, if given. eval-special.js goes first so that under
+    --triage only the points its scipy tier escalates get a reference."""
+    points = baseline.draws if baseline else generate_points(spec, opts['seed'], n_override)
+    archive = open_archive(opts, points, baseline)
+    bridge = Bridge(EVAL_SCRIPT, chunk=opts['bridge_chunk'], timeout=opts['bridge_timeout'],
+                    timing=opts['timing'])
+    ranjs_values, _ = bridge.eval([{'fn': fn, 'args': args} for fn, args in points])
+    selected = _scipy_tier(triage, points, ranjs_values) if triage else None
+    refs, deferred = triaged_references(points, [(i, None) for i in range(len(points))], selected, _reference,
+                                        _cache_key, opts, archive)
+
+    results = {fn: {'stats': UlpStats(opts['worst_k']), 'errors': 0, 'deferred': [], 'non_termination': []} for fn in spec}
+    columns = open_columns(opts, {fn: {'args': [arg['name'] for arg in fn_spec['args']],
+                                       'ulp_ceiling': fn_spec['ulp_ceiling']} for fn, fn_spec in spec.items()},
+                           {'harness': 'difftest-special', 'seed': opts['seed']})
+    if opts['timing']:
+        for fn in spec:
+            results[fn]['timing'] = []
+    for i, seconds in deferred:
+        fn, args = points[i]
+        results[fn]['deferred'].append({'args': args, 'seconds': round(seconds, 3)})
+    for i, ((fn, args), ref, got) in enumerate(zip(points, refs, ranjs_values)):
+        if 'ns' in got:
+            # Timed whether or not the reference finished -- cost doesn't depend on mpmath.
+            results[fn]['timing'].append((got['ns'], {'args': args}, args))
+        # A point --triage never escalated has no reference and isn't deferred either.
+        escalated = ref is not NOT_ESCALATED
+        if not escalated:
+            ref, unreferenced = None, ('not_escalated',)
+        else:
+            unreferenced = ('deferred',) if ref is None else ()
+        if got is NON_TERMINATION:
+            results[fn]['non_termination'].append({'args': args})
+            columns.add(fn, args, ref, flags=unreferenced + ('non_termination',))
+            continue
         if 'error' in got:
+            # Counted whatever happened to the reference -- a ranjs failure doesn't depend on mpmath.
+            columns.add(fn, args, ref, flags=unreferenced + ('error',))
             results[fn]['errors'] += 1
             continue
         value = decode(got['value'])
-        ulp = ulp_diff(float(ref), value)
-        results[fn]['ulps'].append((ulp, args, float(ref), value))
-    return results
+        if ref is None:
+            columns.add(fn, args, None, value, flags=unreferenced)
+            continue
+        ulp = ulp_diff(ref, value)
+        results[fn]['stats'].add(ulp, {'args': args, 'mpmath_ref': ref, 'ranjs_value': value})
+        archive.add(fn, i, value, ref)
+        columns.add(fn, args, ref, value, ulp)
+        if triage:
+            triage.audited(fn, i, ulp)
+    columns.close()
+    archive.close()
+    if triage:
+        for fn in spec:
+            results[fn]['scipy_tier'] = triage.summary(fn)
+    return results, archive
 
 
 def build_report(sweep_results, spec, seed):
     functions = {}
     for fn, data in sweep_results.items():
-        entries = data['ulps']
-        n = len(entries)
-        ulps = [e[0] for e in entries]
-        # inf entries (NaN/divergence mismatches) would break median/p99 statistics --
-        # report them via a dedicated count instead of poisoning the finite-ULP summary.
-        finite = [u for u in ulps if u != float('inf')]
-        divergences = n - len(finite)
-        worst = max(entries, key=lambda e: e[0]) if entries else None
-        max_ulp = worst[0] if worst else None
-        median_ulp = statistics.median(finite) if finite else None
-        p99_ulp = statistics.quantiles(finite, n=100)[98] if len(finite) >= 2 else (finite[0] if finite else None)
-        ceiling = spec[fn]['ulp_ceiling']
-        functions[fn] = {
-            'n': n,
-            'errors': data['errors'],
-            'divergences': divergences,
-            'max_ulp': max_ulp,
-            'median_ulp': median_ulp,
-            'p99_ulp': p99_ulp,
-            'ulp_ceiling': ceiling,
-            'ceiling_exceeded': max_ulp is not None and max_ulp != float('inf') and max_ulp > ceiling,
-            # Read straight from SWEEP_SPEC (the same dict generate_points() draws from), so
-            # the reported domain can never drift from what was actually sampled -- #1266
-            # requires "the input domain actually swept ... must reflect what was measured".
-            'domain': spec[fn]['args'],
-            'worst_case': None if worst is None else {
-                'args': worst[1],
-                'mpmath_ref': worst[2],
-                'ranjs_value': worst[3],
-            },
+        skipped = {
+            # Points whose mpmath reference overran the watchdog budget and a bounded --retry-budget:
+            # excluded from n and every statistic, listed with the time spent on them.
+            'deferred': len(data['deferred']),
+            'deferred_points': data['deferred'],
+            # Points whose ranjs call never returned under --bridge-timeout.
+            'non_termination': len(data['non_termination']),
+            'non_termination_points': data['non_termination'],
         }
+        # domain is read straight from SWEEP_SPEC (the same dict generate_points() draws from), so
+        # the reported domain can never drift from what was actually sampled -- #1266 requires "the
+        # input domain actually swept ... must reflect what was measured".
+        functions[fn] = ulp_entry(data['stats'], data['errors'], skipped, spec[fn]['ulp_ceiling'],
+                                  spec[fn]['args'])
+        if 'scipy_tier' in data:
+            functions[fn]['scipy_tier'] = data['scipy_tier']
+        if 'timing' in data:
+            axes = [(arg['name'], timing_edges(arg)) for arg in spec[fn]['args']]
+            functions[fn]['timing'] = timing_summary(data['timing'], axes)
     return {
         'seed': seed,
         'mpmath_version': mpmath.__version__,
@@ -362,57 +365,45 @@ def build_report(sweep_results, spec, seed):
     }
 
 
-def _sanitize_for_json(value):
-    # json.dump has no Infinity/NaN literal by default (it emits the non-standard
-    # Infinity/NaN tokens unless allow_nan=False) -- tag them as strings instead so the
-    # report is valid, portable JSON a downstream consumer (e.g. #1266) can parse
-    # without a custom decoder, mirroring eval-special.js's own encode() convention.
-    if isinstance(value, float):
-        if value != value:
-            return 'NaN'
-        if value == float('inf'):
-            return 'Infinity'
-        if value == float('-inf'):
-            return '-Infinity'
-        return value
-    if isinstance(value, dict):
-        return {k: _sanitize_for_json(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_sanitize_for_json(v) for v in value]
-    return value
-
-
-def _parse_argv():
-    def flag_value(name, default, cast):
-        if name in sys.argv:
-            idx = sys.argv.index(name)
-            return cast(sys.argv[idx + 1])
-        return default
-
-    seed = flag_value('--seed', DEFAULT_SEED, int)
-    out = flag_value('--out', DEFAULT_OUT, str)
-    n_override = flag_value('--N', None, int)
-    return seed, out, n_override
-
-
 def main():
-    _self_check()
+    self_check()
     print('ulp_diff self-check passed')
 
-    seed, out_path, n_override = _parse_argv()
-    results = sweep(SWEEP_SPEC, seed, n_override)
-    report = build_report(results, SWEEP_SPEC, seed)
-
-    with open(out_path, 'w') as f:
-        json.dump(_sanitize_for_json(report), f, indent=2)
-
-    print(f'mpmath {report["mpmath_version"]}, seed {seed}')
+    opts = common_argv(DEFAULT_OUT, PROFILE_OUT)
+    n_override = flag_value('--N', None, int)
+    profiler = enable_profiling(globals()) if opts['profile_out'] else None
+    baseline = load_baseline(opts['baseline']) if opts['baseline'] else None
+    triage = Triage(opts) if opts['triage'] else None
+    results, archive = sweep(SWEEP_SPEC, opts, n_override, baseline, triage)
+    if profiler:
+        disable_profiling()
+        profiler.write(opts['profile_out'])
+    report = build_report(results, SWEEP_SPEC, opts['seed'])
+    if archive.path:
+        report['archive'] = archive.path
+    if baseline:
+        report['baseline_diff'] = baseline_diff(baseline, archive, opts['baseline'])
+    if triage:
+        report['triage'] = triage.report()
+    write_report(opts['out'], report)
+
+    print(f'mpmath {report["mpmath_version"]}, seed {opts["seed"]}')
     for fn, data in report['functions'].items():
         flag = ' CEILING EXCEEDED' if data['ceiling_exceeded'] else ''
-        print(f'  {fn}: n={data["n"]} errors={data["errors"]} divergences={data["divergences"]} '
-              f'max={data["max_ulp"]} median={data["median_ulp"]} p99={data["p99_ulp"]} '
-              f'ceiling={data["ulp_ceiling"]}{flag}')
-    print(f'Wrote {out_path}')
+        print(f'  {fn}: n={data["n"]} errors={data["errors"]} deferred={data["deferred"]} '
+              f'divergences={data["divergences"]} max={data["max_ulp"]} median={data["median_ulp"]} '
+              f'p99={data["p99_ulp"]} ceiling={data["ulp_ceiling"]}{flag}')
+        if data.get('scipy_tier'):
+            print(triage_line(data['scipy_tier']))
+        if data.get('timing'):
+            print(timing_line(data['timing']))
+    if baseline:
+        diff = report['baseline_diff']
+        print(f'against {opts["baseline"]}: {diff["references_reused"]} references reused, '
+              f'{diff["references_evaluated"]} evaluated')
+        for fn, d in diff['entries'].items():
+            print(diff_line(fn, d))
+    print(f'Wrote {opts["out"]}')
 
 
 if __name__ == '__main__':
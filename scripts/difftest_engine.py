@@ -0,0 +1,982 @@
+"""
+Shared sweep engine for the differential-testing harnesses (difftest-special.py, difftest-dist.py,
+difftest-quantile.py).
+
+The three harnesses used to carry their own verbatim copies of everything here -- the ULP metric and
+its self-check, the Infinity/NaN tagging on both sides of the JSON bridge, the reference watchdog,
+--profile and --timing -- and each ran its mpmath references single-threaded. They now import this
+module instead (scripts/ is on sys.path when a harness runs, and this file's name is a valid module
+identifier, unlike theirs). That makes it a deliberate exception to the scripts' otherwise strict
+no-cross-import convention, alongside bench-refs.py, ref_profile.py and ref_watchdog.py. A harness
+supplies its sweep spec, its reference formulas and the bridge it drives; this supplies the
+machinery, so a new performance feature lands once for all three:
+
+  - Bridge: chunked calls into a node eval bridge under a per-call timeout, bisecting out any point
+    that never returns instead of wedging the whole sweep -- or, for a bridge with a serve mode, one
+    long-lived node process under a per-point timeout.
+  - evaluate_references(): every mpmath reference under the per-point watchdog, with its deferred
+    retry queue, on --jobs worker processes, through an optional on-disk RefCache.
+  - UlpStats: running per-function/method ULP statistics that keep one float per point rather than
+    the whole (point, reference, value) tuple, plus a bounded heap of the --worst-k worst points.
+  - PointArchive/baseline_diff(): the optional --archive of a run's points, streamed next to its
+    report, and the --baseline mode that replays an archived run's points against the current ranjs.
+  - ColumnArchive: the optional --column-archive, every draw as memory-mappable .npy columns.
+  - Triage/triaged_references(): the optional --triage scipy tier, which sends only the points where
+    ranjs and scipy disagree (plus an audit sample) to mpmath.
+  - draw_arg() for seeded spec draws, ulp_entry() for the per-function/method report entry, and
+    ulp_diff()/self_check(), decode()/sanitize_for_json() and the timing summaries.
+
+--profile's instrumentation lives in ref_profile.py, which the harnesses import directly, and the
+watchdog and deferred retry queue in ref_watchdog.py; the reference generators import both too.
+
+The report shapes are unchanged from the standalone harnesses (difftest-ci-gate.js and
+generate-accuracy-docs.js read them), plus non_termination/deferred counts where a harness lacked them.
+"""
+import array
+import bisect
+import gzip
+import heapq
+import json
+import math
+import os
+import select
+import statistics
+import struct
+import subprocess
+import sys
+import time
+
+import mpmath
+from mpmath import mp
+
+from ref_watchdog import evaluate_deferred, watched
+
+# ─── ULP METRIC ───
+
+def ulp_diff(a, b):
+    """Float64 ULP distance between a and b.
+
+    NaN vs NaN is treated as trivially equal (0) rather than propagating IEEE's
+    NaN != NaN, since two NaN reference/ranjs values agreeing that a point diverges
+    is not itself a reportable error; exactly one side being NaN is a real
+    divergence, reported as +inf rather than an arbitrary large integer so it always
+    dominates a function's max ULP and cannot be quietly out-ranked by a merely large
+    finite count.
+    """
+    a = float(a)
+    b = float(b)
+    a_nan = a != a
+    b_nan = b != b
+    if a_nan and b_nan:
+        return 0
+    if a_nan or b_nan:
+        return float('inf')
+    if a == b:
+        # Covers +0.0 == -0.0, whose bit patterns otherwise differ.
+        return 0
+    a_inf = math.isinf(a)
+    b_inf = math.isinf(b)
+    if a_inf or b_inf:
+        # a == b above already caught same-signed infinities.
+        return float('inf')
+    return abs(monotonic_bits(a) - monotonic_bits(b))
+
+
+def monotonic_bits(x):
+    # IEEE 754 float64 is sign-magnitude, not two's complement: the raw unsigned
+    # bit pattern is NOT monotonically ordered across the zero crossing (e.g. -1.0's
+    # bits are numerically larger than 1.0's). Remapping negative values via
+    # 2**63 - bits mirrors the negative range back around 2**63 (rather than folding
+    # it into the top of the unsigned range via 2**64 - bits, which would collide two
+    # equal-magnitude opposite-sign values onto the same monotonic value and make
+    # ulp_diff silently return 0 for a sign mismatch) -- the standard trick for
+    # computing ULP distance as a simple integer subtraction. Subnormals need no
+    # special case -- IEEE 754 defines their bit pattern to continue the same
+    # ordering right through zero. See
+    # solutions/testing/2026-08-09-1444-ulp-diff-sign-remap-same-sign-blind-self-check.md
+    bits, = struct.unpack('>Q', struct.pack('>d', x))
+    return bits if bits < 2**63 else 2**63 - bits
+
+
+def self_check():
+    """Inline self-validation of ulp_diff, run unconditionally before every sweep --
+    a broken ULP metric must never silently produce a bogus report."""
+    one_up = math.nextafter(1.0, 2.0)
+    assert ulp_diff(1.0, one_up) == 1, 'adjacent normals should be 1 ULP apart'
+    assert ulp_diff(1.0, 1.0) == 0, 'identical values should be 0 ULP apart'
+    assert ulp_diff(0.0, -0.0) == 0, 'signed zeros should be 0 ULP apart'
+    assert 0 < ulp_diff(-1e-300, 1e-300) < float('inf'), \
+        'zero-crossing pair should be a large but finite ULP distance'
+    assert ulp_diff(5e-324, 1e-323) == 1, 'adjacent subnormals should be 1 ULP apart'
+    assert ulp_diff(-5e-324, 5e-324) == 2, \
+        'adjacent subnormals straddling zero should be 2 ULP apart'
+    dbl_max = 1.7976931348623157e+308
+    assert ulp_diff(dbl_max, math.nextafter(dbl_max, 0)) == 1, \
+        'adjacent normals near DBL_MAX should be 1 ULP apart'
+    assert ulp_diff(float('inf'), float('inf')) == 0, 'equal infinities should be 0 ULP apart'
+    assert ulp_diff(float('inf'), float('-inf')) == float('inf'), \
+        'opposite-signed infinities should diverge'
+    assert ulp_diff(1.0, float('inf')) == float('inf'), \
+        'finite vs infinite should diverge'
+    assert ulp_diff(float('nan'), float('nan')) == 0, 'NaN vs NaN should be treated as equal'
+    assert ulp_diff(float('nan'), 1.0) == float('inf'), \
+        'NaN vs finite should diverge'
+    assert ulp_diff(-1.0, -1.0) == 0, 'identical negative values should be 0 ULP apart'
+    neg_one_down = math.nextafter(-1.0, -2.0)
+    assert ulp_diff(-1.0, neg_one_down) == 1, \
+        'adjacent negative normals should be 1 ULP apart'
+    # Same-magnitude, opposite-sign pair: same-sign adjacency (above) can't catch a
+    # wrong sign-remapping constant in monotonic_bits, since a wrong-but-consistent
+    # constant cancels out in the subtraction for two values on the same side of zero.
+    # This is the case that actually exercises it -- it must be a large, easily
+    # distinguishable distance, never 0.
+    assert ulp_diff(2.0, -2.0) > 2**62, \
+        'same-magnitude opposite-sign values must not collide to a small ULP distance'
+
+
+# Default --worst-k: how many of each function/method's worst points a report lists.
+WORST_K = 50
+
+
+class WorstCases:
+    """The k highest-scoring cases seen, in O(log k) per add and O(k) memory: a min-heap keyed on
+    (score, -arrival), so the least bad case is the one evicted and, among equal scores, the earlier
+    case ranks higher -- the same case max() would have picked as the single worst."""
+
+    def __init__(self, k=WORST_K):
+        self.k = k
+        self.heap = []
+        self.seen = 0
+
+    def add(self, score, case):
+        # case: the report's dict for this point; dropped at once unless it makes the top k.
+        self.seen += 1
+        item = (score, -self.seen, case)
+        if self.k <= 0:
+            return
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, item)
+        elif item[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, item)
+
+    def ranked(self):
+        """[(score, case)], worst first."""
+        return [(score, case) for score, _, case in sorted(self.heap, key=lambda item: item[:2], reverse=True)]
+
+
+class UlpStats:
+    """Running ULP statistics for one function/method. Keeps one float per finite ULP (for the
+    median and p99) and only the worst_k worst cases, so memory doesn't grow with the point tuples.
+    inf ULPs (NaN/Infinity mismatches) would poison median/p99 and are counted as divergences."""
+
+    def __init__(self, worst_k=WORST_K):
+        self.n = 0
+        self.finite = []
+        self.worst = WorstCases(worst_k)
+
+    def add(self, ulp, case):
+        self.n += 1
+        if ulp != float('inf'):
+            self.finite.append(ulp)
+        self.worst.add(ulp, case)
+
+    def summary(self):
+        finite = self.finite
+        ranked = self.worst.ranked()
+        return {
+            'n': self.n,
+            'divergences': self.n - len(finite),
+            'max_ulp': ranked[0][0] if ranked else None,
+            'median_ulp': statistics.median(finite) if finite else None,
+            'p99_ulp': (statistics.quantiles(finite, n=100)[98] if len(finite) >= 2
+                        else (finite[0] if finite else None)),
+            'worst_case': ranked[0][1] if ranked else None,
+            'worst_cases': [dict(case, ulp=ulp) for ulp, case in ranked],
+        }
+
+
+def ulp_entry(stats, errors, skipped, ceiling, domain):
+    """One function/method's report entry. skipped: the counts and point lists of what never reached
+    the statistics (deferred references, non-terminating bridge calls), in report order."""
+    s = stats.summary()
+    max_ulp = s['max_ulp']
+    return {
+        'n': s['n'],
+        'errors': errors,
+        **skipped,
+        'divergences': s['divergences'],
+        'max_ulp': max_ulp,
+        'median_ulp': s['median_ulp'],
+        'p99_ulp': s['p99_ulp'],
+        'ulp_ceiling': ceiling,
+        # inf is a divergence, reported on its own -- never a ceiling breach.
+        'ceiling_exceeded': ceiling is not None and max_ulp not in (None, float('inf')) and max_ulp > ceiling,
+        'domain': domain,
+        'worst_case': s['worst_case'],
+        # The stats' worst_k worst points, worst first -- the whole cluster around worst_case.
+        'worst_cases': s['worst_cases'],
+    }
+
+
+# ─── POINT GENERATION ───
+
+def draw_arg(rng, arg):
+    """One seeded draw from a spec argument: {'lo', 'hi'} plus 'kind': 'int' for a uniform integer,
+    or 'log_uniform' for a draw uniform in log space -- the only two shapes any sweep spec uses."""
+    if arg.get('kind') == 'int':
+        return rng.randint(arg['lo'], arg['hi'])
+    if arg.get('log_uniform'):
+        lo, hi = math.log(arg['lo']), math.log(arg['hi'])
+        return math.exp(rng.uniform(lo, hi))
+    return rng.uniform(arg['lo'], arg['hi'])
+
+
+# ─── JSON ───
+
+def decode(value):
+    # Undoes the bridges' Infinity/NaN string tagging (JSON has no such literals).
+    return {'Infinity': float('inf'), '-Infinity': float('-inf'), 'NaN': float('nan')}.get(value, value)
+
+
+def sanitize_for_json(value):
+    # json.dump has no Infinity/NaN literal by default (it emits the non-standard
+    # Infinity/NaN tokens unless allow_nan=False) -- tag them as strings instead so the
+    # report is valid, portable JSON a downstream consumer (e.g. #1266) can parse
+    # without a custom decoder, mirroring the bridges' own encode() convention.
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        return {float('inf'): 'Infinity', float('-inf'): '-Infinity'}.get(value, value)
+    if isinstance(value, dict):
+        return {k: sanitize_for_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [sanitize_for_json(v) for v in value]
+    return value
+
+
+def write_report(path, report):
+    with open(path, 'w') as f:
+        json.dump(sanitize_for_json(report), f, indent=2)
+
+
+# ─── BRIDGE ───
+
+NON_TERMINATION = {'non_termination': True}
+
+
+class Bridge:
+    """A node eval bridge (scripts/eval-*.js), fed JSON points on stdin. eval() sends them in calls
+    of `chunk` points (None: all in one call) under a per-call `timeout` in seconds (None: none).
+    A call that times out is halved and each half re-run, recursively, until the point that hangs
+    is alone in its own call; it then gets NON_TERMINATION in place of a result and the sweep carries
+    on. One hang in a chunk of c points costs ~2*log2(c) extra timeouts, so the timeout is per call,
+    not per point. --timing is passed through to the bridge.
+
+    A bridge with a line-per-point mode names its argv as `serve`; with no `chunk`, eval() then
+    streams every point through one long-lived node process instead, and `timeout` is per point. A
+    point that overruns it is NON_TERMINATION at once, and only the process it hung is replaced --
+    the sweep pays one node startup per hang rather than one per chunk."""
+
+    def __init__(self, script, args=(), chunk=None, timeout=None, timing=False, serve=None):
+        self.script = script
+        self.args = list(args) + (['--timing'] if timing else [])
+        self.chunk = chunk
+        self.timeout = timeout
+        self.serve = None if serve is None else list(serve) + (['--timing'] if timing else [])
+
+    def run(self, args=None, payload=None, timeout=None):
+        # subprocess.run kills the child before re-raising TimeoutExpired, so a hung node never
+        # outlives the call that started it.
+        args = self.args if args is None else args
+        result = subprocess.run(['node', self.script] + args, input=payload, capture_output=True, text=True,
+                                timeout=timeout)
+        if result.returncode != 0:
+            print(result.stderr, flush=True)
+            raise RuntimeError(f'{self.script} {" ".join(args)} failed')
+        return json.loads(result.stdout)
+
+    def eval(self, points):
+        """One result per point, in order; returns (results, hung points)."""
+        if self.serve is not None and not self.chunk:
+            return self._served(points)
+        results, hung = [], []
+        chunk = self.chunk or max(len(points), 1)
+        for start in range(0, len(points), chunk):
+            results.extend(self._isolating(points[start:start + chunk], hung))
+        return results, hung
+
+    def _isolating(self, points, hung):
+        try:
+            return self.run(payload=json.dumps(points), timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            if len(points) == 1:
+                print(f'bridge: {self.script} did not return within {self.timeout}s for '
+                      f'{json.dumps(points[0])} -- recorded as non_termination', flush=True)
+                hung.append(points[0])
+                return [NON_TERMINATION]
+            mid = len(points) // 2
+            return self._isolating(points[:mid], hung) + self._isolating(points[mid:], hung)
+
+    def _served(self, points):
+        results, hung = [], []
+        node = None
+        try:
+            for point in points:
+                if node is None:
+                    node = _ServedNode(self.script, self.serve)
+                try:
+                    results.append(node.ask(point, self.timeout))
+                except subprocess.TimeoutExpired:
+                    node.kill()
+                    node = None
+                    print(f'bridge: {self.script} did not return within {self.timeout}s for '
+                          f'{json.dumps(point)} -- recorded as non_termination', flush=True)
+                    hung.append(point)
+                    results.append(NON_TERMINATION)
+        finally:
+            if node is not None:
+                node.close()
+        return results, hung
+
+
+class _ServedNode:
+    # One `node script *args` in its line-per-point mode: a JSON point per stdin line in, a JSON
+    # result per stdout line out, after a first line announcing that its requires have loaded --
+    # so a point's timeout never includes node and babel starting up. stderr is inherited.
+
+    def __init__(self, script, args):
+        self.script = script
+        self.proc = subprocess.Popen(['node', script] + args, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.pending = b''
+        self._line(None)
+
+    def ask(self, point, timeout):
+        try:
+            self.proc.stdin.write(json.dumps(point).encode() + b'\n')
+            self.proc.stdin.flush()
+        except BrokenPipeError:
+            raise RuntimeError(f'{self.script} exited with status {self.proc.wait()}') from None
+        return self._line(timeout)
+
+    def _line(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b'\n' not in self.pending:
+            wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not select.select([self.proc.stdout], [], [], wait)[0]:
+                raise subprocess.TimeoutExpired(self.proc.args, timeout)
+            data = os.read(self.proc.stdout.fileno(), 1 << 16)
+            if not data:
+                raise RuntimeError(f'{self.script} exited with status {self.proc.wait()}')
+            self.pending += data
+        line, self.pending = self.pending.split(b'\n', 1)
+        return json.loads(line)
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.wait()
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+# ─── REFERENCE WATCHDOG ───
+
+# Per-point wall-clock budget for one mpmath reference evaluation, so one pathological point
+# (besselk at large order/argument, an nsum that will not settle) cannot stall the whole sweep.
+# Shorter than ref_watchdog.DEFAULT_POINT_BUDGET: these points are drawn at random, not curated.
+DEFAULT_POINT_BUDGET = 60.0
+
+
+def evaluate_references(items, evaluate, budget, retry_budget=None, jobs=1, cache=None, key=None):
+    """(values, deferred): evaluate(item) per item, each under a `budget`-second watchdog, on `jobs`
+    worker processes -- ref_watchdog.evaluate_deferred() with one watchdog over each whole call.
+    Items that overrun go to a deferred queue, retried once after every other item has finished
+    with `retry_budget` -- None, the default, retries without one, so every point still reaches the
+    statistics and only stops holding up the rest. deferred lists (index, seconds spent) for those
+    a bounded retry left unresolved, whose values are None. With a RefCache, items whose key(item)
+    it already holds are not evaluated at all, and every newly resolved value is added to it."""
+    values = [None] * len(items)
+    todo = []
+    for i, item in enumerate(items):
+        if cache is not None and key(item) in cache:
+            values[i] = cache[key(item)]
+        else:
+            todo.append(i)
+    computed, unresolved = evaluate_deferred(watched(evaluate), [items[i] for i in todo], budget,
+                                             retry_budget, jobs,
+                                             chunksize=max(1, len(todo) // (max(jobs, 1) * 16)),
+                                             quiet=True)
+    for i, value in zip(todo, computed):
+        values[i] = value
+        if cache is not None and value is not None:
+            cache[key(items[i])] = value
+    return values, [(todo[j], spent) for j, spent in unresolved]
+
+
+class RefCache(dict):
+    """mpmath references by point key, persisted as JSON at `path` between runs -- the same seed draws
+    the same points, so a re-run only evaluates what it hasn't seen. Discarded wholesale when the
+    mpmath version or mp.dps it was computed under differs from the current one."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.stamp = {'mpmath_version': mpmath.__version__, 'mp_dps': mp.dps}
+        if os.path.exists(path):
+            with open(path) as fh:
+                stored = json.load(fh)
+            if stored.get('stamp') == self.stamp:
+                self.update({k: _decode_tree(v) for k, v in stored['refs'].items()})
+
+    def save(self):
+        with open(self.path, 'w') as fh:
+            json.dump({'stamp': self.stamp, 'refs': sanitize_for_json(dict(self))}, fh)
+
+
+def _decode_tree(value):
+    if isinstance(value, dict):
+        return {k: _decode_tree(v) for k, v in value.items()}
+    return decode(value)
+
+
+# ─── POINT ARCHIVE AND BASELINE DIFF ───
+
+# --archive writes a run's draws, the references it resolved and the points it compared next to its
+# report (archive_path()), so a later run can take that report as --baseline: replay the same draws,
+# re-run ranjs on all of them, reuse every stored mpmath reference whose input is bit-identical, and
+# report which points got better or worse. The archive is gzipped JSON lines streamed out as the
+# sweep goes -- a header, one line per draw, then one per reference and per compared point, each
+# naming its draw by index -- so a run holds none of it in memory and writes each draw's args once.
+# A reference is stored with the ranjs output it was taken at, if any: dist's pdf/cdf and quantile's
+# pilot inversions are re-taken only where ranjs's x moved; special's depend on the draw alone and
+# are always reused.
+ARCHIVE_FORMAT = 2
+DIFF_TOP_N = 20
+
+
+def archive_path(report_path):
+    root = report_path[:-len('.json')] if report_path.endswith('.json') else report_path
+    return os.path.abspath(root + '.points.json.gz')
+
+
+def _stamp():
+    return {'mpmath_version': mpmath.__version__, 'mp_dps': mp.dps}
+
+
+def _ref_slot(index, at):
+    # A reference's identity across two runs over the same draws: its draw, and the ranjs output it
+    # was taken at by JSON form (a float's repr round-trips bit-exactly).
+    return index, json.dumps(sanitize_for_json(at))
+
+
+class PointArchive:
+    """One run's draws, its resolved references and its compared points, streamed to path (nothing is
+    written when path is None) and, against a --baseline, diffed point by point as they arrive.
+    reused/evaluated count the references sweep_references() found stored versus computed."""
+
+    def __init__(self, path, draws, baseline=None):
+        self.path = path
+        self.draws = draws
+        self.baseline = baseline
+        self.reused = self.evaluated = 0
+        self.fh = None
+        if path:
+            self.fh = gzip.open(path, 'wt')
+            self._write({'format': ARCHIVE_FORMAT, 'stamp': _stamp(), 'draws': len(draws)})
+            for draw in draws:
+                self._write(['d', draw])
+
+    def _write(self, record):
+        if self.fh is not None:
+            self.fh.write(json.dumps(sanitize_for_json(record), separators=(',', ':')) + '\n')
+
+    def ref(self, index, at, value):
+        """draws[index]'s reference, taken at ranjs's output at (None: it depends on the draw alone)."""
+        self._write(['r', index, at, value])
+
+    def add(self, key, index, value, ref):
+        """One compared point of entry key: draws[index], ranjs's value there and its reference."""
+        self._write(['p', key, index, value, ref])
+        if self.baseline is not None:
+            self.baseline.compare(key, index, value, ref)
+
+    def close(self):
+        if self.fh is not None:
+            self.fh.close()
+
+
+def open_archive(opts, draws, baseline=None):
+    """The run's PointArchive: written next to opts['out'] under --archive, otherwise only diffed."""
+    return PointArchive(archive_path(opts['out']) if opts['archive'] else None, draws, baseline)
+
+
+class _EntryDiff:
+    """One entry's running comparison against the baseline, with the top_n largest moves each way."""
+
+    def __init__(self, top_n):
+        self.current = self.compared = self.changed = 0
+        self.max_before = self.max_after = None
+        self.improved, self.regressed = WorstCases(top_n), WorstCases(top_n)
+
+    def add(self, index, old_value, old_ref, value, ref):
+        before, after = ulp_diff(old_ref, old_value), ulp_diff(ref, value)
+        self.compared += 1
+        self.changed += not _same_bits(old_value, value)
+        self.max_before = before if self.max_before is None else max(self.max_before, before)
+        self.max_after = after if self.max_after is None else max(self.max_after, after)
+        move = (index, before, after, old_value, value, ref)
+        if after < before:
+            self.improved.add(before - after, move)
+        elif after > before:
+            self.regressed.add(after - before, move)
+
+
+class Baseline:
+    """A previous run's archive, read back by load_baseline(): its draws, its references by _ref_slot()
+    and each entry's compared points by draw index -- and the per-entry diff that the current run's
+    PointArchive.add() accumulates against it."""
+
+    def __init__(self, path, top_n=DIFF_TOP_N):
+        self.draws, self.refs, self.rows = [], {}, {}
+        with gzip.open(path, 'rt') as fh:
+            header = json.loads(fh.readline())
+            if header.get('format') != ARCHIVE_FORMAT:
+                raise ValueError(f'{path}: not a format-{ARCHIVE_FORMAT} point archive')
+            self.stamp = header['stamp']
+            for line in fh:
+                record = json.loads(line)
+                if record[0] == 'd':
+                    self.draws.append(record[1])
+                elif record[0] == 'r':
+                    self.refs[_ref_slot(record[1], record[2])] = _decode_tree(record[3])
+                else:
+                    _, key, index, value, ref = record
+                    self.rows.setdefault(key, {})[index] = (decode(value), decode(ref))
+        self.top_n = top_n
+        self.diffs = {}
+
+    def compare(self, key, index, value, ref):
+        diff = self.diffs.get(key)
+        if diff is None:
+            diff = self.diffs[key] = _EntryDiff(self.top_n)
+        diff.current += 1
+        old = self.rows.get(key, {}).get(index)
+        if old is not None:
+            diff.add(index, *old, value, ref)
+
+
+def load_baseline(report_path):
+    """The Baseline of a previous --archive run, found through its report. Its references are dropped
+    (and every point re-evaluated) when they were computed under a different mpmath version or mp.dps."""
+    with open(report_path) as fh:
+        report = json.load(fh)
+    path = report.get('archive') or archive_path(report_path)
+    if not os.path.exists(path):
+        sys.exit(f'--baseline: {report_path} has no point archive -- re-run it with --archive')
+    baseline = Baseline(path)
+    if baseline.stamp != _stamp():
+        print(f'baseline: references computed under {baseline.stamp}, not {_stamp()} -- re-evaluating all',
+              flush=True)
+        baseline.refs = {}
+    return baseline
+
+
+def sweep_references(items, origins, evaluate, key, opts, archive):
+    """evaluate_references() under the --point-budget/--retry-budget/--jobs flags, reusing whatever the
+    --ref-cache file and the --baseline run (archive.baseline) already hold for each item, and recording
+    every resolved reference in archive. origins: each item's (draw index, ranjs output it is taken at,
+    or None), as PointArchive.ref() takes them."""
+    cache = RefCache(opts['ref_cache']) if opts['ref_cache'] else None
+    baseline = archive.baseline
+    if baseline is not None and baseline.refs:
+        cache = {} if cache is None else cache
+        stored = ((item, baseline.refs.get(_ref_slot(*origin))) for item, origin in zip(items, origins))
+        cache.update((key(item), value) for item, value in stored if value is not None)
+    reused = 0 if cache is None else sum(1 for item in items if key(item) in cache)
+    values, deferred = evaluate_references(items, evaluate, opts['budget'], opts['retry_budget'], opts['jobs'],
+                                           cache, key)
+    if isinstance(cache, RefCache):
+        cache.save()
+    for (index, at), value in zip(origins, values):
+        if value is not None:
+            archive.ref(index, at, value)
+    archive.reused += reused
+    archive.evaluated += len(items) - reused
+    return values, deferred
+
+
+def _same_bits(a, b):
+    return struct.pack('>d', a) == struct.pack('>d', b)
+
+
+def baseline_diff(baseline, current, baseline_path):
+    """Per-entry comparison of current against baseline over the points both compared: how many
+    ranjs values changed bit-for-bit, how many points moved to a lower or higher ULP error, the max
+    ULP before and after, and the DIFF_TOP_N points that improved and regressed the most."""
+    def points(cases):
+        return [{'point': baseline.draws[index], 'ulp_before': before, 'ulp_after': after,
+                 'ranjs_before': old_value, 'ranjs_after': value, 'mpmath_ref': ref}
+                for _, (index, before, after, old_value, value, ref) in cases.ranked()]
+
+    entries = {}
+    for key, diff in baseline.diffs.items():
+        entries[key] = {
+            'compared': diff.compared,
+            # Points only one of the two runs compared (deferred, errored or hung in the other).
+            'unmatched': len(baseline.rows.get(key, {})) + diff.current - 2 * diff.compared,
+            'ranjs_changed': diff.changed,
+            'improved': diff.improved.seen,
+            'regressed': diff.regressed.seen,
+            'max_ulp_before': diff.max_before,
+            'max_ulp_after': diff.max_after,
+            'improved_points': points(diff.improved),
+            'regressed_points': points(diff.regressed),
+        }
+    return {
+        'baseline': baseline_path,
+        'references_reused': current.reused,
+        'references_evaluated': current.evaluated,
+        'entries': entries,
+    }
+
+
+def diff_line(key, d):
+    return (f'  {key}: {d["ranjs_changed"]}/{d["compared"]} ranjs values changed, {d["improved"]} improved, '
+            f'{d["regressed"]} regressed, max {d["max_ulp_before"]} -> {d["max_ulp_after"]}')
+
+
+# ─── COLUMNAR ARCHIVE ───
+
+# --column-archive DIR writes every draw of a run -- compared or not -- as one .npy file per column,
+# streamed to disk as the sweep goes, for analysis that should never need mpmath or node again:
+# numpy.load(path, mmap_mode='r') maps each column with zero copy. The .npy format is a fixed header
+# plus raw little-endian data, written here with the standard library (numpy is not required to
+# produce it, only to read it). Columns, one row per (entry, draw):
+#   entry.npy  <i4      index into index.json's entries
+#   args.npy   <f8 2-D  the entry's arguments (index.json's args names), NaN-padded to a fixed width
+#   ref.npy, ranjs.npy, ulp.npy  <f8  NaN where there is none; ulp is inf for a divergence and, being
+#              float64, exact only up to 2**53
+#   flags.npy  |u1      COLUMN_FLAGS bits (not_escalated: --triage's scipy tier agreed, so no reference)
+COLUMN_FLAGS = {'deferred': 1, 'error': 2, 'non_termination': 4, 'divergence': 8, 'ceiling_exceeded': 16,
+                'not_escalated': 32}
+_NPY_HEADER_BYTES = 128  # reserved up front, so the header can be rewritten with the final shape
+_COLUMN_FLUSH = 1 << 16
+
+
+class NpyColumn:
+    """One .npy file, appended to in buffered chunks and given its final shape on close()."""
+
+    def __init__(self, path, descr, typecode, width=None):
+        self.fh = open(path, 'wb')
+        self.descr, self.typecode, self.width = descr, typecode, width
+        self.buffer = array.array(typecode)
+        self.rows = 0
+        self.fh.write(self._header())
+
+    def _header(self):
+        shape = (self.rows,) if self.width is None else (self.rows, self.width)
+        text = f"{{'descr': '{self.descr}', 'fortran_order': False, 'shape': {shape}, }}"
+        text = text.ljust(_NPY_HEADER_BYTES - 10 - 1) + '\n'
+        return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(text)) + text.encode('latin1')
+
+    def append(self, values):
+        self.buffer.extend(values)
+        self.rows += 1
+        if len(self.buffer) >= _COLUMN_FLUSH:
+            self._flush()
+
+    def _flush(self):
+        if sys.byteorder != 'little' and self.buffer.itemsize > 1:
+            self.buffer.byteswap()
+        self.buffer.tofile(self.fh)
+        self.buffer = array.array(self.typecode)
+
+    def close(self):
+        self._flush()
+        self.fh.seek(0)
+        self.fh.write(self._header())
+        self.fh.close()
+
+
+class ColumnArchive:
+    """The --column-archive writer. entries: {entry key: {'args': [names], 'ulp_ceiling': c or None}},
+    in report order; meta goes into index.json as is."""
+
+    def __init__(self, directory, entries, meta):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.entries = entries
+        self.ids = {key: i for i, key in enumerate(entries)}
+        self.width = max(len(entry['args']) for entry in entries.values())
+        self.meta = meta
+        self.columns = {
+            'entry': NpyColumn(os.path.join(directory, 'entry.npy'), '<i4', 'i'),
+            'args': NpyColumn(os.path.join(directory, 'args.npy'), '<f8', 'd', self.width),
+            'ref': NpyColumn(os.path.join(directory, 'ref.npy'), '<f8', 'd'),
+            'ranjs': NpyColumn(os.path.join(directory, 'ranjs.npy'), '<f8', 'd'),
+            'ulp': NpyColumn(os.path.join(directory, 'ulp.npy'), '<f8', 'd'),
+            'flags': NpyColumn(os.path.join(directory, 'flags.npy'), '|u1', 'B'),
+        }
+
+    def add(self, key, args, ref=None, value=None, ulp=None, flags=()):
+        """One row; flags: COLUMN_FLAGS names. divergence and ceiling_exceeded follow from ulp."""
+        nan = float('nan')
+        bits = sum(COLUMN_FLAGS[f] for f in flags)
+        if ulp is not None:
+            ceiling = self.entries[key].get('ulp_ceiling')
+            if ulp == float('inf'):
+                bits |= COLUMN_FLAGS['divergence']
+            elif ceiling is not None and ulp > ceiling:
+                bits |= COLUMN_FLAGS['ceiling_exceeded']
+        c = self.columns
+        c['entry'].append((self.ids[key],))
+        c['args'].append([float(a) for a in args] + [nan] * (self.width - len(args)))
+        c['ref'].append((nan if ref is None else float(ref),))
+        c['ranjs'].append((nan if value is None else float(value),))
+        c['ulp'].append((nan if ulp is None else float(ulp),))
+        c['flags'].append((bits,))
+
+    def close(self):
+        for column in self.columns.values():
+            column.close()
+        with open(os.path.join(self.directory, 'index.json'), 'w') as fh:
+            json.dump(sanitize_for_json(dict(self.meta, rows=self.columns['entry'].rows, entries=list(self.entries),
+                                             args={k: e['args'] for k, e in self.entries.items()},
+                                             flags=COLUMN_FLAGS, columns=list(self.columns))), fh, indent=1)
+
+
+class _NoColumns:
+    def add(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_columns(opts, entries, meta):
+    """A ColumnArchive under --column-archive, otherwise a writer that drops every row."""
+    return ColumnArchive(opts['column_archive'], entries, meta) if opts['column_archive'] else _NoColumns()
+
+
+# ─── SCIPY TRIAGE ───
+
+# --triage puts a vectorized scipy tier in front of mpmath. Every point ranjs returned a value for is
+# first compared against scipy's float64 implementation, one array call per function/method, and
+# only the points where the two disagree by more than --triage-ulp ULP get an mpmath reference --
+# plus a seeded --triage-audit fraction of the ones where they agree, which measures how far that
+# agreement can be trusted (an audited point over the threshold is one where scipy shares ranjs's
+# error). numpy and scipy are imported only under --triage; a plain run never needs them.
+TRIAGE_ULP = 16
+TRIAGE_AUDIT = 0.01
+NOT_ESCALATED = object()  # triaged_references()'s value for a point scipy agreed on and no audit drew
+
+
+def load_scipy():
+    """(numpy, scipy), with scipy.special and scipy.stats imported; exits with an install hint if not."""
+    try:
+        import numpy
+        import scipy.special
+        import scipy.stats
+    except ImportError as e:
+        sys.exit(f'--triage needs numpy and scipy ({e}): pip install numpy scipy')
+    return numpy, scipy
+
+
+def ulp_diff_array(np, a, b):
+    """ulp_diff() over two float64 arrays, elementwise, as float64 (so exact only up to 2**53)."""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+
+    def monotonic(v):  # monotonic_bits(), with the negative half mirrored below zero in int64
+        bits = v.view(np.int64)
+        return np.where(bits < 0, -(bits & np.int64(2**63 - 1)), bits)
+    ma, mb = monotonic(a), monotonic(b)
+    # Two's-complement uint64 subtraction of the larger minus the smaller is exact below 2**64.
+    ulp = (np.maximum(ma, mb).view(np.uint64) - np.minimum(ma, mb).view(np.uint64)).astype(np.float64)
+    a_nan, b_nan = np.isnan(a), np.isnan(b)
+    ulp[(a == b) | (a_nan & b_nan)] = 0
+    ulp[(a_nan ^ b_nan) | ((np.isinf(a) | np.isinf(b)) & (a != b) & ~a_nan & ~b_nan)] = np.inf
+    return ulp
+
+
+class Triage:
+    """--triage's first tier for one run. compare() takes one function/method's points at a time and
+    returns the ones to escalate; summary() is that entry's scipy-tier report."""
+
+    def __init__(self, opts):
+        self.np, self.scipy = load_scipy()
+        np = self.np
+        probe = [0.0, -0.0, 1.0, -1.0, 5e-324, float('inf'), float('nan'), 1e300]
+        for x in probe:
+            for y in probe + [math.nextafter(1.0, 2.0), -5e-324]:
+                assert ulp_diff_array(np, [x], [y])[0] == float(ulp_diff(x, y)), \
+                    f'ulp_diff_array disagrees with ulp_diff at ({x!r}, {y!r})'
+        self.threshold = opts['triage_ulp']
+        self.audit = opts['triage_audit']
+        self.rng = np.random.default_rng(opts['seed'])
+        self.entries = {}
+        self.audits = set()
+
+    def compare(self, key, indices, ranjs, scipy_values):
+        """indices: the sweep positions of key's points, with their ranjs and scipy values. Returns the
+        set of positions that need an mpmath reference."""
+        np = self.np
+        ulp = ulp_diff_array(np, ranjs, scipy_values)
+        disagree = ulp > self.threshold
+        audit = ~disagree & (self.rng.random(len(ulp)) < self.audit)
+        finite = ulp[np.isfinite(ulp)]
+        self.entries[key] = {
+            'n': len(ulp),
+            'agreed': int(len(ulp) - disagree.sum()),
+            'escalated': int(disagree.sum()),
+            'audited': int(audit.sum()),
+            # Audited points whose mpmath ULP still exceeds the threshold: scipy agreed with a wrong ranjs.
+            'audit_exceeded': 0,
+            'divergences': int(len(ulp) - len(finite)),
+            'max_ulp': (float('inf') if len(finite) < len(ulp) else int(finite.max())) if len(ulp) else None,
+            'median_ulp': float(np.median(finite)) if len(finite) else None,
+            'p99_ulp': float(np.percentile(finite, 99)) if len(finite) else None,
+        }
+        indices = np.asarray(indices)
+        self.audits.update((key, i) for i in indices[audit].tolist())
+        return set(indices[disagree | audit].tolist())
+
+    def audited(self, key, index, ulp):
+        """Records the mpmath ULP of the point at sweep position index, if it was escalated as an audit."""
+        if (key, index) in self.audits and ulp > self.threshold:
+            self.entries[key]['audit_exceeded'] += 1
+
+    def summary(self, key):
+        return self.entries.get(key, {'n': 0})
+
+    def report(self):
+        return {'scipy_version': self.scipy.__version__, 'ulp_threshold': self.threshold,
+                'audit_fraction': self.audit}
+
+
+def triage_line(t):
+    return (f'    scipy tier: n={t["n"]} agreed={t["agreed"]} escalated={t["escalated"]} audited={t["audited"]} '
+            f'audit_exceeded={t["audit_exceeded"]} max={t["max_ulp"]} median={t["median_ulp"]}')
+
+
+def triaged_references(items, origins, selected, evaluate, key, opts, archive):
+    """sweep_references() over just the items whose positions are in selected (all of them when it is
+    None); every other position gets NOT_ESCALATED. deferred positions index items, as there."""
+    if selected is None:
+        return sweep_references(items, origins, evaluate, key, opts, archive)
+    positions = sorted(selected)
+    values, deferred = sweep_references([items[i] for i in positions], [origins[i] for i in positions], evaluate,
+                                        key, opts, archive)
+    refs = [NOT_ESCALATED] * len(items)
+    for i, value in zip(positions, values):
+        refs[i] = value
+    return refs, [(positions[i], seconds) for i, seconds in deferred]
+
+
+# ─── RANJS TIMING ───
+
+# Per-call ranjs cost for --timing: the bridges time each call in repeated micro-batches and return
+# ns per call; these summarize them per function/method next to the ULP statistics -- percentiles
+# overall, medians per domain bin of every swept argument, and the bins and points that run more
+# than TIMING_SLOW_FACTOR times the median (the O(k) cdf loops and numerical inversions that fall
+# off a cliff in one corner of the domain).
+TIMING_BINS = 8
+TIMING_SLOW_FACTOR = 100.0
+TIMING_TOP_N = 10
+TIMING_MIN_REGION = 5  # fewer points than this in a bin is a few slow points, not a slow region
+# bridge-timing.js's TIMING_BATCH_NS: a call at least this slow on its own is timed once, cold, not
+# as the best of several batches -- single_sample counts those, and marks them among slow_points.
+TIMING_SINGLE_SAMPLE_NS = 200000
+
+
+def timing_edges(arg):
+    # One bin per integer for small int ranges; otherwise TIMING_BINS bins, log-spaced where the
+    # argument is drawn log-uniformly so every bin holds a similar share of the sample.
+    lo, hi = arg['lo'], arg['hi']
+    if arg.get('kind') == 'int' and hi - lo < TIMING_BINS:
+        return [lo - 0.5 + i for i in range(hi - lo + 2)]
+    if arg.get('log_uniform'):
+        step = (math.log(hi) - math.log(lo)) / TIMING_BINS
+        return [math.exp(math.log(lo) + i * step) for i in range(TIMING_BINS + 1)]
+    return [lo + (hi - lo) * i / TIMING_BINS for i in range(TIMING_BINS + 1)]
+
+
+def timing_summary(rows, axes):
+    """rows: (ns, point, coords) per timed call, coords aligned with axes, a list of
+    (name, bin edges). Returns None for no rows. Calls of TIMING_SINGLE_SAMPLE_NS or more are
+    one cold run each: single_sample counts them, and slow_points marks them."""
+    if not rows:
+        return None
+    ns = sorted(r[0] for r in rows)
+    median = statistics.median(ns)
+    bins, slow_regions = {}, []
+    for j, (name, edges) in enumerate(axes):
+        cells = [[] for _ in range(len(edges) - 1)]
+        for t, _, coords in rows:
+            i = bisect.bisect_right(edges, coords[j]) - 1
+            cells[min(max(i, 0), len(cells) - 1)].append(t)
+        bins[name] = []
+        for i, cell in enumerate(cells):
+            cell_median = statistics.median(cell) if cell else None
+            bins[name].append({'lo': edges[i], 'hi': edges[i + 1], 'n': len(cell), 'median_ns': cell_median})
+            if len(cell) >= TIMING_MIN_REGION and cell_median > TIMING_SLOW_FACTOR * median:
+                slow_regions.append({'arg': name, 'lo': edges[i], 'hi': edges[i + 1], 'n': len(cell),
+                                     'median_ns': cell_median, 'ratio': cell_median / median})
+    slowest = sorted(rows, key=lambda r: -r[0])[:TIMING_TOP_N]
+    return {
+        'n': len(ns),
+        'median_ns': median,
+        'p90_ns': ns[int(0.9 * (len(ns) - 1))],
+        'p99_ns': ns[int(0.99 * (len(ns) - 1))],
+        'max_ns': ns[-1],
+        'single_sample': len(ns) - bisect.bisect_left(ns, TIMING_SINGLE_SAMPLE_NS),
+        'bins': bins,
+        'slow_regions': slow_regions,
+        'slow_points': [{'point': point, 'ns': t, 'ratio': t / median,
+                         'single_sample': t >= TIMING_SINGLE_SAMPLE_NS}
+                        for t, point, _ in slowest if t > TIMING_SLOW_FACTOR * median],
+    }
+
+
+def timing_line(t):
+    return (f'    timing: median={t["median_ns"]:.0f}ns p90={t["p90_ns"]:.0f}ns p99={t["p99_ns"]:.0f}ns '
+            f'max={t["max_ns"]:.0f}ns single_sample={t["single_sample"]} '
+            f'slow_regions={len(t["slow_regions"])} slow_points={len(t["slow_points"])}')
+
+
+# ─── COMMAND LINE ───
+
+def flag_value(name, default, cast):
+    return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+
+DEFAULT_SEED = 42
+
+
+def common_argv(default_out, profile_out, bridge_chunk=None, bridge_timeout=None):
+    """The flags every harness takes, as a dict. --jobs is forced to 1 under --profile, so every
+    record lands in this process."""
+    profile = flag_value('--profile-out', profile_out, str) if '--profile' in sys.argv else None
+    worst_k = flag_value('--worst-k', WORST_K, int)
+    if worst_k < 1:
+        # max_ulp and worst_case are read off the heap's top, so an empty heap would drop them too.
+        sys.exit(f'--worst-k must be at least 1 (got {worst_k}).')
+    return {
+        'seed': flag_value('--seed', DEFAULT_SEED, int),
+        'out': flag_value('--out', default_out, str),
+        'budget': flag_value('--point-budget', DEFAULT_POINT_BUDGET, float),
+        'retry_budget': flag_value('--retry-budget', None, float),
+        'jobs': 1 if profile else flag_value('--jobs', 1, int),
+        'ref_cache': flag_value('--ref-cache', None, str),
+        'bridge_chunk': flag_value('--bridge-chunk', bridge_chunk, int),
+        'bridge_timeout': flag_value('--bridge-timeout', bridge_timeout, float),
+        'profile_out': profile,
+        'timing': '--timing' in sys.argv,
+        'baseline': flag_value('--baseline', None, str),
+        'archive': '--archive' in sys.argv,
+        'worst_k': worst_k,
+        'column_archive': flag_value('--column-archive', None, str),
+        'triage': '--triage' in sys.argv,
+        'triage_ulp': flag_value('--triage-ulp', TRIAGE_ULP, int),
+        'triage_audit': flag_value('--triage-audit', TRIAGE_AUDIT, float),
+    }
@@ -6,6 +6,7 @@
 require('@babel/register').default()
 
 const dist = require('../src/dist/index.js')
+const { TIMING, timeCall } = require('./bridge-timing.js')
 
 // Whitelist (mirrors difftest-dist.py's DIST_SPEC keys): indexing `dist` directly with the
 // JSON-supplied name would let a caller instantiate any export -- see eval-special.js's FN.
@@ -31,11 +32,15 @@ process.stdin.on('end', () => {
       // _qInitialGuess() draws from it for any distribution without fully bounded support.
       const instance = new DISTS[name](...params).seed(0)
       const x = instance.q(p)
-      return {
+      const result = {
         x: encode(x),
         pdf: encode(instance.pdf(x)),
         cdf: encode(instance.cdf(x))
       }
+      if (TIMING) {
+        result.ns = { pdf: timeCall(() => instance.pdf(x)), cdf: timeCall(() => instance.cdf(x)) }
+      }
+      return result
     } catch (ex) {
       return { error: String(ex) }
     }
@@ -8,6 +8,7 @@
 require('@babel/register').default()
 
 const dist = require('../src/dist/index.js')
+const { TIMING, timeCall } = require('./bridge-timing.js')
 const continuousCases = require('../test/dist-cases-continuous.js').default
 const discreteCases = require('../test/dist-cases-discrete.js').default
 
@@ -20,6 +21,70 @@ function encode (value) {
   return value
 }
 
+// Work counters for one q(p) call, without touching src/dist/: q() runs on a Proxy of the instance
+// whose get trap hands back wrappers for the prototype's methods, so everything q() evaluates
+// through `this` is counted. The instance itself is never modified or made a prototype -- either
+// leaves it in V8's slow dictionary or prototype mode. cdf/pdf count _cdf/_pdf calls -- the
+// formula evaluations themselves, since a cdf() outside the support short-circuits before reaching
+// one. bracket counts the bracket-expansion steps of the two numerical inverters: _qTableBracket's
+// cdf probes, and the cdf calls _qEstimateRoot makes after its initial pair until a sign change is
+// in hand. Evaluations an instance delegates to another instance (e.g. a wrapped base
+// distribution) are not seen.
+const COUNTED = ['_cdf', '_pdf', 'cdf', '_qTableBracket', '_qEstimateRoot']
+
+function countedQ (instance, p) {
+  const method = typeof instance._q === 'function' ? 'closed' : instance.type() === 'discrete' ? 'table' : 'root'
+  const work = { method, cdf: 0, pdf: 0, bracket: 0 }
+  const proto = Object.getPrototypeOf(instance)
+  let phase = null
+  let rootCalls = 0
+  let signs = 0
+  const wrappers = {
+    _cdf (x) {
+      work.cdf++
+      return proto._cdf.call(this, x)
+    },
+    _pdf (x) {
+      work.pdf++
+      return proto._pdf.call(this, x)
+    },
+    cdf (x) {
+      const value = proto.cdf.call(this, x)
+      if (phase === 'table') {
+        work.bracket++
+      } else if (phase === 'root' && signs !== 3) {
+        // Bit 1: a probe below p seen, bit 2: one above -- both means the bracket is closed.
+        signs |= value < p ? 1 : value > p ? 2 : 0
+        if (++rootCalls > 2) work.bracket++
+      }
+      return value
+    },
+    _qTableBracket (q) {
+      phase = 'table'
+      try {
+        return proto._qTableBracket.call(this, q)
+      } finally {
+        phase = null
+      }
+    },
+    _qEstimateRoot (q) {
+      phase = 'root'
+      try {
+        return proto._qEstimateRoot.call(this, q)
+      } finally {
+        phase = null
+      }
+    }
+  }
+  // An own property (set in a constructor) is the instance's real method -- left alone.
+  const installed = new Set(COUNTED.filter(name =>
+    typeof proto[name] === 'function' && !Object.prototype.hasOwnProperty.call(instance, name)))
+  const counted = new Proxy(instance, {
+    get: (target, name, receiver) => installed.has(name) ? wrappers[name] : Reflect.get(target, name, receiver)
+  })
+  return [counted.q(p), work]
+}
+
 // typeof instance._q === 'function' is the runtime source of truth for closed-form-vs-numerical
 // quantile dispatch (src/dist/_distribution.js's q(p)) -- only readable from JS, never from a
 // static Python-side list, since a distribution's own _q override is what q() checks directly.
@@ -47,9 +112,19 @@ function catalog () {
 function evalPoints (points) {
   return points.map(({ name, params, p }) => {
     try {
+      let ns
+      if (TIMING) {
+        // Timed first, on an instance of its own: whatever q() caches on the instance it ran on
+        // would otherwise show up in the work counts below, or the counting in the timings.
+        const timed = new dist[name](...params).seed(0)
+        const x = timed.q(p)
+        ns = { q: timeCall(() => timed.q(p)), cdf: timeCall(() => timed.cdf(x)) }
+      }
       const instance = new dist[name](...params).seed(0)
-      const x = instance.q(p)
-      return { x: encode(x), cdfOfQ: encode(instance.cdf(x)) }
+      const [x, work] = countedQ(instance, p)
+      const result = { x: encode(x), cdfOfQ: encode(instance.cdf(x)), work }
+      if (ns) result.ns = ns
+      return result
     } catch (ex) {
       return { error: String(ex) }
     }
@@ -65,6 +140,14 @@ if (mode === 'catalog') {
   process.stdin.on('end', () => {
     process.stdout.write(JSON.stringify(evalPoints(JSON.parse(input))))
   })
+} else if (mode === 'serve') {
+  // difftest_engine.Bridge's persistent mode: one point per stdin line, one result per stdout line,
+  // after a "ready" line once everything above has loaded, so no point's timeout counts startup.
+  const lines = require('readline').createInterface({ input: process.stdin })
+  lines.on('line', line => {
+    process.stdout.write(JSON.stringify(evalPoints([JSON.parse(line)])[0]) + '\n')
+  })
+  process.stdout.write('"ready"\n')
 } else {
-  throw new Error(`Unknown mode "${mode}" -- expected "catalog" or "eval"`)
+  throw new Error(`Unknown mode "${mode}" -- expected "catalog", "eval" or "serve"`)
 }
@@ -4,6 +4,7 @@
 require('@babel/register').default()
 
 const special = require('../src/special/index.js')
+const { TIMING, timeCall } = require('./bridge-timing.js')
 
 const FN = {
   besselI: special.besselI,
@@ -32,7 +33,8 @@ process.stdin.on('end', () => {
   const points = JSON.parse(input)
   const results = points.map(({ fn, args }) => {
     try {
-      return { value: encode(FN[fn](...args)) }
+      const value = encode(FN[fn](...args))
+      return TIMING ? { value, ns: timeCall(() => FN[fn](...args)) } : { value }
     } catch (ex) {
       return { error: String(ex) }
     }
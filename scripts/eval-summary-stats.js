@@ -61,13 +61,44 @@ function encode (value) {
   return value
 }
 
+// precision-refs-summary-stats.py --large ships arrays as { gen, seed, n, lo, hi } descriptors
+// rather than literals; expand them with the exact mulberry32 stream and double construction
+// the generator's _expand() uses, caching per descriptor since several points share an array.
+function mulberry32 (seed) {
+  let a = seed | 0
+  return () => {
+    a = a + 0x6D2B79F5 | 0
+    let t = Math.imul(a ^ a >>> 15, a | 1)
+    t = t + Math.imul(t ^ t >>> 7, t | 61) ^ t
+    return (t ^ t >>> 14) >>> 0
+  }
+}
+
+const expanded = new Map()
+function expand (arg) {
+  if (arg === null || typeof arg !== 'object' || Array.isArray(arg)) return arg
+  const key = JSON.stringify(arg)
+  if (!expanded.has(key)) {
+    const next = mulberry32(arg.seed)
+    const values = new Array(arg.n)
+    for (let i = 0; i < arg.n; i++) {
+      const u = ((next() >>> 5) * 67108864 + (next() >>> 6)) / 9007199254740992
+      values[i] = arg.gen === 'ties'
+        ? arg.lo + Math.floor(u * (arg.hi - arg.lo + 1))
+        : arg.lo + (arg.hi - arg.lo) * u
+    }
+    expanded.set(key, values)
+  }
+  return expanded.get(key)
+}
+
 let input = ''
 process.stdin.on('data', chunk => { input += chunk })
 process.stdin.on('end', () => {
   const points = JSON.parse(input)
   const results = points.map(({ fn, args }) => {
     try {
-      return { value: encode(FN[fn](...args)) }
+      return { value: encode(FN[fn](...args.map(expand))) }
     } catch (ex) {
       return { error: String(ex) }
     }
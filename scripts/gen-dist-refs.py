@@ -17,13 +17,25 @@ Usage:
     python3 scripts/gen-dist-refs.py Normal        # one distribution
     python3 scripts/gen-dist-refs.py --discrete    # all discrete only
     python3 scripts/gen-dist-refs.py --continuous  # all continuous only
+    python3 scripts/gen-dist-refs.py --profile [--profile-out PATH]
+        # also write per-evaluation wall time, mpmath primitive counts and series term counts
+        # to /tmp/gen-dist-refs-profile.json (default PROFILE_OUT), top-N summary on stderr
+    python3 scripts/gen-dist-refs.py --point-budget 120 --retry-budget 3600
+        # defer any distribution whose single inversion, pdf/pmf or cdf overruns 120 s (default
+        # DEFAULT_POINT_BUDGET), then retry the deferred ones at the end with 3600 s (default: no
+        # budget); one still unresolved gets an UNRESOLVED comment and the exit status is 1
 """
+import json
 import sys
 from mpmath import (mp, mpf, pi, sqrt, exp, log, expm1, log1p, cosh, tanh,
                     atan, asin, asinh, acos, sin, cos, gamma as gammafn, loggamma,
                     beta as betafn, erf, erfc, besseli, power, fsum, factorial, zeta,
                     quad, inf, fabs, sign, nsum, gammainc, betainc, binomial)
 
+from ref_normalizers import normalizer
+from ref_profile import disable_profiling, enable_profiling, profile_terms, profiled
+from ref_watchdog import DEFAULT_POINT_BUDGET, PointTimeout, budget_flags, evaluate_deferred, watchdog
+
 mp.dps = 50
 
 HALF = mpf(1) / 2
@@ -89,6 +101,7 @@ def ncx2_cdf(k, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -111,6 +124,7 @@ def ncx2_pdf(k, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -131,6 +145,7 @@ def ncbeta_cdf(a, b, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -150,6 +165,7 @@ def ncbeta_pdf(a, b, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -179,6 +195,7 @@ def dncbeta_cdf(a, b, l1, l2, x):
             si += 1
             if si > 5000:
                 break
+        profile_terms(si + 1)
         s += inner
         if r > h1 + 5 and fabs(inner) < fabs(s) * mpf('1e-55'):
             break
@@ -212,6 +229,7 @@ def dncbeta_pdf(a, b, l1, l2, x):
             si += 1
             if si > 5000:
                 break
+        profile_terms(si + 1)
         s += inner
         if r > h1 + 5 and fabs(inner) < fabs(s) * mpf('1e-55'):
             break
@@ -265,6 +283,7 @@ def dnct_pdf(nu, mu, theta, t):
         i += 1
         if i > 5000:
             break
+    profile_terms(i + 1)
     return s
 
 
@@ -285,6 +304,7 @@ def dnct_cdf(nu, mu, theta, t):
         i += 1
         if i > 5000:
             break
+    profile_terms(i + 1)
     return s if t >= 0 else 1 - s
 
 
@@ -1152,15 +1172,7 @@ def pmf(name, p, k):
         return w[k - offset] / fsum(w)
     if name == 'ConwayMaxwellPoisson':
         lam, nu = mpf(p[0]), mpf(p[1])
-        z = mpf(0)
-        j = 0
-        while True:
-            term = power(lam, j) / power(factorial(j), nu)
-            z += term
-            if j > 5 and term < mpf('1e-60') * z:
-                break
-            j += 1
-        return power(lam, k) / power(factorial(k), nu) / z
+        return power(lam, k) / power(factorial(k), nu) / normalizer(name, p)
     if name == 'Delaporte':
         a, b, lam = mpf(p[0]), mpf(p[1]), mpf(p[2])
         return fsum(
@@ -1193,7 +1205,7 @@ def pmf(name, p, k):
         return binomial(K, k) * binomial(N - K, n - k) / binomial(N, n)
     if name == 'LogSeries':
         pp = mpf(p[0])
-        return -1 / log(1 - pp) * power(pp, k) / k
+        return power(pp, k) / k / normalizer(name, p)
     if name == 'NegativeHypergeometric':
         N, K, r = int(p[0]), int(p[1]), int(p[2])
         return binomial(k + r - 1, k) * binomial(N - r - k, K - k) / binomial(N, K)
@@ -1235,13 +1247,13 @@ def pmf(name, p, k):
         return rho * betafn(mpf(k), rho + 1)
     if name == 'Zeta':
         s = mpf(p[0])
-        return power(k, -s) / zeta(s)
+        return power(k, -s) / normalizer(name, p)
     if name == 'Zipf':
-        s, N = mpf(p[0]), int(p[1])
-        return power(k, -s) / fsum(power(i, -s) for i in range(1, N + 1))
+        s = mpf(p[0])
+        return power(k, -s) / normalizer(name, p)
     if name == 'ZipfMandelbrot':
-        N, s, q = int(p[0]), mpf(p[1]), mpf(p[2])
-        return power(k + q, -s) / fsum(power(i + q, -s) for i in range(1, N + 1))
+        s, q = mpf(p[1]), mpf(p[2])
+        return power(k + q, -s) / normalizer(name, p)
     raise ValueError('pmf: ' + name)
 
 
@@ -1268,10 +1280,52 @@ def step(name):
     return 2 if name in ('HeadsMinusTails', 'Rademacher') else 1
 
 
+# pmf(k + st) / pmf(k) for the factorial/binomial/beta-function pmfs, and per-(name, params)
+# cumulative tables walked once up to the largest requested k -- duplicated from
+# scripts/precision-refs-discrete.py, which documents (and self-checks) both.
+def _ratio_beta_binomial(p, k):
+    n, a, b = map(mpf, p)
+    return mpf(0) if k >= n else (n - k) / (k + 1) * (k + a) / (n - k - 1 + b)
+
+
+def _ratio_neg_hypergeometric(p, k):
+    N, K, r = int(p[0]), int(p[1]), int(p[2])
+    return mpf(0) if k >= K else mpf((k + r) * (K - k)) / ((k + 1) * (N - r - k))
+
+
+RATIO = {
+    'BetaBinomial': _ratio_beta_binomial,
+    'Binomial': lambda p, k: (mpf(p[0]) - k) / (k + 1) * mpf(p[1]) / (1 - mpf(p[1])),
+    'FlorySchulz': lambda p, k: mpf(k + 1) / k * (1 - mpf(p[0])),
+    'Geometric': lambda p, k: 1 - mpf(p[0]),
+    'Hypergeometric': lambda p, k: mpf((int(p[1]) - k) * (int(p[2]) - k))
+    / ((k + 1) * (int(p[0]) - int(p[1]) - int(p[2]) + k + 1)),
+    'LogSeries': lambda p, k: mpf(p[0]) * k / (k + 1),
+    'NegativeBinomial': lambda p, k: (k + mpf(p[0])) / (k + 1) * mpf(p[1]),
+    'NegativeHypergeometric': _ratio_neg_hypergeometric,
+    'Poisson': lambda p, k: mpf(p[0]) / (k + 1),
+    'YuleSimon': lambda p, k: mpf(k) / (k + mpf(p[0]) + 1),
+}
+
+_CDF_TABLES = {}
+
+
 def dcdf(name, p, k):
     lo = support_lo(name, p)
     st = step(name)
-    return fsum(pmf(name, p, j) for j in range(lo, k + 1, st))
+    if k < lo:
+        return mpf(0)
+    # [(pmf, cdf) at lo, at lo + st, ...]: one append per step, so a watchdog timeout can't
+    # leave the walk half-advanced for the deferred retry to resume from.
+    table = _CDF_TABLES.setdefault((name, json.dumps(p)), [])
+    ratio = RATIO.get(name)
+    while lo + len(table) * st <= k:
+        j = lo + len(table) * st
+        f = pmf(name, p, j) if ratio is None or not table else table[-1][0] * ratio(p, j - st)
+        with mp.workdps(mp.dps + 10):
+            total = (table[-1][1] if table else 0) + f
+        table.append((f, total))
+    return +table[(k - lo) // st][1]
 
 
 # =========================================================================
@@ -1434,7 +1488,7 @@ MANUAL_XVALS = {
 }
 
 
-def xvalues(name, p):
+def xvalues(name, p, seconds=None):
     if name in MANUAL_XVALS:
         return MANUAL_XVALS[name][tuple(p)]
     if name == 'TukeyLambda':
@@ -1442,7 +1496,12 @@ def xvalues(name, p):
         if lam == 0:
             return [log(pv / (1 - pv)) for pv in P_GRID]
         return [(power(pv, lam) - power(1 - pv, lam)) / lam for pv in P_GRID]
-    return [invcdf(name, p, pv) for pv in P_GRID]
+    # Each inversion under its own budget: together they can legitimately take far longer.
+    xs = []
+    for pv in P_GRID:
+        with watchdog(seconds):
+            xs.append(invcdf(name, p, pv))
+    return xs
 
 
 # =========================================================================
@@ -1627,6 +1686,8 @@ DISCRETE_SPEC = [
     ('ZipfMandelbrot', [20, 1.5, 2], [1, 3, 8, 15, 20]),
 ]
 
+PROFILE_OUT = '/tmp/gen-dist-refs-profile.json'
+
 
 # =========================================================================
 # Output helpers
@@ -1655,24 +1716,29 @@ def print_block(ref_lines, qv_lines):
     print('    quantileVals: [\n      ' + qv_body + '\n    ]')
 
 
-def gen_continuous(name, p):
-    xs = xvalues(name, p)
+def gen_continuous(name, p, seconds=None):
+    with profiled(name, p, 'xvalues'):
+        xs = xvalues(name, p, seconds)
     ref_lines = []
     qv_lines = []
     for x in xs:
-        pdfv = pdf(name, p, x)
-        cdfv = cdf(name, p, x)
+        with watchdog(seconds), profiled(name, p, 'pdf', num(x)):
+            pdfv = pdf(name, p, x)
+        with watchdog(seconds), profiled(name, p, 'cdf', num(x)):
+            cdfv = cdf(name, p, x)
         ref_lines.append(fmt_cont_entry(x, pdfv, cdfv))
         qv_lines.append(fmt_qv_entry(cdfv, x))
     return ref_lines, qv_lines
 
 
-def gen_discrete(name, p, ks):
+def gen_discrete(name, p, ks, seconds=None):
     ref_lines = []
     qv_lines = []
     for k in ks:
-        pmfv = pmf(name, p, k)
-        cdfv = dcdf(name, p, k)
+        with watchdog(seconds), profiled(name, p, 'pmf', k):
+            pmfv = pmf(name, p, k)
+        with watchdog(seconds), profiled(name, p, 'cdf', k):
+            cdfv = dcdf(name, p, k)
         qp = cdfv - pmfv / 2  # midpoint of k-th step -> quantile resolves to k
         ref_lines.append(fmt_disc_entry(k, pmfv, cdfv))
         qv_lines.append(fmt_qv_entry(qp, mpf(k)))
@@ -1680,41 +1746,51 @@ def gen_discrete(name, p, ks):
 
 
 def p_repr(p):
-    import json
     return json.dumps(p)
 
 
-def run_continuous(filter_name):
+def _block(job, seconds):
+    # One distribution's (ref_lines, qv_lines), or the exception its evaluation raised -- printed
+    # in place as an ERROR comment, where a PointTimeout goes to evaluate_deferred() instead.
+    gen, name, p, *ks = job
+    print(f'  // {name}({p_repr(p)})', flush=True, file=sys.stderr)
+    try:
+        return gen(name, p, *ks, seconds)
+    except PointTimeout:
+        raise
+    except Exception as e:
+        return e
+
+
+def print_blocks(jobs, budget, retry_budget):
+    # Computes every block first, deferred ones included, so stdout keeps the spec's order.
+    # Returns how many were left unresolved (printed as an UNRESOLVED comment).
+    blocks, unresolved = evaluate_deferred(_block, jobs, budget, retry_budget,
+                                           label=lambda job: f'{job[1]}({p_repr(job[2])})')
+    for (_, name, p, *_), block in zip(jobs, blocks):
+        print(f'  // {name}({p_repr(p)})')
+        if block is None:
+            print('    // UNRESOLVED: overran its watchdog budget')
+        elif isinstance(block, Exception):
+            print(f'    // ERROR: {block}')
+        else:
+            print_block(*block)
+        print()
+    return len(unresolved)
+
+
+def run_continuous(filter_name, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
     print('// ============ CONTINUOUS DISTRIBUTIONS ============')
-    for name, sets in PARAM_SETS.items():
-        if filter_name and name != filter_name:
-            continue
-        for p in sets:
-            label = p_repr(p)
-            print(f'  // {name}({label})', flush=True, file=sys.stderr)
-            print(f'  // {name}({label})')
-            try:
-                ref_lines, qv_lines = gen_continuous(name, p)
-                print_block(ref_lines, qv_lines)
-            except Exception as e:
-                print(f'    // ERROR: {e}')
-            print()
-
-
-def run_discrete(filter_name):
+    return print_blocks([(gen_continuous, name, p) for name, sets in PARAM_SETS.items()
+                         if not filter_name or name == filter_name for p in sets],
+                        budget, retry_budget)
+
+
+def run_discrete(filter_name, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
     print('// ============ DISCRETE DISTRIBUTIONS ============')
-    for name, p, ks in DISCRETE_SPEC:
-        if filter_name and name != filter_name:
-            continue
-        label = p_repr(p)
-        print(f'  // {name}({label})', flush=True, file=sys.stderr)
-        print(f'  // {name}({label})')
-        try:
-            ref_lines, qv_lines = gen_discrete(name, p, ks)
-            print_block(ref_lines, qv_lines)
-        except Exception as e:
-            print(f'    // ERROR: {e}')
-        print()
+    return print_blocks([(gen_discrete, name, p, ks) for name, p, ks in DISCRETE_SPEC
+                         if not filter_name or name == filter_name],
+                        budget, retry_budget)
 
 
 if __name__ == '__main__':
@@ -1722,16 +1798,33 @@ if __name__ == '__main__':
     do_cont = True
     do_disc = True
     filter_name = None
+    profile_out = PROFILE_OUT
+    if '--profile-out' in args:
+        idx = args.index('--profile-out')
+        profile_out = args[idx + 1]
+        del args[idx:idx + 2]
+    budget, retry_budget = budget_flags()
+    for flag in ('--point-budget', '--retry-budget'):
+        if flag in args:
+            idx = args.index(flag)
+            del args[idx:idx + 2]
 
     for a in args:
         if a == '--discrete':
             do_cont = False
         elif a == '--continuous':
             do_disc = False
+        elif a == '--profile':
+            enable_profiling(globals())
         else:
             filter_name = a
 
+    unresolved = 0
     if do_cont:
-        run_continuous(filter_name)
+        unresolved += run_continuous(filter_name, budget, retry_budget)
     if do_disc:
-        run_discrete(filter_name)
+        unresolved += run_discrete(filter_name, budget, retry_budget)
+    profiler = disable_profiling()
+    if profiler:
+        profiler.write(profile_out)
+    sys.exit(1 if unresolved else 0)
@@ -19,12 +19,31 @@ Usage:    python3 scripts/precision-refs-continuous.py                        #
               # falls through to the same self_check() dispatch, per __main__ below. --emit is
               # required to actually regenerate test/precision-continuous.js -- see
               # solutions/tooling/2026-08-02-1830-precision-refs-bare-invocation-runs-self-check-not-emit.md)
+          python3 scripts/precision-refs-continuous.py --check --cases-json PATH
+              # same, against an existing dump-dist-cases-json.js output; exits 1 on any mismatch
           python3 scripts/precision-refs-continuous.py --emit                 # rewrites the test file
           python3 scripts/precision-refs-continuous.py --emit --only Name1,Name2
               # recompute only the named distributions, reusing the previous run's cached
               # points (/tmp/precision-continuous-cache.json) for everything else -- avoids
               # unconditionally re-paying DoublyNoncentralBeta[2,2,1200,1200]'s ~65-minute
               # cost (issue #1149) when regenerating references for an unrelated distribution
+          python3 scripts/precision-refs-continuous.py --emit --jobs 8
+              # compute groups on 8 worker processes, longest-expected-first by the per-group
+              # wall times recorded in /tmp/precision-continuous-costs.json (see run_jobs())
+          python3 scripts/precision-refs-continuous.py --emit --point-budget 120 --retry-budget 3600
+              # defer any group whose single pdf/cdf/inversion evaluation overruns 120 s
+              # (default DEFAULT_POINT_BUDGET), then retry the deferred ones at the end with 3600 s
+              # (default: no budget); exits 1 if a group is still unresolved, keeping its
+              # previous references in the test file
+          python3 scripts/precision-refs-continuous.py --emit --profile [--profile-out PATH]
+              # run serially (--jobs is ignored) and write per-evaluation wall time, mpmath
+              # primitive counts and series term counts to /tmp/precision-continuous-profile.json
+              # (default PROFILE_OUT), with a top-N summary on stderr
+          python3 scripts/precision-refs-continuous.py --emit --certify
+              # re-evaluate every reference with an interval form (IV_REF: IrwinHall, Bates,
+              # Kolmogorov) in mpmath.iv, escalating precision per point until the enclosure rounds
+              # to one float64, and emit that certified literal; summary and per-reference records
+              # in /tmp/precision-continuous-certify.json (CERTIFY_OUT)
           python3 scripts/precision-refs-continuous.py --emit --allow-prune
               # by default, render() (below) preserves any existing group verbatim when the
               # fresh cache doesn't reproduce it (e.g. TruncatedExponential, which has no
@@ -32,15 +51,20 @@ Usage:    python3 scripts/precision-refs-continuous.py                        #
               # to actually let such a group be dropped when that removal is deliberate
 """
 import json
+import math
 import os
 import re
 import subprocess
 import sys
 from collections import Counter
+import mpmath
 from mpmath import (mp, mpf, pi, sqrt, exp, log, expm1, log1p, cosh, tanh,
                     atan, atan2, asin, asinh, acos, sin, cos, gamma as gammafn, loggamma,
                     beta as betafn, erf, erfc, besseli, power, fsum, factorial, zeta,
-                    quad, inf, fabs, sign, nsum, gammainc, betainc)
+                    quad, inf, fabs, sign, nsum, gammainc, betainc, iv)
+
+from ref_profile import disable_profiling, enable_profiling, profile_terms, profiled
+from ref_watchdog import DEFAULT_POINT_BUDGET, PointTimeout, evaluate_deferred, watchdog
 
 mp.dps = 50
 
@@ -103,6 +127,7 @@ def ncx2_cdf(k, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -125,6 +150,7 @@ def ncx2_pdf(k, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -145,6 +171,7 @@ def ncbeta_cdf(a, b, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -184,6 +211,7 @@ def ncbeta_pdf(a, b, lam, x):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -258,6 +286,7 @@ def dncbeta_cdf(a, b, l1, l2, x):
             si += 1
             if si > 5000:
                 break
+        profile_terms(si + 1)
         s += inner
         if r > h1 + 5 and fabs(inner) < fabs(s) * mpf('1e-55'):
             break
@@ -310,6 +339,7 @@ def dncbeta_pdf(a, b, l1, l2, x):
             si += 1
             if si > 5000:
                 break
+        profile_terms(si + 1)
         s += inner
         if r > h1 + 5 and fabs(inner) < fabs(s) * mpf('1e-55'):
             break
@@ -363,6 +393,7 @@ def tweedie_pdf(mu, phi, p, y):
         j += 1
         if j > 200000:
             break
+    profile_terms(j)
     return (s / y) * exp((y * theta - kappa) / phi)
 
 
@@ -388,6 +419,7 @@ def tweedie_cdf(mu, phi, p, y):
         j += 1
         if j > 200000:
             break
+    profile_terms(j + 1)
     return s
 
 
@@ -447,6 +479,7 @@ def dnct_pdf(nu, mu, theta, t):
         i += 1
         if i > 5000:
             break
+    profile_terms(i + 1)
     return s
 
 
@@ -468,6 +501,7 @@ def dnct_cdf(nu, mu, theta, t):
         i += 1
         if i > 5000:
             break
+    profile_terms(i + 1)
     return s if t >= 0 else 1 - s
 
 
@@ -1401,7 +1435,7 @@ LARGE_LAMBDA_ANCHORS = [{
 }]
 
 
-def self_check(only=None):
+def self_check(only=None, cases_json=None):
     # A MISMATCH here does not by itself mean this script's mpmath formula is wrong: it means
     # this script's "got" and dist-cases-continuous.js's frozen "want" disagree, and either side
     # could be the stale one. Normal[0,2].cdf(-14) mismatched (issue #1193) because dist-cases-
@@ -1417,11 +1451,16 @@ def self_check(only=None):
     # json.js loads it exactly the way mocha does (via @babel/register) and evaluates every closure,
     # so this always checks against the live file instead of a stale or nonexistent snapshot.
     # See solutions/testing/2026-07-24-1141-precision-refs-self-check-never-ran.md
-    result = subprocess.run(['node', 'scripts/dump-dist-cases-json.js'], capture_output=True, text=True)
-    if result.returncode != 0:
-        print(result.stderr, flush=True)
-        raise RuntimeError('dump-dist-cases-json.js failed')
-    data = json.loads(result.stdout)
+    # --cases-json PATH reads an already-dumped copy instead (regen-refs.py dumps it once, up front).
+    if cases_json:
+        with open(cases_json) as fh:
+            data = json.load(fh)
+    else:
+        result = subprocess.run(['node', 'scripts/dump-dist-cases-json.js'], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stderr, flush=True)
+            raise RuntimeError('dump-dist-cases-json.js failed')
+        data = json.loads(result.stdout)
     # PARAM_SETS is this generator's registry of distributions it actually implements pdf()/cdf()
     # for; test/dist-cases-continuous.js covers a couple more (e.g. TruncatedExponential) that this
     # script never implemented, which would otherwise show up as a spurious ERROR, not a mismatch.
@@ -2228,7 +2267,7 @@ def invcdf(name, p, pv):
     return (a + b) / 2
 
 
-def xvalues(name, p):
+def xvalues(name, p, budget=None):
     # Some distributions only have manual overrides for the boundary-crossover set added
     # in #1178, alongside other param sets that still use the standard P_GRID inversion below
     # -- fall through instead of unconditionally indexing when the specific tuple isn't listed.
@@ -2240,7 +2279,18 @@ def xvalues(name, p):
         if lam == 0:
             return [log(pv / (1 - pv)) for pv in P_GRID]
         return [(power(pv, lam) - power(1 - pv, lam)) / lam for pv in P_GRID]
-    return [invcdf(name, p, pv) for pv in P_GRID]
+    return [_invert(name, p, pv, budget) for pv in P_GRID]
+
+
+def _invert(name, p, pv, budget):
+    # One P_GRID inversion under its own `budget` (see watchdog()): a whole group's xvalues() can
+    # legitimately run for an hour -- DoublyNoncentralBeta[2,2,1200,1200]'s five bisections over
+    # dncbeta_cdf -- so only a single inversion is a meaningful unit to bound.
+    try:
+        with watchdog(budget):
+            return invcdf(name, p, pv)
+    except PointTimeout as exc:
+        raise PointTimeout(f'invcdf at p={num(pv)} {exc}') from None
 
 
 def num(x):
@@ -2558,7 +2608,231 @@ PRESERVE_VERBATIM = {
 CACHE = '/tmp/precision-continuous-cache.json'
 
 
-def compute_cache(only=None):
+COSTS = '/tmp/precision-continuous-costs.json'
+
+
+PROFILE_OUT = '/tmp/precision-continuous-profile.json'
+
+# Expected seconds for a (name, params) group that has no recorded cost yet: the median of the
+# recorded ones (or _DEFAULT_COST before any run has recorded anything), except for the known
+# outliers below, which would otherwise be scheduled as ordinary groups on a first run.
+_DEFAULT_COST = 10.0
+_COST_PRIOR = {
+    'DoublyNoncentralBeta|[2, 2, 1200, 1200]': 65 * 60.0,  # issue #1149
+}
+
+
+def _cost_key(name, p):
+    return f'{name}|{json.dumps(p)}'
+
+
+def load_costs():
+    if os.path.exists(COSTS):
+        with open(COSTS) as fh:
+            return json.load(fh)
+    return {}
+
+
+def save_costs(costs):
+    with open(COSTS, 'w') as fh:
+        json.dump(costs, fh, indent=1, sort_keys=True)
+
+
+def expected_cost(costs, name, p):
+    key = _cost_key(name, p)
+    if key in costs:
+        return costs[key]
+    if key in _COST_PRIOR:
+        return _COST_PRIOR[key]
+    known = sorted(costs.values())
+    return known[len(known) // 2] if known else _DEFAULT_COST
+
+
+# ---- --certify: interval-arithmetic certification ----
+# Every reference is an mpf at mp.dps = 50 rounded to float64, on trust that 50 digits survive the
+# formula. Where that trust is weakest -- cancellation in ih_pdf/ih_cdf's alternating binomial sum
+# (IrwinHall, Bates), Kolmogorov's alternating nsum -- --certify re-evaluates the reference in
+# mpmath's interval context, which carries a rigorous enclosure through every operation. A value
+# is certified when both ends of the enclosure round to the same float64; when they don't, only
+# that point is re-run at twice the working precision, up to CERTIFY_MAX_PREC. mpmath.iv has the
+# elementary functions only (no gammainc/betainc/besseli/nsum), so IV_REF covers just the formulas
+# that reduce to them; every other reference keeps its mp.dps = 50 rounding, as without --certify.
+
+CERTIFY = False
+CERTIFY_MAX_PREC = 8 * mp.prec
+CERTIFY_OUT = '/tmp/precision-continuous-certify.json'
+_IV_MAX_TERMS = 100000
+
+
+def _iv_alternating(term, first_decreasing=1):
+    # sum_{k>=1} (-1)^(k+1) term(k), terms positive and decreasing from k = first_decreasing on. Summed
+    # until the next term is below 2^-iv.prec of the partial sum; the alternating-series bound then
+    # encloses the whole tail in [-term(K+1), term(K+1)]. None if it never gets there.
+    s = iv.mpf(0)
+    t = term(1)
+    for k in range(1, _IV_MAX_TERMS):
+        s += t if k % 2 else -t
+        t = term(k + 1)
+        if k + 1 >= first_decreasing and mpf(t.b) <= mpmath.ldexp(mpf(abs(s).a), -iv.prec):
+            return s + iv.mpf([-t.b, t.b])
+    return None
+
+
+def _iv_ih(n, x, cdf):
+    # ih_pdf/ih_cdf on an interval x. None when x straddles an integer knot, where the sum's term
+    # count (int(x) + 1) isn't one number.
+    kmax = int(x.a)
+    if x.a < 0 or x.b > n or int(x.b) != kmax:
+        return None
+    m = n if cdf else n - 1
+    s = iv.mpf(0)
+    for k in range(kmax + 1):
+        s += (1 if k % 2 == 0 else -1) * math.comb(n, k) * (x - k) ** m
+    return s / math.factorial(m)
+
+
+def _iv_bates(p, x, cdf):
+    n, a, b = int(round(p[0])), iv.mpf(p[1]), iv.mpf(p[2])
+    scale = n / (b - a)
+    y = _iv_ih(n, scale * x - n * a / (b - a), cdf)
+    return y if y is None or cdf else scale * y
+
+
+def _iv_kolmogorov_pdf(x):
+    # k^2 x exp(-2 k^2 x^2) decreases in k once k > 1/(x sqrt 2).
+    series = _iv_alternating(lambda k: k * k * x * iv.exp(-2 * (k * x) ** 2), int(1 / float(x.a)) + 1)
+    return None if series is None else 8 * series
+
+
+def _iv_kolmogorov_cdf(x):
+    tail = _iv_alternating(lambda k: iv.exp(-2 * (k * x) ** 2))
+    return None if tail is None else 1 - 2 * tail
+
+
+# (name, method) -> f(params, x interval) -> enclosure of pdf/cdf (name, params, x), or None
+IV_REF = {
+    ('IrwinHall', 'pdf'): lambda p, x: _iv_ih(int(round(p[0])), x, False),
+    ('IrwinHall', 'cdf'): lambda p, x: _iv_ih(int(round(p[0])), x, True),
+    ('Bates', 'pdf'): lambda p, x: _iv_bates(p, x, False),
+    ('Bates', 'cdf'): lambda p, x: _iv_bates(p, x, True),
+    ('Kolmogorov', 'pdf'): lambda p, x: _iv_kolmogorov_pdf(x),
+    ('Kolmogorov', 'cdf'): lambda p, x: _iv_kolmogorov_cdf(x),
+}
+
+
+def _nearest_float(endpoint):
+    # float() on an iv endpoint rounds toward zero, not to nearest as num() does; going through an
+    # mpf wide enough to hold the endpoint exactly keeps the one rounding num() would apply.
+    with mp.workprec(iv.prec):
+        return float(mpf(endpoint))
+
+
+def certify(name, p, method, x, value):
+    """(literal, record) for one pdf/cdf reference under --certify. record is None when IV_REF has no
+    interval form for it (literal is then num(value), as always); otherwise {'method', 'x', 'status',
+    'prec', 'literal', 'mp_literal'}, status being
+      certified   the enclosure at prec bits rounds to one float64, the same as value's,
+      corrected   it rounds to one float64 that value's mp.dps = 50 rounding missed (emitted instead),
+      uncertified it never narrowed to one float64 by CERTIFY_MAX_PREC (value's rounding is kept)."""
+    formula = IV_REF.get((name, method))
+    if formula is None:
+        return num(value), None
+    record = {'method': method, 'x': num(x), 'status': 'uncertified', 'prec': None,
+              'literal': num(value), 'mp_literal': num(value)}
+    prec = mp.prec
+    saved = iv.prec
+    try:
+        while prec <= CERTIFY_MAX_PREC:
+            iv.prec = prec
+            enclosure = formula(p, iv.mpf(x))
+            if enclosure is None:
+                break
+            lo, hi = _nearest_float(enclosure.a), _nearest_float(enclosure.b)
+            if lo == hi:
+                record.update(status='certified' if num(lo) == num(value) else 'corrected', prec=prec,
+                              literal=num(lo))
+                break
+            prec *= 2
+    finally:
+        iv.prec = saved
+    return record['literal'], record
+
+
+def _compute_group(job, budget):
+    # One (name, params) group, each single evaluation -- one xvalues() inversion or one pdf/cdf --
+    # under its own `budget`; a PointTimeout names the step that overran.
+    name, p = job
+    step = 'xvalues():'
+    try:
+        with profiled(name, p, 'xvalues'):
+            xs = xvalues(name, p, budget)
+        pts = []
+        certified = []
+        for x in xs:
+            print(f'    computing {name}{p} at x={x}...', flush=True)
+            step = f'pdf/cdf at x={num(x)}'
+            with watchdog(budget):
+                with profiled(name, p, 'pdf', num(x)):
+                    pdf_x = pdf(name, p, x)
+                with profiled(name, p, 'cdf', num(x)):
+                    cdf_x = cdf(name, p, x)
+                if not CERTIFY:
+                    pts.append([num(x), num(pdf_x), num(cdf_x)])
+                    continue
+                (pdf_lit, pdf_record), (cdf_lit, cdf_record) = (certify(name, p, 'pdf', x, pdf_x),
+                                                                certify(name, p, 'cdf', x, cdf_x))
+                pts.append([num(x), pdf_lit, cdf_lit])
+                certified.extend(r for r in (pdf_record, cdf_record) if r)
+    except PointTimeout as exc:
+        raise PointTimeout(f'{step} {exc}') from None
+    group = {'name': name, 'params': p, 'points': pts}
+    if certified:
+        group['certify'] = certified
+    return group
+
+
+def run_jobs(pending, costs, jobs=1, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
+    """Computes every (name, params) group in `pending` on `jobs` worker processes,
+    longest-expected-first (per expected_cost()), and returns the groups in `pending`'s order.
+    Dispatching the longest jobs first bounds the total at about max(longest group, total / jobs)
+    instead of leaving one ~65-minute group to start last. Each group's measured wall time is
+    written back into `costs`, so the next run's schedule and ETA use real numbers.
+
+    Every single evaluation runs under a `budget`-second watchdog, through ref_watchdog's
+    evaluate_deferred(): a group whose evaluation overruns is moved to a deferred queue instead of
+    stalling its worker, and retried once after everything else has finished, with `retry_budget`
+    -- None, the default, retries without one, so a run still computes every group and only stops
+    waiting on the slow ones first. Groups still unresolved after that come back as None and are
+    reported with their cost."""
+    expected = [expected_cost(costs, name, p) for name, p in pending]
+    remaining = sum(expected)
+    print(f'  {len(pending)} groups to compute, expected ~{remaining / jobs / 60:.1f} min '
+          f'on {jobs} worker(s)', flush=True)
+
+    def landed(i, group, seconds, why):
+        nonlocal remaining
+        name, p = pending[i]
+        key = _cost_key(name, p)
+        if why is not None:
+            # Elapsed time is only a lower bound on a deferred group's cost, but enough to
+            # schedule it first next run.
+            costs[key] = round(max(seconds, costs.get(key, 0)), 3)
+            return
+        costs[key] = round(seconds, 3)
+        remaining = max(remaining - expected[i], 0)
+        print(f'  computed {name}{p} in {seconds:.1f} s '
+              f'(ETA ~{remaining / jobs / 60:.1f} min)', flush=True)
+
+    groups, unresolved = evaluate_deferred(_compute_group, pending, budget, retry_budget, jobs,
+                                           order=sorted(range(len(pending)), key=lambda i: -expected[i]),
+                                           on_result=landed, label=lambda job: f'{job[0]}{job[1]}')
+    for i, _ in unresolved:
+        print(f'  {pending[i][0]}{pending[i][1]} left out of the cache (render() keeps its on-disk '
+              f'group)', flush=True)
+    return groups
+
+
+def compute_cache(only=None, jobs=1, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
     # --only reuses the previous run's cached groups for every distribution not named, instead
     # of recomputing everything: DoublyNoncentralBeta[2,2,1200,1200] alone costs ~65 minutes
     # (issue #1149) via dncbeta_cdf/dncbeta_pdf, which every --emit paid unconditionally even
@@ -2587,24 +2861,47 @@ def compute_cache(only=None):
             # See solutions/tooling/2026-07-26-2200-precision-refs-only-flag-cache-scope-not-compute-scope.md
             print(f'  --only given but no cache at {CACHE} yet; computing everything', flush=True)
 
-    cache = []
+    costs = load_costs()
+    slots = []
+    pending = []
     for name, sets in PARAM_SETS.items():
         cached = prev_by_name.get(name)
         if only and name not in only and cached is not None and len(cached) == len(sets):
-            cache.extend(cached)
+            slots.extend(cached)
             print(f'  reused cached {name} ({len(cached)} sets)', flush=True)
             continue
         for p in sets:
-            pts = []
-            for x in xvalues(name, p):
-                print(f'    computing {name}{p} at x={x}...', flush=True)
-                pts.append([num(x), num(pdf(name, p, x)), num(cdf(name, p, x))])
-            cache.append({'name': name, 'params': p, 'points': pts})
-            print(f'  computed {name}{p}', flush=True)
+            slots.append(len(pending))
+            pending.append((name, p))
+    groups = run_jobs(pending, costs, jobs, budget, retry_budget)
+    cache = [groups[slot] if isinstance(slot, int) else slot for slot in slots]
+    cache = [g for g in cache if g is not None]
+    save_costs(costs)
     with open(CACHE, 'w') as fh:
         json.dump(cache, fh)
     print(f'cached {len(cache)} groups to {CACHE}', flush=True)
-    return cache
+    if CERTIFY:
+        report_certification([groups[slot] for slot in slots if isinstance(slot, int) and groups[slot]])
+    return cache, [pending[i] for i, group in enumerate(groups) if group is None]
+
+
+def report_certification(groups):
+    # --certify's summary over the groups computed this run, every record also written to CERTIFY_OUT.
+    records = [dict(r, name=g['name'], params=g['params']) for g in groups for r in g.get('certify', [])]
+    counts = Counter(r['status'] for r in records)
+    print(f'certify: {counts["certified"]} certified, {counts["corrected"]} corrected, '
+          f'{counts["uncertified"]} uncertified of {len(records)} references with an interval form '
+          f'(IV_REF)', flush=True)
+    for r in records:
+        if r['status'] == 'corrected':
+            print(f'  CORRECTED {r["name"]}{r["params"]} {r["method"]} x={r["x"]}: {r["mp_literal"]} -> '
+                  f'{r["literal"]} (certified at {r["prec"]} bits)', flush=True)
+        elif r['status'] == 'uncertified':
+            print(f'  UNCERTIFIED {r["name"]}{r["params"]} {r["method"]} x={r["x"]}: {r["mp_literal"]} kept -- '
+                  f'no single float64 by {CERTIFY_MAX_PREC} bits', flush=True)
+    with open(CERTIFY_OUT, 'w') as fh:
+        json.dump(records, fh, indent=1)
+    print(f'wrote {CERTIFY_OUT}', flush=True)
 
 
 OUTPUT_PATH = 'test/precision-continuous.js'
@@ -2744,8 +3041,11 @@ def render(cache, allow_prune=False):
     print(f'wrote {OUTPUT_PATH} with {len(groups)} groups', flush=True)
 
 
-def emit(only=None, allow_prune=False):
-    render(compute_cache(only), allow_prune)
+def emit(only=None, allow_prune=False, jobs=1, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
+    # Returns the (name, params) groups left unresolved, whose stale on-disk group render() kept.
+    cache, unresolved = compute_cache(only, jobs, budget, retry_budget)
+    render(cache, allow_prune)
+    return unresolved
 
 
 TEMPLATE = '''/* eslint-disable no-loss-of-precision */
@@ -2836,7 +3136,25 @@ if __name__ == '__main__':
         if '--only' in sys.argv:
             idx = sys.argv.index('--only')
             emit_only = set(sys.argv[idx + 1].split(','))
-        emit(emit_only, allow_prune)
+        def flag_value(name, default, cast):
+            return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+        # Module-level, so forked --jobs workers see it too.
+        CERTIFY = '--certify' in sys.argv
+        profile = '--profile' in sys.argv
+        if profile:
+            # Serial, so every evaluation's record lands in this process and its wall time isn't
+            # inflated by sibling workers competing for the same cores.
+            enable_profiling(globals())
+        unresolved = emit(emit_only, allow_prune, 1 if profile else flag_value('--jobs', 1, int),
+                          flag_value('--point-budget', DEFAULT_POINT_BUDGET, float),
+                          flag_value('--retry-budget', None, float))
+        if profile:
+            disable_profiling().write(flag_value('--profile-out', PROFILE_OUT, str))
+        if unresolved:
+            # Non-zero, so a caller gating on --emit can't mistake the kept stale groups for fresh ones.
+            sys.exit(f'{len(unresolved)} group(s) unresolved, their previous references kept: '
+                     + ', '.join(f'{name}{p}' for name, p in unresolved))
     elif len(sys.argv) > 1 and sys.argv[1] == '--render':
         # Fast re-render from the cached mpmath values (no recomputation) after editing tolerances.
         with open(CACHE) as fh:
@@ -2846,4 +3164,7 @@ if __name__ == '__main__':
         if '--only' in sys.argv:
             idx = sys.argv.index('--only')
             only = set(sys.argv[idx + 1].split(','))
-        self_check(only)
+        cases_json = sys.argv[sys.argv.index('--cases-json') + 1] if '--cases-json' in sys.argv else None
+        # Non-zero on any mismatch, like the special/summary-stats --check, so a caller can gate
+        # --emit on it.
+        sys.exit(1 if self_check(only, cases_json) else 0)
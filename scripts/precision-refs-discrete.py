@@ -13,11 +13,22 @@ from that file and aborts on any mismatch > 1e-12, guarding against parameteriza
 
 Requires: pip install mpmath
 Usage:    python3 scripts/precision-refs-discrete.py   # rewrites test/precision-discrete.js
+          python3 scripts/precision-refs-discrete.py --profile [--profile-out PATH]
+              # also writes per-evaluation wall time, mpmath primitive counts and series term
+              # counts to /tmp/precision-discrete-profile.json, with a top-N summary on stderr
+          python3 scripts/precision-refs-discrete.py --point-budget 120 --retry-budget 3600
+              # defer any point whose pmf or cdf overruns 120 s (default DEFAULT_POINT_BUDGET),
+              # then retry the deferred ones at the end with 3600 s (default: no budget); aborts
+              # without writing if a point is still unresolved
 """
 import json
 import sys
-from mpmath import (mp, mpf, exp, log, factorial, binomial, gamma, beta, zeta,
-                    besseli, power, fsum)
+from mpmath import (mp, mpf, exp, log, factorial, binomial, gamma, beta,
+                    besseli, power, fsum, nsum)
+
+from ref_normalizers import normalizer
+from ref_profile import disable_profiling, enable_profiling, profiled
+from ref_watchdog import budget_flags, evaluate_deferred, watchdog
 
 mp.dps = 50
 
@@ -52,15 +63,7 @@ def pmf(name, p, k):
         return w[k - offset] / fsum(w)
     if name == 'ConwayMaxwellPoisson':
         lam, nu = mpf(p[0]), mpf(p[1])
-        z = mpf(0)
-        j = 0
-        while True:
-            term = power(lam, j) / power(factorial(j), nu)
-            z += term
-            if j > 5 and term < mpf('1e-60') * z:
-                break
-            j += 1
-        return power(lam, k) / power(factorial(k), nu) / z
+        return power(lam, k) / power(factorial(k), nu) / normalizer(name, p)
     if name == 'Delaporte':
         a, b, lam = mpf(p[0]), mpf(p[1]), mpf(p[2])
         return fsum(
@@ -96,7 +99,7 @@ def pmf(name, p, k):
         return binomial(K, k) * binomial(N - K, n - k) / binomial(N, n)
     if name == 'LogSeries':
         pp = mpf(p[0])
-        return -1 / log(1 - pp) * power(pp, k) / k
+        return power(pp, k) / k / normalizer(name, p)
     if name == 'NegativeHypergeometric':
         N, K, r = int(p[0]), int(p[1]), int(p[2])
         return binomial(k + r - 1, k) * binomial(N - r - k, K - k) / binomial(N, K)
@@ -138,13 +141,13 @@ def pmf(name, p, k):
         return rho * beta(mpf(k), rho + 1)
     if name == 'Zeta':
         s = mpf(p[0])
-        return power(k, -s) / zeta(s)
+        return power(k, -s) / normalizer(name, p)
     if name == 'Zipf':
-        s, N = mpf(p[0]), int(p[1])
-        return power(k, -s) / fsum(power(i, -s) for i in range(1, N + 1))
+        s = mpf(p[0])
+        return power(k, -s) / normalizer(name, p)
     if name == 'ZipfMandelbrot':
-        N, s, q = int(p[0]), mpf(p[1]), mpf(p[2])
-        return power(k + q, -s) / fsum(power(i + q, -s) for i in range(1, N + 1))
+        s, q = mpf(p[1]), mpf(p[2])
+        return power(k + q, -s) / normalizer(name, p)
     raise ValueError(name)
 
 
@@ -186,10 +189,60 @@ def step(name):
     return 2 if name in ('HeadsMinusTails', 'Rademacher') else 1
 
 
+# pmf(k + st) / pmf(k) for the distributions whose closed form is a run of factorials,
+# binomials or beta functions -- one rational update per step instead of re-evaluating them
+# from scratch. Anything absent here (series-defined or Bessel-based pmfs, whose upward
+# recurrences are unstable or nonexistent) is walked with a direct pmf() call per step.
+def _ratio_beta_binomial(p, k):
+    n, a, b = map(mpf, p)
+    return mpf(0) if k >= n else (n - k) / (k + 1) * (k + a) / (n - k - 1 + b)
+
+
+def _ratio_neg_hypergeometric(p, k):
+    N, K, r = int(p[0]), int(p[1]), int(p[2])
+    return mpf(0) if k >= K else mpf((k + r) * (K - k)) / ((k + 1) * (N - r - k))
+
+
+RATIO = {
+    'BetaBinomial': _ratio_beta_binomial,
+    'Binomial': lambda p, k: (mpf(p[0]) - k) / (k + 1) * mpf(p[1]) / (1 - mpf(p[1])),
+    'FlorySchulz': lambda p, k: mpf(k + 1) / k * (1 - mpf(p[0])),
+    'Geometric': lambda p, k: 1 - mpf(p[0]),
+    'Hypergeometric': lambda p, k: mpf((int(p[1]) - k) * (int(p[2]) - k))
+    / ((k + 1) * (int(p[0]) - int(p[1]) - int(p[2]) + k + 1)),
+    'LogSeries': lambda p, k: mpf(p[0]) * k / (k + 1),
+    'NegativeBinomial': lambda p, k: (k + mpf(p[0])) / (k + 1) * mpf(p[1]),
+    'NegativeHypergeometric': _ratio_neg_hypergeometric,
+    'Poisson': lambda p, k: mpf(p[0]) / (k + 1),
+    'YuleSimon': lambda p, k: mpf(k) / (k + mpf(p[0]) + 1),
+}
+
+# Per-(name, params) cumulative tables: [(pmf, cdf) at lo, at lo + st, ...], so the next k to
+# walk is lo + len(table) * st. Every probe k of a parameter set used to re-sum its whole prefix
+# from scratch -- O(k^2) pmf calls per set, which dominated the run for the large-k Skellam sets;
+# the table walks the support once, up to the largest k requested so far, and extends from where
+# it stopped when a later probe reaches further.
+_CDF_TABLES = {}
+
+
 def cdf(name, p, k):
     lo = support_lo(name, p)
     st = step(name)
-    return fsum(pmf(name, p, j) for j in range(lo, k + 1, st))
+    if k < lo:
+        return mpf(0)
+    table = _CDF_TABLES.setdefault((name, json.dumps(p)), [])
+    ratio = RATIO.get(name)
+    while lo + len(table) * st <= k:
+        j = lo + len(table) * st
+        f = pmf(name, p, j) if ratio is None or not table else table[-1][0] * ratio(p, j - st)
+        # Accumulated 10 digits past mp.dps, so the running sum stays as exact as the fsum()
+        # over the whole prefix it replaces (which rounded once, at the end).
+        with mp.workdps(mp.dps + 10):
+            total = (table[-1][1] if table else 0) + f
+        # One append per step: a watchdog timeout between two updates can't leave the walk
+        # half-advanced for the deferred retry to resume from.
+        table.append((f, total))
+    return +table[(k - lo) // st][1]
 
 
 # --- self-check against external refVals already vetted in dist-cases-discrete.js ---
@@ -392,33 +445,52 @@ TOL_OVERRIDE = {
 }
 
 
+# --- self-check: every RATIO recurrence reproduces its closed-form pmf ---
+# A wrong recurrence would silently corrupt every cdf literal of its distribution while leaving
+# the pmf literals (always closed-form) intact, so walk each one over its own SPEC grids first.
+
+for name, sets, _ in SPEC:
+    if name not in RATIO:
+        continue
+    for p, ks in sets:
+        lo = support_lo(name, p)
+        f = pmf(name, p, lo)
+        for j in range(lo, max(ks) + 1):
+            if j > lo:
+                f *= RATIO[name](p, j - 1)
+            want = pmf(name, p, j)
+            if abs(f - want) > mpf('1e-40') * abs(want):
+                sys.exit(f'Aborting: RATIO[{name!r}] recurrence at {p} k={j} gives {f}, pmf() {want}.')
+print(f'self-check: {len(RATIO)} pmf ratio recurrences match their closed forms', file=sys.stderr)
+
+# --- self-check: the tail-bounded Conway-Maxwell-Poisson normalizer against mpmath's nsum ---
+
+for p, _ in next(sets for name, sets, _ in SPEC if name == 'ConwayMaxwellPoisson'):
+    z = normalizer('ConwayMaxwellPoisson', p)
+    want = nsum(lambda j: power(p[0], j) / power(factorial(j), p[1]), [0, mp.inf])
+    if abs(z - want) > mpf('1e-40') * want:
+        sys.exit(f'Aborting: ConwayMaxwellPoisson normalizer at {p} gives {z}, nsum {want}.')
+print('self-check: ConwayMaxwellPoisson normalizers match nsum', file=sys.stderr)
+
+
 def num(x):
     # Shortest decimal that round-trips to the nearest float64 -- avoids ESLint's
     # no-loss-of-precision rule while still pinning the exact double the test compares against.
     return repr(float(x))
 
 
-def emit_point(name, p, k):
-    f = pmf(name, p, k)
-    c = cdf(name, p, k)
+def emit_point(name, p, k, seconds=None):
+    with watchdog(seconds), profiled(name, p, 'pmf', k):
+        f = pmf(name, p, k)
+    with watchdog(seconds), profiled(name, p, 'cdf', k):
+        c = cdf(name, p, k)
     qp = c - f / 2          # midpoint of the k-th step (strictly inside) -> infimum quantile is k
     return f'{{ k: {k}, pmf: {num(f)}, cdf: {num(c)}, qp: {num(qp)} }}'
 
 
-groups = []
-for name, sets, tol in SPEC:
-    for p, ks in sets:
-        override = TOL_OVERRIDE.get((name, json.dumps(p)))
-        t, note = override if override else (tol, None)
-        pts = ',\n      '.join(emit_point(name, p, k) for k in ks)
-        comment = f"  // {name}{json.dumps(p)}: {note}\n" if note else ''
-        groups.append(
-            f"{comment}  {{\n    name: '{name}',\n    params: {json.dumps(p)},\n    tol: {t:g},\n"
-            f"    points: [\n      {pts}\n    ]\n  }}")
-
-DATA = '[\n' + ',\n'.join(groups) + '\n]'
+PROFILE_OUT = '/tmp/precision-discrete-profile.json'
 
-OUT = '''/* eslint-disable no-loss-of-precision */
+TEMPLATE = '''/* eslint-disable no-loss-of-precision */
 // Reference literals are exact shortest-round-trip float64 values emitted by the generator.
 // ESLint's no-loss-of-precision rule false-positives on a few 17-significant-digit literals
 // that do round-trip exactly, so it is disabled for this generated reference file.
@@ -477,8 +549,42 @@ describe('discrete-distribution precision gate', () => {{
     }})
   }})
 }})
-'''.format(data=DATA)
-
-with open('test/precision-discrete.js', 'w') as fh:
-    fh.write(OUT)
-print(f'wrote test/precision-discrete.js with {len(groups)} groups', file=sys.stderr)
+'''
+
+
+def _emit_job(job, seconds):
+    return emit_point(*job, seconds)
+
+
+def main():
+    if '--profile' in sys.argv:
+        enable_profiling(globals())
+    jobs = [(name, p, k) for name, sets, _ in SPEC for p, ks in sets for k in ks]
+    lines, unresolved = evaluate_deferred(_emit_job, jobs, *budget_flags(),
+                                          label=lambda job: f'{job[0]}{json.dumps(job[1])} k={job[2]}')
+    profiler = disable_profiling()
+    if profiler:
+        profiler.write(sys.argv[sys.argv.index('--profile-out') + 1] if '--profile-out' in sys.argv
+                       else PROFILE_OUT)
+    if unresolved:
+        sys.exit(f'Aborting: {len(unresolved)} point(s) unresolved; test/precision-discrete.js '
+                 f'left unchanged.')
+    lines = iter(lines)
+    groups = []
+    for name, sets, tol in SPEC:
+        for p, ks in sets:
+            override = TOL_OVERRIDE.get((name, json.dumps(p)))
+            t, note = override if override else (tol, None)
+            pts = ',\n      '.join(next(lines) for _ in ks)
+            comment = f"  // {name}{json.dumps(p)}: {note}\n" if note else ''
+            groups.append(
+                f"{comment}  {{\n    name: '{name}',\n    params: {json.dumps(p)},\n    tol: {t:g},\n"
+                f"    points: [\n      {pts}\n    ]\n  }}")
+    data = '[\n' + ',\n'.join(groups) + '\n]'
+    with open('test/precision-discrete.js', 'w') as fh:
+        fh.write(TEMPLATE.format(data=data))
+    print(f'wrote test/precision-discrete.js with {len(groups)} groups', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,21 +21,37 @@ already vetted in test/process.js and aborts on any mismatch, guarding against a
 parameterization slip silently baking a wrong convention into every emitted literal.
 
 Requires: pip install mpmath
-Usage:    python3 scripts/precision-refs-process.py            # recompute everything (~7 min)
-          python3 scripts/precision-refs-process.py --render   # re-emit from cache, no recompute
-
-CompoundPoisson dominates the runtime: locating each probe means bisecting a CDF that is
-itself a Poisson-weighted sum of ~100 regularized incomplete gammas at mp.dps = 50. Every run
+Usage:    python3 scripts/precision-refs-process.py             # recompute everything (~90 s)
+          python3 scripts/precision-refs-process.py --jobs 8    # same, cache misses on 8 workers
+          python3 scripts/precision-refs-process.py --render    # re-emit from cache, no recompute
+          python3 scripts/precision-refs-process.py --profile [--profile-out PATH]
+              # recompute serially, writing per-evaluation wall time, mpmath primitive counts and
+              # series term counts to /tmp/precision-process-profile.json (top-N on stderr)
+          python3 scripts/precision-refs-process.py --point-budget 120 --retry-budget 3600
+              # defer any (params, t) triple whose single probe inversion, pdf or cdf overruns
+              # 120 s (default DEFAULT_POINT_BUDGET), then retry the deferred ones at the end with
+              # 3600 s (default: no budget); aborts without writing if one is still unresolved
+
+CompoundPoisson dominates the runtime: locating each probe means root-finding on a CDF that is
+itself a Poisson-weighted sum of ~100 regularized incomplete gammas at mp.dps = 50 (solve()
+keeps that to about a dozen evaluations per probe by seeding from a float64 estimate, so the
+probes themselves now take ~8 s and the self-check's quadratures the rest). Every run
 caches its computed points to /tmp/precision-process-cache.json, and --render rebuilds the
 test file from that cache alone -- enough for a tolerance or template edit, which is the
-common reason to re-run this. Points absent from the cache are always recomputed.
+common reason to re-run this. Points absent from the cache are always recomputed; with
+--jobs N, fill_cache() spreads those misses over N worker processes, costliest first.
 """
 import json
+import math
 import os
 import sys
+from statistics import NormalDist
 from mpmath import (mp, mpf, exp, expm1, log, sqrt, pi, erfc, power, factorial,
                     binomial, loggamma, gammainc, quad)
 
+from ref_profile import disable_profiling, enable_profiling, profile_terms, profiled
+from ref_watchdog import DEFAULT_POINT_BUDGET, budget_flags, evaluate_deferred, watchdog
+
 mp.dps = 50
 
 HALF = mpf(1) / 2
@@ -61,9 +77,10 @@ def norm_cdf(x, m, s):
 
 
 def norm_q(p, m, s):
-    # Bisection on the exact CDF: no dependence on an inverse-erf implementation, and at
-    # mp.dps = 50 the bracket below is squeezed to ~1e-60 relative, far past float64.
-    return m + s * bisect(lambda z: norm_cdf(z, mpf(0), mpf(1)), mpf(-40), mpf(40), p)
+    # Root-found on the exact CDF, so the result never depends on an inverse-erf implementation:
+    # the float64 inverse only seeds the bracket, and solve() refines to the working precision.
+    z0 = NormalDist().inv_cdf(float(p))
+    return m + s * solve(lambda z: norm_cdf(z, mpf(0), mpf(1)), p, z0, 1e-10 * (1 + abs(z0)))
 
 
 def lognorm_pdf(x, m, s):
@@ -100,10 +117,17 @@ def gamma_cdf(x, alpha, scale):
     return gammainc(alpha, 0, x / scale, regularized=True)
 
 
+def _wilson_hilferty(p, shape, scale):
+    # Float64 seed for a Gamma quantile: the cube root of a Gamma variate is close to normal
+    # (Wilson & Hilferty, 1931). A few parts in 1e3 at the shapes used here -- only a seed.
+    c = 1 / (9 * shape)
+    z = NormalDist().inv_cdf(float(p))
+    return shape * scale * max(1 - c + z * math.sqrt(c), 1e-3) ** 3
+
+
 def gamma_q(p, alpha, scale):
-    # Bracket generously in units of the mean (alpha*scale); the shapes used here are all
-    # alpha >= 2, so p = 0.9 never reaches 20 means.
-    return bisect(lambda z: gamma_cdf(z, alpha, scale), mpf(0), 40 * alpha * scale, p)
+    x0 = _wilson_hilferty(p, float(alpha), float(scale))
+    return solve(lambda z: gamma_cdf(z, alpha, scale), p, x0, 1e-2 * x0, lo=mpf(0))
 
 
 def pois_pmf(k, lam):
@@ -158,12 +182,15 @@ def _cpg_terms(lam, a, b, y, term_fn):
         term = pois_pmf(n, lam) * term_fn(n)
         total += term
         # Terms peak near n = lam; only start testing for convergence past the peak, or the
-        # first few (still-growing) terms would trip the threshold immediately.
-        if n > lam + 5 and term < total * mpf('1e-55'):
+        # first few (still-growing) terms would trip the threshold immediately. <=, not <: at
+        # y = 0 every term and the total are exactly 0, and a strict test never fires there,
+        # running the full 100000 gammainc calls to reproduce the bare exp(-lam) atom.
+        if n > lam + 5 and term <= total * mpf('1e-55'):
             break
         n += 1
         if n > 100000:
             break
+    profile_terms(n)
     return total
 
 
@@ -186,21 +213,75 @@ def cpg_cdf(y, lam, a, b):
 
 def cpg_q(p, lam, a, b):
     # Every probe level used here exceeds the atom exp(-lam), so the quantile lies strictly
-    # inside the continuous part and the bracket may start just above 0.
-    mean = lam * a / b
-    return bisect(lambda z: cpg_cdf(z, lam, a, b), mpf(0), 60 * mean + 60, p)
-
-
-def bisect(cdf, lo, hi, p):
-    # 300 halvings of an O(1)-wide bracket lands ~1e-90, well inside mp.dps = 50's working
-    # precision, so the returned x is exact to every digit the emitted float64 can hold.
-    for _ in range(300):
-        mid = (lo + hi) / 2
-        if cdf(mid) < p:
-            lo = mid
+    # inside the continuous part and the bracket may start just above 0. Seeded from the
+    # two-moment Gamma fit (mean lam*a/b, variance lam*a*(a+1)/b^2), which is all the float64
+    # seed has to get roughly right -- each CDF evaluation here is a ~100-term gammainc
+    # mixture, so the point is to spend a dozen of them, not 300.
+    mean, var = float(lam * a / b), float(lam * a * (a + 1) / (b * b))
+    x0 = _wilson_hilferty(p, mean * mean / var, var / mean)
+    return solve(lambda z: cpg_cdf(z, lam, a, b), p, x0, 0.1 * math.sqrt(var), lo=mpf(0))
+
+
+def solve(cdf, p, x0, step, lo=None):
+    """Root of cdf(x) = p, seeded from a float64 estimate x0.
+
+    Brackets [x0 - step, x0 + step] (clamped at lo, where cdf(lo) = 0 < p), doubling the step on
+    whichever side has not yet crossed p, then runs Brent's method (Brent, 1973, ch. 4): inverse
+    quadratic / secant steps, each accepted only while it keeps shrinking faster than bisection
+    would and falling back to a bisection step otherwise, so it can never stall. Stops once the
+    bracket is 1e-40 relative wide -- 24 digits past anything float64 can hold, at about a dozen
+    CDF evaluations where a fixed 300-step bisection from a coarse bracket used to spend 300."""
+    x0, step = mpf(x0), mpf(step)
+    a, b = x0 - step, x0 + step
+    if lo is not None and a <= lo:
+        a = lo
+    fa, fb = cdf(a) - p, cdf(b) - p
+    while fa >= 0:
+        b, fb = a, fa
+        step *= 2
+        a = x0 - step
+        if lo is not None and a <= lo:
+            a = lo
+        fa = cdf(a) - p
+    while fb < 0:
+        a, fa = b, fb
+        step *= 2
+        b = x0 + step
+        fb = cdf(b) - p
+    eps = mpf(10) ** (10 - mp.dps)
+    c, fc = b, fb
+    d = e = b - a
+    while True:
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = eps * abs(b) + mpf(10) ** (-90)
+        xm = (c - b) / 2
+        if abs(xm) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                pp, q = 2 * xm * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                pp = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if pp > 0:
+                q = -q
+            pp = abs(pp)
+            if 2 * pp < min(3 * xm * q - abs(tol * q), abs(e * q)):
+                e, d = d, pp / q
+            else:
+                d = e = xm
         else:
-            hi = mid
-    return (lo + hi) / 2
+            d = e = xm
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if xm > 0 else -tol)
+        fb = cdf(b) - p
 
 
 # --- process marginals -------------------------------------------------------------------
@@ -382,7 +463,12 @@ def check_cpg(params, t):
     total = law_cdf(law, 200 * lam * a / b)
     if abs(total - 1) > mpf('1e-30'):
         failures.append(f'cdf(inf) {total} != 1')
-    mean = quad(lambda y: y * law_pdf(law, y), [0, lam * a / b, 200 * lam * a / b])
+    # The mean is only checked to 1e-20, so its quadrature runs at 30 digits and stops at 40
+    # means (the truncated tail is below 1e-30 of the mean for every shape used here): the
+    # mixture pdf gets more expensive the further out it is evaluated, and this quad used to
+    # cost more than every probe of the emitted file put together.
+    with mp.workdps(30):
+        mean = quad(lambda y: y * law_pdf(law, y), [0, lam * a / b, 40 * lam * a / b])
     if abs(mean / (lam * a / b) - 1) > mpf('1e-20'):
         failures.append(f'mean {mean} != lambda*t*a/b {lam * a / b}')
     return failures
@@ -489,12 +575,13 @@ def num(x):
     return repr(float(x))
 
 
-def points_for(name, params, t):
+def points_for(name, params, t, seconds=None):
     law = marginal(name, params, t)
     out = []
     seen = set()
     for p in PLEVELS:
-        x = law_q(law, p)
+        with watchdog(seconds), profiled(name, (params, t), 'q', num(p)):
+            x = law_q(law, p)
         # Poisson and RandomWalk are discrete: distinct p-levels can select the same lattice
         # point when the spread is small, so collapse duplicates rather than asserting twice.
         if law[0] in DISCRETE:
@@ -512,9 +599,12 @@ def points_for(name, params, t):
             xs, lattice = mpf(float(x)), False
         # Cached as plain numbers, never as the rendered line: Python's float repr round-trips
         # exactly through JSON, so a formatting or tolerance change re-renders from cache
-        # instead of re-paying the CompoundPoisson bisection.
-        out.append({'t': t, 'x': float(xs), 'lattice': lattice,
-                    'pdf': float(law_pdf(law, xs)), 'cdf': float(law_cdf(law, xs))})
+        # instead of re-paying the CompoundPoisson root-finding.
+        with watchdog(seconds), profiled(name, (params, t), 'pdf', float(xs)):
+            pdf = float(law_pdf(law, xs))
+        with watchdog(seconds), profiled(name, (params, t), 'cdf', float(xs)):
+            cdf = float(law_cdf(law, xs))
+        out.append({'t': t, 'x': float(xs), 'lattice': lattice, 'pdf': pdf, 'cdf': cdf})
     return out
 
 
@@ -523,8 +613,38 @@ def render_point(pt):
     return (f'{{ t: {json.dumps(pt["t"])}, x: {x}, '
             f'pdf: {num(pt["pdf"])}, cdf: {num(pt["cdf"])} }}')
 
-
 CACHE = '/tmp/precision-process-cache.json'
+PROFILE_OUT = '/tmp/precision-process-profile.json'
+
+# Dispatch order for fill_cache(): CompoundPoisson's mixture root-finding dwarfs everything
+# else, CoxIngersollRoss's incomplete-gamma inversion comes next, the closed-form Gaussian and
+# lattice laws finish instantly. Starting the long jobs first keeps a pool's wall time close to
+# the single slowest (params, t) triple instead of leaving one straggler running alone at the end.
+_COST_RANK = {'CompoundPoisson': 0, 'CoxIngersollRoss': 1}
+
+
+def _cache_key(name, params, t):
+    return f'{name}|{json.dumps(params)}|{json.dumps(t)}'
+
+
+def _points_for_job(job, seconds):
+    return points_for(*job, seconds)
+
+
+def fill_cache(cache, jobs, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
+    """Computes every (name, params, t) absent from `cache` -- on a pool of `jobs` processes when
+    jobs > 1 -- under evaluate_deferred()'s watchdog, merging the results back by key, and returns
+    the keys left unresolved. build_groups() then only reads the cache, so the rendered file is
+    byte-identical to the serial path whatever order the workers finish in."""
+    missing = [(name, params, t) for name, sets, _ in SPEC for params, times in sets for t in times
+               if _cache_key(name, params, t) not in cache]
+    missing.sort(key=lambda job: _COST_RANK.get(job[0], 2))
+    computed, unresolved = evaluate_deferred(_points_for_job, missing, budget, retry_budget, jobs,
+                                             label=lambda job: _cache_key(*job))
+    for job, pts in zip(missing, computed):
+        if pts is not None:
+            cache[_cache_key(*job)] = pts
+    return [_cache_key(*missing[i]) for i, _ in unresolved]
 
 
 def build_groups(cache):
@@ -535,7 +655,7 @@ def build_groups(cache):
                                                       (None, None, None))
             pts = []
             for t in times:
-                key = f'{name}|{json.dumps(params)}|{json.dumps(t)}'
+                key = _cache_key(name, params, t)
                 if key not in cache:
                     cache[key] = points_for(name, params, t)
                 pts.extend(render_point(pt) for pt in cache[key])
@@ -649,6 +769,7 @@ describe('stochastic-process precision gate', () => {{
 if __name__ == '__main__':
     render_only = '--render' in sys.argv
     cache = {}
+    unresolved = []
     if render_only:
         if not os.path.exists(CACHE):
             sys.exit(f'--render needs {CACHE}; run without it once to populate the cache.')
@@ -658,6 +779,22 @@ if __name__ == '__main__':
         # The self-check re-derives every law from scratch, so it is the recompute path's
         # guard; --render trusts the cache the earlier full run already validated.
         self_check()
+        jobs = int(sys.argv[sys.argv.index('--jobs') + 1]) if '--jobs' in sys.argv else 1
+        if '--profile' in sys.argv:
+            # Serial, so every evaluation's record lands in this process.
+            enable_profiling(globals())
+            jobs = 1
+        unresolved = fill_cache(cache, jobs, *budget_flags())
+        profiler = disable_profiling()
+        if profiler:
+            profiler.write(sys.argv[sys.argv.index('--profile-out') + 1] if '--profile-out' in sys.argv
+                           else PROFILE_OUT)
+    if unresolved:
+        # Everything that did resolve is cached, so a --render rerun recomputes only these.
+        with open(CACHE, 'w') as fh:
+            json.dump(cache, fh)
+        sys.exit(f'Aborting: {len(unresolved)} (params, t) triple(s) unresolved; '
+                 f'test/precision-process.js left unchanged.')
     groups = build_groups(cache)
     with open(CACHE, 'w') as fh:
         json.dump(cache, fh)
@@ -30,8 +30,13 @@ asymptotic expansions) -- per CLAUDE.md, the test must never share a formula wit
 production code it's checking.
 
 Requires: pip install mpmath (already in scripts/requirements.txt)
-Usage: python3 scripts/precision-refs-special.py --check   # report mismatches only
-       python3 scripts/precision-refs-special.py --emit    # write test/precision-special.js
+Usage: python3 scripts/precision-refs-special.py --check            # report mismatches only
+       python3 scripts/precision-refs-special.py --emit             # write test/precision-special.js
+       python3 scripts/precision-refs-special.py --emit --jobs 8    # same, computing references on 8 worker processes
+       python3 scripts/precision-refs-special.py --check --profile  # also profile the references, computed serially
+       python3 scripts/precision-refs-special.py --check --point-budget 120 --retry-budget 3600
+           # defer any reference overrunning 120 s (default DEFAULT_POINT_BUDGET), retry the deferred
+           # ones at the end with 3600 s (default: no budget); one still unresolved fails the run
 """
 import json
 import os
@@ -41,11 +46,15 @@ import sys
 from mpmath import mp, mpf, pi, sqrt, exp, log, besseli, besselk
 from mpmath import digamma as mp_digamma
 
+from ref_profile import disable_profiling, enable_profiling, profiled
+from ref_watchdog import DEFAULT_POINT_BUDGET, budget_flags, evaluate_deferred, watchdog
+
 mp.dps = 50
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_PATH = os.path.join(REPO_ROOT, 'test', 'precision-special.js')
 EVAL_SCRIPT = os.path.join(REPO_ROOT, 'scripts', 'eval-special.js')
+PROFILE_OUT = '/tmp/precision-special-profile.json'
 
 DEFAULT_TOL = 1e-13
 
@@ -393,12 +402,19 @@ def num(x):
         return '-Infinity'
     return repr(x)
 
+def _ref_point(point, seconds=None):
+    fn, args, _, _ = point
+    with watchdog(seconds), profiled(fn, args[:-1], 'ref', args[-1]):
+        return float(REF_FN[fn](*args))
+
 
-def compute_refs(points):
-    refs = []
-    for fn, args, note, tol in points:
-        val = REF_FN[fn](*args)
-        refs.append(float(val))
+def compute_refs(points, jobs=1, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
+    """float64 reference per point, in grid order, each under evaluate_deferred()'s watchdog -- None
+    for a point left unresolved, which check() counts against the run. With jobs > 1 the points
+    (all independent) are spread over a process pool; results are put back in input order, so
+    --check and --emit see the same list whatever the worker count."""
+    refs, _ = evaluate_deferred(_ref_point, points, budget, retry_budget, jobs,
+                                label=lambda point: f'{point[0]}{point[1]}')
     return refs
 
 
@@ -452,6 +468,7 @@ def _mismatch_message(fn, args, ref, value, tol, note):
 def check(points, refs, ranjs_values):
     bad = 0
     checked = 0
+    unresolved = 0
     withheld = 0
     for (fn, args, note, tol), ref, got in zip(points, refs, ranjs_values):
         reason = withheld_reason(fn, args)
@@ -459,6 +476,10 @@ def check(points, refs, ranjs_values):
             withheld += 1
             print(f'  WITHHELD {fn}{args}: {reason} ({note})', flush=True)
             continue
+        if ref is None:
+            print(f'  UNRESOLVED {fn}{args}: no reference within the watchdog budget ({note})', flush=True)
+            unresolved += 1
+            continue
         if 'error' in got:
             print(f'  ERROR {fn}{args}: {got["error"]}', flush=True)
             bad += 1
@@ -468,8 +489,9 @@ def check(points, refs, ranjs_values):
         if message:
             print(message, flush=True)
             bad += 1
-    print(f'Checked {checked} points, {bad} mismatches, {withheld} withheld', flush=True)
-    return bad
+    print(f'Checked {checked} points, {bad} mismatches, {withheld} withheld, {unresolved} unresolved',
+          flush=True)
+    return bad + unresolved
 
 
 TEMPLATE = """/* eslint-disable no-loss-of-precision */
@@ -534,13 +556,29 @@ def render(points, refs):
     print(f'Wrote {OUTPUT_PATH} ({len(lines)} points, {len(points) - len(lines)} withheld)', flush=True)
 
 
+def _jobs():
+    # --jobs N: worker processes for compute_refs() (default 1, i.e. in-process).
+    return int(sys.argv[sys.argv.index('--jobs') + 1]) if '--jobs' in sys.argv else 1
+
+
 def main():
     points = grid()
-    refs = compute_refs(points)
+    profile = '--profile' in sys.argv
+    if profile:
+        # Serial, so every evaluation's record lands in this process.
+        enable_profiling(globals())
+    refs = compute_refs(points, 1 if profile else _jobs(), *budget_flags())
+    if profile:
+        disable_profiling().write(sys.argv[sys.argv.index('--profile-out') + 1]
+                                  if '--profile-out' in sys.argv else PROFILE_OUT)
     ranjs_values = compute_ranjs_values(points)
     bad = check(points, refs, ranjs_values)
 
     if '--emit' in sys.argv:
+        if None in refs:
+            print(f'Refusing to emit: {refs.count(None)} reference(s) overran the watchdog budget -- '
+                  f'rerun with a larger --point-budget/--retry-budget.', flush=True)
+            sys.exit(1)
         if bad:
             print(f'Refusing to emit: {bad} mismatch(es) unresolved -- either the mechanism is '
                   f'understood (add a tol= override with a named-mechanism comment in grid()) or '
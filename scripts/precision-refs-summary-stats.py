@@ -35,9 +35,21 @@ already covered by the existing behavioral tests in test/dependence.js) -- bound
 NaN-producing edge cases stay in the behavioral test suite, matching the interior-point-only
 convention already used by precision-refs-continuous.py / -discrete.py.
 
+`--large` swaps the grid for an opt-in large-n tier (10^3-10^6 elements) that is check-only
+and never emitted: its arrays travel as {gen, seed, n, lo, hi} descriptors that this script and
+scripts/eval-summary-stats.js both expand with the same mulberry32 stream, and the bridge is
+run in chunks of LARGE_CHUNK points. It is gated out-of-band (npm run accuracy:summary-stats,
+scheduled in .github/workflows/difftest.yml), never by npm test.
+
 Requires: pip install mpmath (already in scripts/requirements.txt)
-Usage: python3 scripts/precision-refs-summary-stats.py --check   # report mismatches only
-       python3 scripts/precision-refs-summary-stats.py --emit    # write test/precision-summary-stats.js
+Usage: python3 scripts/precision-refs-summary-stats.py --check            # report mismatches only
+       python3 scripts/precision-refs-summary-stats.py --emit             # write test/precision-summary-stats.js
+       python3 scripts/precision-refs-summary-stats.py --emit --jobs 8    # same, computing references on 8 worker processes
+       python3 scripts/precision-refs-summary-stats.py --check --large    # large-n tier, check only
+       python3 scripts/precision-refs-summary-stats.py --check --profile  # also profile the references, computed serially
+       python3 scripts/precision-refs-summary-stats.py --check --point-budget 120 --retry-budget 3600
+           # defer any reference overrunning 120 s (default DEFAULT_POINT_BUDGET), retry the deferred
+           # ones at the end with 3600 s (default: no budget); one still unresolved fails the run
 """
 import json
 import math
@@ -45,15 +57,19 @@ import os
 import random
 import subprocess
 import sys
-from collections import Counter
+from fractions import Fraction
 
 from mpmath import mp, mpf, sqrt, log
 
+from ref_profile import disable_profiling, enable_profiling, profiled
+from ref_watchdog import DEFAULT_POINT_BUDGET, budget_flags, evaluate_deferred, watchdog
+
 mp.dps = 50
 
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_PATH = os.path.join(REPO_ROOT, 'test', 'precision-summary-stats.js')
 EVAL_SCRIPT = os.path.join(REPO_ROOT, 'scripts', 'eval-summary-stats.js')
+PROFILE_OUT = '/tmp/precision-summary-stats-profile.json'
 
 DEFAULT_TOL = 1e-14
 
@@ -64,7 +80,7 @@ DEFAULT_TOL = 1e-14
 # wide-range sample), the mean's own ~1e-16 rounding error is amplified by the division,
 # pushing relative error to ~2.7e-14 -- just past the 1e-14 default. skewness's cubed central
 # moment sum hits the same ~2.7e-14 ceiling from cancellation between same-magnitude terms of
-# opposite sign. Every other function here (including the O(n^2) distance-covariance and
+# opposite sign. Every other function here (including the distance-covariance and
 # tau-b/Somers'-D combinatorial ones) passes at the strict 1e-14 default with no override.
 _TOL_DIVISION_OR_CANCELLATION = 1e-13
 
@@ -75,13 +91,95 @@ def _mp(values):
     return [mpf(v) for v in values]
 
 
+# Exact backend for the rational-valued statistics. Every float64 sample value is a dyadic
+# rational, so sums, means, centered moments and co-moments are computed exactly in integer
+# arithmetic and returned as Fractions; mpf only enters for the final division, sqrt or power.
+
+def _dyadic_ints(values):
+    """(ints, e) with values[i] == ints[i] * 2**-e exactly -- every float64 is a dyadic
+    rational, so one common power-of-two scale turns the whole sample into integers."""
+    ratios = []
+    for v in values:
+        if float(v) != v:
+            raise ValueError(f'{v!r} is not exactly representable as a float64')
+        ratios.append(float(v).as_integer_ratio())
+    den = max(d for _, d in ratios)
+    return [num * (den // d) for num, d in ratios], den.bit_length() - 1
+
+
+def _mean_q(values):
+    ints, e = _dyadic_ints(values)
+    return Fraction(sum(ints), len(ints) << e)
+
+
+def _moment_q(values, k, c=None):
+    """(1/n) * sum_i (x_i - c)^k for integer k >= 0, exactly; c defaults to the sample mean,
+    in which case the sum is taken over the integers n*x_i - sum(x) to stay in Z."""
+    n = len(values)
+    if c is None:
+        ints, e = _dyadic_ints(values)
+        s = sum(ints)
+        return Fraction(sum((n * x - s) ** k for x in ints), n ** (k + 1) << (k * e))
+    ints, e = _dyadic_ints(list(values) + [c])
+    center = ints.pop()
+    return Fraction(sum((x - center) ** k for x in ints), n << (k * e))
+
+
+def _variance_q(values):
+    n = len(values)
+    return _moment_q(values, 2) * n / (n - 1)
+
+
+def _covariance_q(x, y):
+    n = len(x)
+    xs, ex = _dyadic_ints(x)
+    ys, ey = _dyadic_ints(y)
+    sx, sy = sum(xs), sum(ys)
+    total = sum((n * a - sx) * (n * b - sy) for a, b in zip(xs, ys))
+    return Fraction(total, (n * n * (n - 1)) << (ex + ey))
+
+
 def mean_ref(values):
-    v = _mp(values)
-    return sum(v) / len(v)
+    return mpf(_mean_q(values))
+
+
+# Order statistics: every sample array is sorted once, and its average-rank vector built once,
+# into a view shared by median/quantile/iqr/midhinge/qcd/trimean/yule/rank/spearman -- the grid
+# evaluates several of those against the very same array, one after the other. Only the last
+# _VIEW_LIMIT views are kept (two: spearman ranks a pair), so a --large run holds at most two
+# 10^6-element views rather than one per array it has ever seen.
+_ORDER_VIEWS = {}
+_VIEW_LIMIT = 2
+
+
+def _remember(cache, key, value):
+    # Oldest-first eviction: dicts keep insertion order.
+    while len(cache) >= _VIEW_LIMIT:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+
+def _order_view(values):
+    key = tuple(values)
+    if key not in _ORDER_VIEWS:
+        order = sorted(range(len(values)), key=values.__getitem__)
+        ranks = [None] * len(values)
+        start = 0
+        while start < len(order):
+            end = start
+            while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+                end += 1
+            # Ties share the average of the 1-based positions start+1 .. end+1.
+            avg = mpf(start + end + 2) / 2
+            for i in order[start:end + 1]:
+                ranks[i] = avg
+            start = end + 1
+        _remember(_ORDER_VIEWS, key, {'sorted': [mpf(values[i]) for i in order], 'ranks': ranks})
+    return _ORDER_VIEWS[key]
 
 
 def median_ref(values):
-    v = sorted(_mp(values))
+    v = _order_view(values)['sorted']
     n = len(v)
     if n % 2 == 1:
         return v[(n - 1) // 2]
@@ -89,7 +187,7 @@ def median_ref(values):
 
 
 def quantile_ref(values, p):
-    v = sorted(_mp(values))
+    v = _order_view(values)['sorted']
     n = len(v)
     h = (n - 1) * mpf(p)
     h0 = int(mp.floor(h))
@@ -99,10 +197,7 @@ def quantile_ref(values, p):
 
 
 def variance_ref(values):
-    v = _mp(values)
-    n = len(v)
-    m = mean_ref(values)
-    return sum((x - m) ** 2 for x in v) / (n - 1)
+    return mpf(_variance_q(values))
 
 
 def stdev_ref(values):
@@ -110,6 +205,8 @@ def stdev_ref(values):
 
 
 def moment_ref(values, k, c):
+    if k == int(k) and k >= 0:
+        return mpf(_moment_q(values, int(k), c))
     v = _mp(values)
     n = len(v)
     return sum((x - mpf(c)) ** mpf(k) for x in v) / n
@@ -172,30 +269,25 @@ def trimean_ref(values):
 
 
 def rank_ref(values, at):
-    v = values[at]
-    less = sum(1 for x in values if x < v)
-    equal = sum(1 for x in values if x == v)
-    return mpf(less) + mpf(equal + 1) / 2
+    return _order_view(values)['ranks'][at]
 
 
 def rank_full_ref(values):
-    return [rank_ref(values, i) for i in range(len(values))]
+    return list(_order_view(values)['ranks'])
 
 
 def skewness_ref(values):
     n = len(values)
-    m = mean_ref(values)
-    m2 = moment_ref(values, 2, m)
-    m3 = moment_ref(values, 3, m)
-    return sqrt(mpf(n * (n - 1))) * m3 / (mpf(n - 2) * m2 ** mpf('1.5'))
+    m2 = _moment_q(values, 2)
+    m3 = _moment_q(values, 3)
+    return sqrt(mpf(n * (n - 1))) * mpf(m3 / m2) / (mpf(n - 2) * sqrt(mpf(m2)))
 
 
 def kurtosis_ref(values):
     n = len(values)
-    m = mean_ref(values)
-    m2 = moment_ref(values, 2, m)
-    m4 = moment_ref(values, 4, m)
-    return mpf(n - 1) * (mpf(n + 1) * m4 / m2 ** 2 - 3 * mpf(n - 1)) / (mpf(n - 2) * mpf(n - 3))
+    m2 = _moment_q(values, 2)
+    m4 = _moment_q(values, 4)
+    return mpf((n - 1) * ((n + 1) * m4 / m2 ** 2 - 3 * (n - 1)) / ((n - 2) * (n - 3)))
 
 
 def yule_ref(values):
@@ -209,7 +301,7 @@ def cv_ref(values):
 
 
 def vmr_ref(values):
-    return variance_ref(values) / mean_ref(values)
+    return mpf(_variance_q(values) / _mean_q(values))
 
 
 def md_ref(values):
@@ -254,19 +346,83 @@ def _distance_matrix(x):
     return [[a[i][j] - row_mean[i] - row_mean[j] + grand_mean for j in range(n)] for i in range(n)]
 
 
-def dvar_ref(x):
+def _dcov_sq_quadratic(x, y):
+    """Squared (V-statistic) distance covariance from the two double-centered n x n distance
+    matrices. O(n^2) time and memory; kept as the cross-check for _dcov_sq()."""
     n = len(x)
     a = _distance_matrix(x)
-    total = sum(a[i][j] ** 2 for i in range(n) for j in range(n))
-    return sqrt(total / mpf(n * n))
+    b = _distance_matrix(y)
+    return sum(a[i][j] * b[i][j] for i in range(n) for j in range(n)) / mpf(n * n)
 
 
-def dcov_ref(x, y):
+def _distance_row_sums(v):
+    # a_i. = sum_j |v_i - v_j| for every i, from one sort and its prefix sums.
+    n = len(v)
+    order = sorted(range(n), key=v.__getitem__)
+    total = sum(v)
+    below = 0
+    sums = [0] * n
+    for k, i in enumerate(order):
+        sums[i] = v[i] * k - below + (total - below - v[i]) - v[i] * (n - 1 - k)
+        below += v[i]
+    return sums
+
+
+def _cross_distance_sum(x, y):
+    """sum over i != j of |x_i - x_j| * |y_i - y_j|. Walking the pairs in x order, each earlier
+    j contributes +-(x_i y_i - x_i y_j - x_j y_i + x_j y_j) with the sign of y_i - y_j, so four
+    Fenwick trees over the y ranks (counts and sums of y_j, x_j, x_j*y_j) give every i's share
+    in O(log n)."""
     n = len(x)
-    a = _distance_matrix(x)
-    b = _distance_matrix(y)
-    total = sum(a[i][j] * b[i][j] for i in range(n) for j in range(n))
-    return sqrt(total / mpf(n * n))
+    ranks = {v: r + 1 for r, v in enumerate(sorted(set(y)))}
+    trees = [[0] * (len(ranks) + 1) for _ in range(4)]
+    totals = [0] * 4
+
+    def prefix(r):
+        out = [0] * 4
+        while r > 0:
+            for t in range(4):
+                out[t] += trees[t][r]
+            r -= r & -r
+        return out
+
+    acc = 0
+    for i in sorted(range(n), key=lambda i: (x[i], y[i])):
+        r = ranks[y[i]]
+        lt, le = prefix(r - 1), prefix(r)
+        c, sy, sx, sxy = (lt[t] - (totals[t] - le[t]) for t in range(4))
+        acc += x[i] * y[i] * c - x[i] * sy - y[i] * sx + sxy
+        add = (1, y[i], x[i], x[i] * y[i])
+        for t in range(4):
+            totals[t] += add[t]
+        while r < len(trees[0]):
+            for t in range(4):
+                trees[t][r] += add[t]
+            r += r & -r
+    return 2 * acc
+
+
+def _dcov_sq(x, y):
+    """_dcov_sq_quadratic() in O(n log n) (Huo & Szekely 2016): expanding the double-centering
+    gives n^4 dCov^2 = n^2 S - 2n sum_i a_i. b_i. + a.. b.., where S is the cross-distance sum and
+    a_i./b_i. are distance row sums. Each piece is computed exactly on the dyadic integer
+    scaling of x and y, so the only rounding is the final mpf division."""
+    n = len(x)
+    xs, ex = _dyadic_ints(x)
+    ys, ey = _dyadic_ints(y)
+    ra = _distance_row_sums(xs)
+    rb = _distance_row_sums(ys)
+    num = (n * n * _cross_distance_sum(xs, ys) - 2 * n * sum(a * b for a, b in zip(ra, rb))
+           + sum(ra) * sum(rb))
+    return mp.ldexp(mpf(num), -(ex + ey)) / mpf(n) ** 4
+
+
+def dvar_ref(x):
+    return sqrt(_dcov_sq(x, x))
+
+
+def dcov_ref(x, y):
+    return sqrt(_dcov_sq(x, y))
 
 
 def dcor_ref(x, y):
@@ -283,60 +439,91 @@ def kullback_leibler_ref(p, q):
 
 
 def covariance_ref(x, y):
-    xv, yv = _mp(x), _mp(y)
-    n = len(xv)
-    mx, my = mean_ref(x), mean_ref(y)
-    return sum((xv[i] - mx) * (yv[i] - my) for i in range(n)) / (n - 1)
+    return mpf(_covariance_q(x, y))
 
 
 def pearson_ref(x, y):
-    return covariance_ref(x, y) / (stdev_ref(x) * stdev_ref(y))
+    return mpf(_covariance_q(x, y)) / sqrt(mpf(_variance_q(x) * _variance_q(y)))
 
 
 def spearman_ref(x, y):
-    n = len(x)
-    rx = [rank_ref(x, i) for i in range(n)]
-    ry = [rank_ref(y, i) for i in range(n)]
-    return pearson_ref(rx, ry)
-
-
-def _ties_correction(v):
-    counts = Counter(v)
-    return sum(t * (t - 1) // 2 for t in counts.values() if t > 1)
+    return pearson_ref(_order_view(x)['ranks'], _order_view(y)['ranks'])
 
 
-def kendall_ref(x, y):
+def _concordance_counts_quadratic(x, y):
+    """(nc, nd, n1, n2) by direct enumeration of all i < j pairs: concordant, discordant,
+    tied-in-x and tied-in-y pair counts. O(n^2); kept as the cross-check for
+    _concordance_counts()."""
     n = len(x)
-    nc = nd = 0
+    nc = nd = n1 = n2 = 0
     for i in range(n):
         for j in range(i):
-            p = _sign(x[i] - x[j]) * _sign(y[i] - y[j])
-            if p > 0:
+            sx = _sign(x[i] - x[j])
+            sy = _sign(y[i] - y[j])
+            n1 += sx == 0
+            n2 += sy == 0
+            if sx * sy > 0:
                 nc += 1
-            elif p < 0:
+            elif sx * sy < 0:
                 nd += 1
-    n0 = n * (n - 1) // 2
-    n1 = _ties_correction(x)
-    n2 = _ties_correction(y)
+    return nc, nd, n1, n2
+
+
+def _count_inversions(v):
+    """Sorts v in place (stable merge sort) and returns its number of strict inversions
+    (i < j with v[i] > v[j])."""
+    n = len(v)
+    if n < 2:
+        return 0
+    mid = n // 2
+    left, right = v[:mid], v[mid:]
+    swaps = _count_inversions(left) + _count_inversions(right)
+    i = j = 0
+    for k in range(n):
+        if j == len(right) or (i < len(left) and left[i] <= right[j]):
+            v[k] = left[i]
+            i += 1
+        else:
+            v[k] = right[j]
+            j += 1
+            swaps += len(left) - i
+    return swaps
+
+
+def _tied_pairs(sorted_v):
+    # Pairs tied in a sorted sequence: sum of t(t-1)/2 over its runs of equal values.
+    pairs = run = 0
+    for i in range(1, len(sorted_v)):
+        run = run + 1 if sorted_v[i] == sorted_v[i - 1] else 0
+        pairs += run
+    return pairs
+
+
+def _concordance_counts(x, y):
+    """(nc, nd, n1, n2) as in _concordance_counts_quadratic(), in O(n log n) by Knight's (1966)
+    algorithm: sort the pairs by (x, y), so that x-ties are already in y order and every
+    remaining strict y inversion is exactly one discordant pair, then count those inversions
+    with a merge sort. Concordant pairs follow by inclusion-exclusion from the total and the
+    x-, y- and joint-tie counts. All counts are exact Python integers."""
+    pairs = sorted(zip(x, y))
+    n0 = len(pairs) * (len(pairs) - 1) // 2
+    n1 = _tied_pairs([a for a, _ in pairs])
+    n3 = _tied_pairs(pairs)
+    ys = [b for _, b in pairs]
+    nd = _count_inversions(ys)
+    n2 = _tied_pairs(ys)
+    return n0 - n1 - n2 + n3 - nd, nd, n1, n2
+
+
+def kendall_ref(x, y):
+    n0 = len(x) * (len(x) - 1) // 2
+    nc, nd, n1, n2 = _concordance_counts(x, y)
     return mpf(nc - nd) / sqrt(mpf((n0 - n1) * (n0 - n2)))
 
 
 def somers_d_ref(x, y):
-    n = len(x)
-    nc = nd = tx = 0
-    for i in range(n):
-        for j in range(i):
-            dx = x[i] - x[j]
-            dy = y[i] - y[j]
-            if dx == 0:
-                tx += 1
-            p = _sign(dx) * _sign(dy)
-            if p > 0:
-                nc += 1
-            elif p < 0:
-                nd += 1
-    denom = n * (n - 1) // 2 - tx
-    return mpf(nc - nd) / mpf(denom)
+    nc, nd, n1, _ = _concordance_counts(x, y)
+    return mpf(nc - nd) / mpf(len(x) * (len(x) - 1) // 2 - n1)
 
 
 def point_biserial_ref(x, y):
@@ -636,6 +823,132 @@ def _contingency_grid(add):
             add('yuleY', [p00, p01, p10, p11], f'yuleY: contingency set {i}')
 
 
+# ─── large-n tier (--large) ───
+#
+# Arrays here are 10^3-10^6 elements long, so instead of literals each one is a descriptor
+# {'gen': 'real' | 'ties', 'seed', 'n', 'lo', 'hi'} expanded identically on both sides of the
+# bridge: mulberry32 (32-bit integer ops only) feeds 53-bit doubles built from two outputs, and
+# lo + (hi - lo) * u (or lo + floor(u * (hi - lo + 1)) for ties) is one correctly rounded IEEE
+# operation chain in both Python and JS. Sizes are capped per function by ranjs's own cost:
+# kendall/somersD/spearman(rank) are O(n^2) there and dCov/dCor/dVar build n x n matrices.
+
+LARGE_CHUNK = 8
+
+# Tolerances, calibrated against a full --large --check run (every array is seeded, so the tier
+# sees the same points each time):
+#   - Summation-based statistics (mean, variance/stdev, moment, skewness/kurtosis, the geometric
+#     and harmonic means, cv/vmr, covariance/pearson, dCov/dCor/dVar): a float64 running sum of n
+#     terms carries up to ~n*eps relative error (~2e-10 at n = 10^6), ~sqrt(n)*eps typically. The
+#     run landed at <= 5e-14, bar skewness's 3.7e-12 (its near-zero third moment amplifies the
+#     same cancellation as in grid()); the worst-case envelope stays the gate.
+#   - Order statistics and rank counts (median, midrange, trimean, range, quantile, iqr,
+#     midhinge, qcd; kendall/somersD, ratios of exact integer pair counts): selection is exact,
+#     and what's left is one interpolation, average or division -- the run landed at <= 1.8e-16,
+#     under one ulp. _TOL_LARGE_ORDER allows four.
+#   - spearman is pearson over exact (half-)integer ranks, so only its closing division and sqrt
+#     round: 2.0e-15 in the run, inside DEFAULT_TOL.
+#   - yule divides q3 + q1 - 2*median, which cancels down to ~1e-3 of its terms here, by the iqr:
+#     2.5e-14 in the run, the same mechanism as _TOL_DIVISION_OR_CANCELLATION.
+_TOL_LARGE_N = 1e-9
+_TOL_LARGE_ORDER = 4 * 2.0 ** -52
+_LARGE_TOL = {
+    **dict.fromkeys(('median', 'midrange', 'trimean', 'range', 'quantile', 'iqr', 'midhinge', 'qcd',
+                     'kendall', 'somersD'), _TOL_LARGE_ORDER),
+    'spearman': DEFAULT_TOL,
+    'yule': _TOL_DIVISION_OR_CANCELLATION,
+}
+
+LARGE_PROFILES = [
+    {'n': 10 ** 5, 'lo': -20, 'hi': 30, 'draws': 2, 'note': 'large n=1e5, mixed-sign floats'},
+    {'n': 10 ** 6, 'lo': -20, 'hi': 30, 'draws': 1, 'note': 'large n=1e6, mixed-sign floats'},
+]
+
+LARGE_POS_PROFILES = [
+    {'n': 10 ** 5, 'lo': 0.5, 'hi': 80, 'draws': 2, 'note': 'large n=1e5, strictly positive'},
+    {'n': 10 ** 6, 'lo': 0.5, 'hi': 80, 'draws': 1, 'note': 'large n=1e6, strictly positive'},
+]
+
+LARGE_PAIR_PROFILES = [
+    {'n': 10 ** 4, 'gen': 'real', 'lo': -10, 'hi': 10, 'fns': ('kendall', 'somersD', 'spearman'),
+     'note': 'large n=1e4 array pair'},
+    {'n': 10 ** 4, 'gen': 'ties', 'lo': 0, 'hi': 50, 'fns': ('kendall', 'somersD', 'spearman'),
+     'note': 'large n=1e4 integer pair with ties'},
+    {'n': 2000, 'gen': 'real', 'lo': -10, 'hi': 10, 'fns': ('dCov', 'dCor'),
+     'note': 'n=2000 array pair'},
+    {'n': 10 ** 6, 'gen': 'real', 'lo': -10, 'hi': 10, 'fns': ('covariance', 'pearson'),
+     'note': 'large n=1e6 array pair'},
+]
+
+
+def _mulberry32(seed):
+    a = seed & 0xFFFFFFFF
+    while True:
+        a = (a + 0x6D2B79F5) & 0xFFFFFFFF
+        t = ((a ^ (a >> 15)) * (a | 1)) & 0xFFFFFFFF
+        t = ((t + (((t ^ (t >> 7)) * (t | 61)) & 0xFFFFFFFF)) & 0xFFFFFFFF) ^ t
+        yield t ^ (t >> 14)
+
+
+# Bounded like _ORDER_VIEWS: grid_large() lists every statistic of one array (or pair) together,
+# so the last two expansions are all a run ever needs again.
+_EXPANDED = {}
+
+
+def _expand(arg):
+    """Materializes a large-tier array descriptor (anything else passes through unchanged)."""
+    if not isinstance(arg, dict):
+        return arg
+    key = json.dumps(arg, sort_keys=True)
+    if key not in _EXPANDED:
+        stream = _mulberry32(arg['seed'])
+        lo, hi = arg['lo'], arg['hi']
+        values = []
+        for _ in range(arg['n']):
+            u = ((next(stream) >> 5) * 67108864 + (next(stream) >> 6)) / 9007199254740992
+            values.append(float(lo + math.floor(u * (hi - lo + 1))) if arg['gen'] == 'ties'
+                          else lo + (hi - lo) * u)
+        _remember(_EXPANDED, key, values)
+    return _EXPANDED[key]
+
+
+def _descriptor(gen, seed, profile):
+    return {'gen': gen, 'seed': seed, 'n': profile['n'], 'lo': profile['lo'], 'hi': profile['hi']}
+
+
+def grid_large():
+    """The --large tier's (fn, args, note, tol, at) tuples, args holding array descriptors."""
+    points = []
+
+    def add(fn, args, note):
+        points.append((fn, list(args), note, _LARGE_TOL.get(fn, _TOL_LARGE_N), None))
+
+    for i, profile in enumerate(LARGE_PROFILES):
+        for d in range(profile['draws']):
+            arr = _descriptor('real', 9000 + 100 * i + d, profile)
+            for fn in ('mean', 'median', 'midrange', 'trimean', 'geometricMean', 'skewness',
+                       'kurtosis', 'yule', 'range', 'iqr', 'midhinge', 'qcd', 'stdev', 'variance'):
+                add(fn, [arr], f'{fn}: {profile["note"]}')
+            for q in (0.1, 0.9):
+                add('quantile', [arr, q], f'quantile: {profile["note"]}, p={q}')
+            add('moment', [arr, 4, 0], f'moment: {profile["note"]}, k=4 c=0')
+
+    for i, profile in enumerate(LARGE_POS_PROFILES):
+        for d in range(profile['draws']):
+            arr = _descriptor('real', 9500 + 100 * i + d, profile)
+            for fn in ('harmonicMean', 'cv', 'vmr'):
+                add(fn, [arr], f'{fn}: {profile["note"]}')
+
+    for i, profile in enumerate(LARGE_PAIR_PROFILES):
+        x = _descriptor(profile['gen'], 9800 + 10 * i, profile)
+        y = _descriptor(profile['gen'], 9800 + 10 * i + 1, profile)
+        for fn in profile['fns']:
+            add(fn, [x, y], f'{fn}: {profile["note"]}')
+        if 'dCov' in profile['fns']:
+            add('dVar', [x], f'dVar: {profile["note"]}')
+
+    return points
+
+
 def grid():
     """Threshold-focused (fn, args, note, tol, at) tuples. See the module docstring for the
     "parameter set = profile, point = replicate draw (or argument variation)" rationale."""
@@ -656,6 +969,38 @@ def grid():
     return points
 
 
+def self_check_concordance(points):
+    """Aborts unless the merge-sort concordance counts behind kendall/somersD match the
+    quadratic pair enumeration exactly -- on every grid pair, plus tie-heavy integer pairs
+    (the grid's own pairs are continuous, so they never exercise the tie terms)."""
+    cases = [args for fn, args, _, _, _ in points if fn in ('kendall', 'somersD')]
+    cases += [(_gen_ties(seed, n, 0, 5), _gen_ties(seed + 1, n, 0, 3))
+              for seed, n in ((1, 2), (2, 7), (3, 40), (4, 101))]
+    for x, y in cases:
+        fast, slow = _concordance_counts(x, y), _concordance_counts_quadratic(x, y)
+        if fast != slow:
+            sys.exit(f'Aborting: concordance counts (nc, nd, n1, n2) {fast} != quadratic {slow} '
+                     f'for x={x} y={y}')
+    print(f'self-check: concordance counts match the quadratic enumeration on {len(cases)} pairs',
+          flush=True)
+
+
+def self_check_distance(points):
+    """Aborts unless the O(n log n) squared distance covariance behind dVar/dCov/dCor agrees
+    with the double-centered-matrix version to 1e-40 on every grid array (pair), plus
+    tie-heavy integer pairs."""
+    cases = [(args[0], args[0]) if fn == 'dVar' else args
+             for fn, args, _, _, _ in points if fn in ('dVar', 'dCov', 'dCor')]
+    cases += [(_gen_ties(seed, n, 0, 5), _gen_ties(seed + 1, n, -3, 3))
+              for seed, n in ((1, 2), (2, 7), (3, 40))]
+    for x, y in cases:
+        fast, slow = _dcov_sq(x, y), _dcov_sq_quadratic(x, y)
+        if abs(fast - slow) > mpf('1e-40') * abs(slow):
+            sys.exit(f'Aborting: dCov^2 {fast} != quadratic {slow} for x={x} y={y}')
+    print(f'self-check: dCov^2 matches the double-centered matrices on {len(cases)} pairs',
+          flush=True)
+
+
 def num(x):
     # repr(float('inf')) is the Python literal 'inf', which is not valid JS (it would parse as
     # a ReferenceError to an undefined identifier) -- emit the JS spellings instead.
@@ -668,24 +1013,40 @@ def num(x):
         return '-Infinity'
     return repr(x)
 
+def _ref_point(point, seconds=None):
+    fn, args, note, _, at = point
+    with watchdog(seconds), profiled(fn, note, 'ref', at):
+        val = REF_FN[fn](*[_expand(a) for a in args])
+    return float(val if at is None else val[at])
 
-def compute_refs(points):
-    refs = []
-    for fn, args, note, tol, at in points:
-        val = REF_FN[fn](*args)
-        if at is not None:
-            val = val[at]
-        refs.append(float(val))
+
+def compute_refs(points, jobs=1, budget=DEFAULT_POINT_BUDGET, retry_budget=None):
+    """float64 reference per point, in grid order, each under evaluate_deferred()'s watchdog -- None
+    for a point left unresolved, which check() counts against the run. With jobs > 1 the points
+    (all independent) are spread over a process pool; results are put back in input order, so
+    --check and --emit see the same list whatever the worker count."""
+    refs, _ = evaluate_deferred(_ref_point, points, budget, retry_budget, jobs,
+                                label=lambda point: point[2])
     return refs
 
 
-def compute_ranjs_values(points):
-    payload = json.dumps([{'fn': fn, 'args': args} for fn, args, _, _, _ in points])
-    result = subprocess.run(['node', EVAL_SCRIPT], input=payload, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(result.stderr, flush=True)
-        raise RuntimeError('scripts/eval-summary-stats.js failed')
-    return json.loads(result.stdout)
+def compute_ranjs_values(points, chunk=None):
+    """ranjs's value for every point, via one eval-summary-stats.js run -- or, with `chunk`, one
+    run per `chunk` points, so a large-tier run holds only a few expanded arrays at a time on
+    the node side and reports progress as it goes."""
+    size = chunk or max(len(points), 1)
+    values = []
+    for start in range(0, len(points), size):
+        part = points[start:start + size]
+        payload = json.dumps([{'fn': fn, 'args': args} for fn, args, _, _, _ in part])
+        result = subprocess.run(['node', EVAL_SCRIPT], input=payload, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stderr, flush=True)
+            raise RuntimeError('scripts/eval-summary-stats.js failed')
+        values.extend(json.loads(result.stdout))
+        if chunk:
+            print(f'  bridge: {len(values)}/{len(points)} points', flush=True)
+    return values
 
 
 def decode(value, at):
@@ -726,7 +1087,12 @@ def _mismatch_message(fn, args, ref, value, tol, note):
 def check(points, refs, ranjs_values):
     bad = 0
     checked = 0
+    unresolved = 0
     for (fn, args, note, tol, at), ref, got in zip(points, refs, ranjs_values):
+        if ref is None:
+            print(f'  UNRESOLVED {fn}{args}: no reference within the watchdog budget ({note})', flush=True)
+            unresolved += 1
+            continue
         if 'error' in got:
             print(f'  ERROR {fn}{args}: {got["error"]}', flush=True)
             bad += 1
@@ -736,8 +1102,8 @@ def check(points, refs, ranjs_values):
         if message:
             print(message, flush=True)
             bad += 1
-    print(f'Checked {checked} points, {bad} mismatches', flush=True)
-    return bad
+    print(f'Checked {checked} points, {bad} mismatches, {unresolved} unresolved', flush=True)
+    return bad + unresolved
 
 
 TEMPLATE = """/* eslint-disable no-loss-of-precision */
@@ -840,13 +1206,36 @@ def render(points, refs):
     print(f'Wrote {OUTPUT_PATH} ({len(lines)} points)', flush=True)
 
 
+def _jobs():
+    # --jobs N: worker processes for compute_refs() (default 1, i.e. in-process).
+    return int(sys.argv[sys.argv.index('--jobs') + 1]) if '--jobs' in sys.argv else 1
+
+
 def main():
+    large = '--large' in sys.argv
+    if large and '--emit' in sys.argv:
+        sys.exit('--large is check-only: its arrays are descriptors and are never emitted as literals.')
     points = grid()
-    refs = compute_refs(points)
-    ranjs_values = compute_ranjs_values(points)
+    self_check_concordance(points)
+    self_check_distance(points)
+    if large:
+        points = grid_large()
+    profile = '--profile' in sys.argv
+    if profile:
+        # Serial, so every evaluation's record lands in this process.
+        enable_profiling(globals())
+    refs = compute_refs(points, 1 if profile else _jobs(), *budget_flags())
+    if profile:
+        disable_profiling().write(sys.argv[sys.argv.index('--profile-out') + 1]
+                                  if '--profile-out' in sys.argv else PROFILE_OUT)
+    ranjs_values = compute_ranjs_values(points, chunk=LARGE_CHUNK if large else None)
     bad = check(points, refs, ranjs_values)
 
     if '--emit' in sys.argv:
+        if None in refs:
+            print(f'Refusing to emit: {refs.count(None)} reference(s) overran the watchdog budget -- '
+                  f'rerun with a larger --point-budget/--retry-budget.', flush=True)
+            sys.exit(1)
         if bad:
             print(f'Refusing to emit: {bad} mismatch(es) unresolved -- either the mechanism is '
                   f'understood (add a tol= override with a named-mechanism comment in grid()) or '
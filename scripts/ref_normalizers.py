@@ -0,0 +1,67 @@
+"""
+Memoized normalizing constants of the series-defined discrete pmfs (ConwayMaxwellPoisson, LogSeries,
+Zeta, Zipf, ZipfMandelbrot), for the two discrete reference generators: precision-refs-discrete.py
+and gen-dist-refs.py.
+
+Both used to carry a verbatim copy of what is here. They now import this module instead, a deliberate
+exception to the scripts' no-cross-import convention alongside ref_profile.py and ref_watchdog.py.
+Unlike those, this one is reference math: it exists once so that the two generators' constants
+cannot drift apart, and precision-refs-discrete.py's self-check of every spec'd Z(lam, nu) against
+nsum covers both.
+
+A pmf calls normalizer(name, p); bench-refs.py calls clear_normalizers() to time evaluations cold.
+"""
+import json
+
+from mpmath import mp, mpf, log, power, zeta, fsum
+
+from ref_profile import profile_terms
+
+# Normalizing constants of the series-defined pmfs, memoized per (name, params): the cdf
+# tables call pmf() once per k, and re-summing a Z(lam, nu) or a harmonic number each time
+# dominated the cost of those groups. Infinite series are summed at 10 guard digits until
+# a geometric bound on the remaining tail falls under the working precision.
+_NORMALIZERS = {}
+
+
+def _cmp_normalizer(lam, nu):
+    # Z = sum_j lam^j / j!^nu. Successive term ratios lam / (j+1)^nu are nonincreasing in j,
+    # so once one drops below 1 the tail after term t is at most t * r / (1 - r).
+    eps = power(2, -mp.prec)
+    with mp.workdps(mp.dps + 10):
+        z = term = mpf(1)
+        j = 0
+        while True:
+            r = lam / power(j + 1, nu)
+            if r < 1 and term * r / (1 - r) <= eps * z:
+                break
+            j += 1
+            term *= r
+            z += term
+    profile_terms(j + 1)
+    return +z
+
+
+def normalizer(name, p):
+    key = (name, json.dumps(p))
+    if key not in _NORMALIZERS:
+        if name == 'ConwayMaxwellPoisson':
+            z = _cmp_normalizer(mpf(p[0]), mpf(p[1]))
+        elif name == 'LogSeries':
+            z = -log(1 - mpf(p[0]))
+        elif name == 'Zeta':
+            z = zeta(mpf(p[0]))
+        elif name == 'Zipf':
+            s = mpf(p[0])
+            z = fsum(power(i, -s) for i in range(1, int(p[1]) + 1))
+        elif name == 'ZipfMandelbrot':
+            s, q = mpf(p[1]), mpf(p[2])
+            z = fsum(power(i + q, -s) for i in range(1, int(p[0]) + 1))
+        else:
+            raise ValueError(name)
+        _NORMALIZERS[key] = z
+    return _NORMALIZERS[key]
+
+
+def clear_normalizers():
+    _NORMALIZERS.clear()
@@ -0,0 +1,147 @@
+"""
+--profile instrumentation for the mpmath reference scripts: the precision-refs-*.py generators,
+gen-dist-refs.py and difftest_engine.py (and through it the difftest harnesses).
+
+Each of them used to carry a verbatim copy of everything here. They now import this module instead
+(scripts/ is on sys.path whenever one of them runs), the second deliberate exception to the
+scripts' no-cross-import convention after difftest_engine.py: the profiler records how references
+are computed, never what they are, so sharing it can't couple one script's reference values to
+another's.
+
+A script calls enable_profiling(globals()) before its reference evaluations and disable_profiling()
+after them -- or wraps them in `with profiling(globals()):` -- opens each evaluation with
+profiled(function, params, method, x), credits hand-rolled series loops with profile_terms(n), and
+writes the finished Profiler's records with .write(path).
+"""
+import contextlib
+import json
+import sys
+import time
+
+import mpmath
+
+PROFILED_PRIMITIVES = ('gammainc', 'betainc', 'quad', 'nsum', 'loggamma', 'besselk')
+PROFILE_TOP_N = 20
+PROFILER = None
+
+
+class Profiler:
+    """Per-evaluation cost records for --profile: wall time for each (function, params, method, x)
+    opened with profiled(), the calls it made to PROFILED_PRIMITIVES, and the series terms it
+    summed (hand-rolled loops via profile_terms(), nsum summand and quad integrand calls)."""
+
+    def __init__(self):
+        self.records = []
+        self._open = None
+        self._restore = []
+
+    def install(self, namespace):
+        # Rebinds every global bound to a primitive -- matched by identity, so renamed
+        # `from mpmath import x as y` imports are caught too -- and the mpmath.<name> attribute for
+        # qualified calls. Calls mpmath makes internally go through its context object and are
+        # not counted. uninstall() puts every one of them back.
+        for name in PROFILED_PRIMITIVES:
+            original = getattr(mpmath, name)
+            counted = self._counting(name, original)
+            for key, value in list(namespace.items()):
+                if value is original:
+                    namespace[key] = counted
+                    self._restore.append((namespace, key, original))
+            setattr(mpmath, name, counted)
+            self._restore.append((mpmath.__dict__, name, original))
+
+    def uninstall(self):
+        while self._restore:
+            namespace, key, original = self._restore.pop()
+            namespace[key] = original
+
+    def _counting(self, name, fn):
+        def counted(*args, **kwargs):
+            record = self._open
+            if record is not None:
+                record['primitives'][name] = record['primitives'].get(name, 0) + 1
+                if name in ('nsum', 'quad') and args and callable(args[0]):
+                    f = args[0]
+
+                    def term(*xs):
+                        record['terms'] += 1
+                        return f(*xs)
+                    args = (term,) + args[1:]
+            return fn(*args, **kwargs)
+        return counted
+
+    @contextlib.contextmanager
+    def point(self, function, params, method, x):
+        record = {'function': function, 'params': params, 'method': method, 'x': x,
+                  'seconds': None, 'primitives': {}, 'terms': 0}
+        outer, self._open = self._open, record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._open = outer
+            self.records.append(record)
+
+    def write(self, path, top_n=PROFILE_TOP_N):
+        by_function = {}
+        for r in self.records:
+            total = by_function.setdefault(r['function'], {'points': 0, 'seconds': 0.0, 'terms': 0,
+                                                           'primitives': {}})
+            total['points'] += 1
+            total['seconds'] += r['seconds']
+            total['terms'] += r['terms']
+            for name, n in r['primitives'].items():
+                total['primitives'][name] = total['primitives'].get(name, 0) + n
+        slowest = sorted(self.records, key=lambda r: -r['seconds'])
+        with open(path, 'w') as fh:
+            json.dump({'primitives': list(PROFILED_PRIMITIVES), 'by_function': by_function,
+                       'records': slowest}, fh, indent=1, default=str)
+        err = sys.stderr
+        print(f'profile: {len(self.records)} evaluations in '
+              f'{sum(r["seconds"] for r in self.records):.1f} s, written to {path}', file=err)
+        print(f'  top {top_n} functions by total time:', file=err)
+        for function, total in sorted(by_function.items(), key=lambda kv: -kv[1]['seconds'])[:top_n]:
+            print(f'    {total["seconds"]:9.3f} s {total["points"]:6d} evals {total["terms"]:9d} terms  '
+                  f'{function} {total["primitives"]}', file=err)
+        print(f'  top {top_n} evaluations by time:', file=err)
+        for r in slowest[:top_n]:
+            print(f'    {r["seconds"]:9.3f} s {r["terms"]:9d} terms  {r["function"]}{r["params"]} '
+                  f'{r["method"]} x={r["x"]} {r["primitives"]}', file=err)
+
+
+def enable_profiling(namespace):
+    # namespace: the calling script's globals(), whose `from mpmath import` names get rebound.
+    global PROFILER
+    PROFILER = Profiler()
+    PROFILER.install(namespace)
+    return PROFILER
+
+
+def disable_profiling():
+    # Restores every name enable_profiling() rebound and returns the finished Profiler.
+    global PROFILER
+    profiler, PROFILER = PROFILER, None
+    if profiler is not None:
+        profiler.uninstall()
+    return profiler
+
+
+@contextlib.contextmanager
+def profiling(namespace):
+    profiler = enable_profiling(namespace)
+    try:
+        yield profiler
+    finally:
+        disable_profiling()
+
+
+def profiled(function, params, method, x=None):
+    # No-op context unless --profile is on.
+    return PROFILER.point(function, params, method, x) if PROFILER else contextlib.nullcontext()
+
+
+def profile_terms(n):
+    # Credits n series terms to the evaluation currently open under profiled(), if any.
+    if PROFILER is not None and PROFILER._open is not None:
+        PROFILER._open['terms'] += n
@@ -0,0 +1,131 @@
+"""
+Per-point wall-clock watchdog and deferred retry queue for the mpmath reference scripts: the
+precision-refs-*.py generators, gen-dist-refs.py and difftest_engine.py (and through it the
+difftest harnesses).
+
+The iteration caps in the reference math (j > 200000 in the ncx2/ncbeta/Tweedie series, r/si > 5000
+in dncbeta) bound terms, not time, and nsum/quad carry none, so one pathological point could stall
+a whole batch. Each script used to carry its own copy of what is here; they now import this module
+instead, the same deliberate exception to the scripts' no-cross-import convention as ref_profile.py:
+a timeout decides whether a reference is waited for, never what it is.
+
+A script hands evaluate_deferred() an evaluate(item, seconds) that opens each of its own reference
+evaluations with watchdog(seconds) -- or wraps a plain evaluate(item) in watched() for one budget
+over the whole call -- and reads --point-budget/--retry-budget with budget_flags().
+"""
+import contextlib
+import multiprocessing
+import signal
+import sys
+import time
+
+# Default per-evaluation budget (seconds) for the generators: above the slowest single evaluation
+# (one inversion, one pdf/pmf or cdf) any of their current parameter sets legitimately needs.
+# difftest_engine.py sets its own, much shorter one for its randomly drawn points.
+DEFAULT_POINT_BUDGET = 900.0
+
+
+class PointTimeout(Exception):
+    """Raised inside a reference evaluation that ran past its watchdog budget."""
+
+
+@contextlib.contextmanager
+def watchdog(seconds):
+    # SIGALRM interrupts mpmath between bytecodes; POSIX, main thread only (each pool worker's own
+    # main thread included). A falsy budget disables it.
+    if not seconds:
+        yield
+        return
+
+    def expire(signum, frame):
+        raise PointTimeout(f'exceeded its {seconds:g} s budget')
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def watched(evaluate):
+    """evaluate(item) as an evaluate(item, seconds) for evaluate_deferred(), under one watchdog."""
+    def bounded(item, seconds):
+        with watchdog(seconds):
+            return evaluate(item)
+    return bounded
+
+
+# Set just before the pool forks, so workers inherit the caller's evaluate even when it is an
+# unpicklable closure.
+_EVALUATE = None
+
+
+def _attempt(job):
+    # (i, value, seconds, None), or (i, None, seconds, why) once one of evaluate's watchdog-bounded
+    # evaluations overran.
+    i, item, seconds = job
+    start = time.perf_counter()
+    try:
+        return i, _EVALUATE(item, seconds), time.perf_counter() - start, None
+    except PointTimeout as exc:
+        return i, None, time.perf_counter() - start, str(exc)
+
+
+def evaluate_deferred(evaluate, items, budget, retry_budget=None, jobs=1, order=None, chunksize=1,
+                      on_result=None, label=repr, quiet=False):
+    """(values, unresolved): evaluate(item, seconds) for every item, on `jobs` forked worker
+    processes, dispatched in `order` (item indices; default: as given) and returned in `items`'
+    order. An item whose evaluation overruns `budget` is deferred until every other item has
+    finished, then retried once with `retry_budget` -- None, the default, retries without one, so a
+    run still evaluates every item and only stops waiting on the slow ones first. unresolved lists
+    (index, seconds spent over both passes) for the items the retry did not resolve either; their
+    values are None. on_result(i, value, seconds, why), if given, sees every attempt as it lands,
+    in this process, with why None on success. quiet drops the deferred/retrying/UNRESOLVED lines
+    this otherwise prints to stderr."""
+    global _EVALUATE
+    _EVALUATE = evaluate
+    order = list(range(len(items))) if order is None else list(order)
+    values = [None] * len(items)
+    stalled = {}
+    # fork: the workers need the caller's module globals, which a spawned interpreter would not have
+    # (every caller runs as __main__ under a hyphenated, unimportable name).
+    pool = multiprocessing.get_context('fork').Pool(jobs) if jobs > 1 and len(items) > 1 else None
+    try:
+        for seconds, indices in ((budget, order), (retry_budget, None)):
+            if indices is None:
+                if not stalled:
+                    break
+                indices = [i for i in order if i in stalled]
+                quiet or print(f'  retrying {len(indices)} deferred item(s) '
+                      f'{f"with a {seconds:g} s budget" if seconds else "without a budget"}',
+                      file=sys.stderr, flush=True)
+            queue = [(i, items[i], seconds) for i in indices]
+            results = (pool.imap_unordered(_attempt, queue, chunksize=chunksize) if pool
+                       else map(_attempt, queue))
+            for i, value, spent, why in results:
+                if why is None:
+                    values[i] = value
+                    stalled.pop(i, None)
+                else:
+                    stalled[i] = (stalled[i][0] if i in stalled else 0) + spent, why
+                    quiet or print(f'  deferred {label(items[i])}: {why}', file=sys.stderr, flush=True)
+                if on_result:
+                    on_result(i, value, spent, why)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    for i, (spent, why) in sorted(stalled.items()):
+        quiet or print(f'  UNRESOLVED {label(items[i])} after {spent:.1f} s: {why}', file=sys.stderr,
+                       flush=True)
+    return values, [(i, spent) for i, (spent, _) in sorted(stalled.items())]
+
+
+def budget_flags(default=DEFAULT_POINT_BUDGET):
+    # --point-budget/--retry-budget SECONDS for evaluate_deferred() (defaults `default` and an
+    # unbounded retry).
+    def flag(name, fallback):
+        return float(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else fallback
+    return flag('--point-budget', default), flag('--retry-budget', None)
@@ -0,0 +1,246 @@
+"""
+Regenerates every committed reference and differential-testing report in one run, concurrently.
+
+Doing it by hand means running precision-refs-{continuous,discrete,process,special,summary-stats}.py
+and the three difftest-*.py harnesses one after another, in the right order, each re-spawning its own
+node bridge. This runs them as one dependency graph (STAGES) on asyncio subprocesses: a stage starts
+as soon as every stage it depends on has succeeded and the global --cpus budget has room for it, so
+a full regeneration takes about as long as its critical path (the continuous --emit chain), not the
+sum of every stage.
+
+  - dump-cases runs scripts/dump-dist-cases-json.js once, and continuous:check reads its output
+    (--cases-json) instead of spawning its own node for it.
+  - continuous:emit only starts after continuous:check passes. special and summary-stats have no
+    separate check stage: their --emit already runs the same check first and refuses to write on a
+    mismatch.
+  - ci-gate and accuracy-docs wait for the difftest:special and difftest:dist reports.
+  - Stages that take --jobs get --stage-jobs workers and hold that many of the --cpus slots; the
+    rest hold one.
+
+Ready stages start longest-remaining-path first, like precision-refs-continuous.py's run_jobs(): a
+stage's priority is its expected cost plus that of its costliest chain of dependents, from wall
+times recorded in COSTS by previous runs (_COST_PRIOR, then _DEFAULT_COST, before there are any).
+A failed stage skips everything downstream of it; independent stages still run. Each stage's output
+goes to --log-dir/<stage>.log, and a timing summary -- every stage's start offset and duration, the
+critical path, and the wall time against the serial sum -- is printed at the end.
+
+The node bridges are not pooled: every generator drives its own through a one-shot stdin/stdout
+call. What they share is @babel/register's on-disk transpile cache, which dump-cases -- at the head
+of the longest path, so always started first -- leaves warm for the rest.
+
+Requires: pip install mpmath
+Usage: npm run regen:refs | python3 scripts/regen-refs.py [--cpus N] [--stage-jobs N]
+       [--only stage1,stage2] [--log-dir DIR] [--dry-run]
+
+--only runs just the named stages, treating their other dependencies as already up to date.
+--dry-run prints the stages in priority order with their commands, and runs nothing.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASES_JSON = '/tmp/regen-refs-dist-cases.json'
+COSTS = '/tmp/regen-refs-costs.json'
+DEFAULT_LOG_DIR = '/tmp/regen-refs-logs'
+SPECIAL_REPORT = '/tmp/difftest-special-report.json'
+DIST_REPORT = '/tmp/difftest-dist-report.json'
+QUANTILE_REPORT = '/tmp/difftest-quantile-report.json'
+
+# Expected seconds for a stage with no recorded cost yet. continuous:emit's is the
+# DoublyNoncentralBeta[2, 2, 1200, 1200] group alone (~65 min on a cold cache, #1149); process is
+# its own docstring's ~90 s.
+_DEFAULT_COST = 60.0
+_COST_PRIOR = {'continuous:emit': 3900.0, 'process': 90.0}
+
+
+def py(script, *args):
+    return ['python3', f'scripts/{script}', *args]
+
+
+# name -> {'argv', 'deps', 'jobs': takes --jobs N, 'stdout': file the stage's stdout is written to}
+STAGES = {
+    'dump-cases': {'argv': ['node', 'scripts/dump-dist-cases-json.js'], 'deps': [], 'jobs': False,
+                   'stdout': CASES_JSON},
+    'continuous:check': {'argv': py('precision-refs-continuous.py', '--check', '--cases-json', CASES_JSON),
+                         'deps': ['dump-cases'], 'jobs': False},
+    'continuous:emit': {'argv': py('precision-refs-continuous.py', '--emit'), 'deps': ['continuous:check'],
+                        'jobs': True},
+    'discrete': {'argv': py('precision-refs-discrete.py'), 'deps': [], 'jobs': False},
+    'process': {'argv': py('precision-refs-process.py'), 'deps': [], 'jobs': True},
+    'special': {'argv': py('precision-refs-special.py', '--emit'), 'deps': [], 'jobs': True},
+    'summary-stats': {'argv': py('precision-refs-summary-stats.py', '--emit'), 'deps': [], 'jobs': True},
+    'difftest:special': {'argv': py('difftest-special.py', '--out', SPECIAL_REPORT), 'deps': [], 'jobs': True},
+    'difftest:dist': {'argv': py('difftest-dist.py', '--out', DIST_REPORT), 'deps': [], 'jobs': True},
+    'difftest:quantile': {'argv': py('difftest-quantile.py', '--out', QUANTILE_REPORT), 'deps': [],
+                          'jobs': True},
+    'ci-gate': {'argv': ['node', 'scripts/difftest-ci-gate.js', '--special', SPECIAL_REPORT, '--dist', DIST_REPORT],
+                'deps': ['difftest:special', 'difftest:dist'], 'jobs': False},
+    'accuracy-docs': {'argv': ['node', 'scripts/generate-accuracy-docs.js', '--special', SPECIAL_REPORT,
+                               '--dist', DIST_REPORT, '--out', 'docs/accuracy.md'],
+                      'deps': ['difftest:special', 'difftest:dist'], 'jobs': False},
+}
+
+
+def load_costs():
+    if os.path.exists(COSTS):
+        with open(COSTS) as fh:
+            return json.load(fh)
+    return {}
+
+
+def save_costs(costs):
+    with open(COSTS, 'w') as fh:
+        json.dump(costs, fh, indent=1, sort_keys=True)
+
+
+def expected_cost(costs, name):
+    return costs.get(name, _COST_PRIOR.get(name, _DEFAULT_COST))
+
+
+def select(stages, only):
+    """The stages to run: all of them, or just `only` with dependencies outside it dropped."""
+    if not only:
+        return stages
+    unknown = only - set(stages)
+    if unknown:
+        sys.exit(f'--only: no such stage(s) {sorted(unknown)}; stages are {list(stages)}')
+    return {name: dict(stage, deps=[d for d in stage['deps'] if d in only])
+            for name, stage in stages.items() if name in only}
+
+
+def priorities(stages, costs):
+    """name -> expected cost of the stage plus its costliest chain of dependents."""
+    dependents = {name: [n for n, s in stages.items() if name in s['deps']] for name in stages}
+    memo = {}
+
+    def path(name):
+        if name not in memo:
+            memo[name] = expected_cost(costs, name) + max((path(d) for d in dependents[name]), default=0)
+        return memo[name]
+    return {name: path(name) for name in stages}
+
+
+def command(stage, stage_jobs):
+    return stage['argv'] + (['--jobs', str(stage_jobs)] if stage['jobs'] else [])
+
+
+async def run_stage(name, stage, stage_jobs, log_dir, t0):
+    """Runs one stage to completion; returns (returncode, start offset, seconds)."""
+    log_path = os.path.join(log_dir, name.replace(':', '-') + '.log')
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        out = open(stage['stdout'], 'w') if stage.get('stdout') else log
+        try:
+            proc = await asyncio.create_subprocess_exec(*command(stage, stage_jobs), cwd=REPO_ROOT, env=env,
+                                                        stdout=out, stderr=log)
+            returncode = await proc.wait()
+        finally:
+            if out is not log:
+                out.close()
+    return returncode, start - t0, time.perf_counter() - start
+
+
+async def run_pipeline(stages, cpus, stage_jobs, log_dir, costs):
+    """Runs `stages` under the --cpus budget; returns name -> {'status', 'start', 'seconds'}."""
+    priority = priorities(stages, costs)
+    results = {}
+    pending = sorted(stages, key=lambda name: -priority[name])
+    running = {}
+    free = cpus
+    t0 = time.perf_counter()
+    while pending or running:
+        for name in list(pending):
+            if any(results.get(d, {}).get('status') in ('failed', 'skipped') for d in stages[name]['deps']):
+                pending.remove(name)
+                results[name] = {'status': 'skipped', 'start': None, 'seconds': None}
+                print(f'  skip   {name} (a dependency failed)', flush=True)
+        for name in list(pending):
+            need = min(stage_jobs if stages[name]['jobs'] else 1, cpus)
+            ready = all(results.get(d, {}).get('status') == 'ok' for d in stages[name]['deps'])
+            if ready and need <= free:
+                free -= need
+                pending.remove(name)
+                print(f'  start  {name}: {" ".join(command(stages[name], stage_jobs))}', flush=True)
+                task = asyncio.create_task(run_stage(name, stages[name], stage_jobs, log_dir, t0))
+                running[task] = (name, need)
+        if not running:
+            break
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            name, need = running.pop(task)
+            free += need
+            returncode, start, seconds = task.result()
+            status = 'ok' if returncode == 0 else 'failed'
+            results[name] = {'status': status, 'start': start, 'seconds': seconds}
+            if status == 'ok':
+                costs[name] = round(seconds, 3)
+            print(f'  {"done" if status == "ok" else "FAILED"} {name} in {seconds:.1f} s'
+                  + ('' if status == 'ok' else f' (exit {returncode}, see {log_dir})'), flush=True)
+    return results
+
+
+def critical_path(stages, results):
+    """The chain of stages, each the last-finishing dependency of the next, that ended last."""
+    def end(name):
+        r = results[name]
+        return r['start'] + r['seconds']
+    finished = [name for name, r in results.items() if r['status'] == 'ok']
+    if not finished:
+        return []
+    chain = [max(finished, key=end)]
+    while True:
+        deps = [d for d in stages[chain[-1]]['deps'] if d in finished]
+        if not deps:
+            return chain[::-1]
+        chain.append(max(deps, key=end))
+
+
+def print_summary(stages, results):
+    print('timing summary:')
+    for name, r in sorted(results.items(), key=lambda kv: (kv[1]['start'] is None, kv[1]['start'] or 0)):
+        when = '' if r['start'] is None else f'+{r["start"]:8.1f} s {r["seconds"]:9.1f} s'
+        print(f'  {r["status"]:8s}{when:>24s}  {name}')
+    ran = [r for r in results.values() if r['seconds'] is not None]
+    wall = max((r['start'] + r['seconds'] for r in ran), default=0)
+    serial = sum(r['seconds'] for r in ran)
+    path = critical_path(stages, results)
+    print(f'  critical path: {" -> ".join(path)} '
+          f'({sum(results[n]["seconds"] for n in path):.1f} s)')
+    print(f'  wall {wall:.1f} s vs {serial:.1f} s run one after another')
+
+
+def _parse_argv():
+    def flag_value(name, default, cast):
+        return cast(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+    cpus = flag_value('--cpus', os.cpu_count() or 1, int)
+    return (cpus, flag_value('--stage-jobs', max(1, cpus // 2), int),
+            flag_value('--only', None, lambda v: set(v.split(','))),
+            flag_value('--log-dir', DEFAULT_LOG_DIR, str), '--dry-run' in sys.argv)
+
+
+def main():
+    cpus, stage_jobs, only, log_dir, dry_run = _parse_argv()
+    stage_jobs = min(stage_jobs, cpus)
+    stages = select(STAGES, only)
+    costs = load_costs()
+    if dry_run:
+        priority = priorities(stages, costs)
+        for name in sorted(stages, key=lambda n: -priority[n]):
+            deps = ', '.join(stages[name]['deps']) or '-'
+            print(f'  {priority[name]:8.0f} s  {name} (after {deps}): {" ".join(command(stages[name], stage_jobs))}')
+        return
+    os.makedirs(log_dir, exist_ok=True)
+    print(f'{len(stages)} stages on {cpus} CPU(s), --jobs {stage_jobs} for the stages that take it; '
+          f'logs in {log_dir}', flush=True)
+    results = asyncio.run(run_pipeline(stages, cpus, stage_jobs, log_dir, costs))
+    save_costs(costs)
+    print_summary(stages, results)
+    sys.exit(0 if all(r['status'] == 'ok' for r in results.values()) else 1)
+
+
+if __name__ == '__main__':
+    main()